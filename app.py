@@ -1,22 +1,53 @@
+import hashlib
 import os
+import tempfile
+import random
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from flask import (
     Flask,
+    Request,
+    Response,
     flash,
+    g,
+    has_request_context,
+    make_response,
     redirect,
     render_template,
     request,
     send_from_directory,
     session,
+    stream_with_context,
     url_for,
 )
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
 from werkzeug.utils import secure_filename
+import http.client
+import queue
 import urllib.request
 import urllib.parse
+import base64
+import bisect
+import contextvars
+import csv
+import hmac
+import io
 import json
+import re
+import socket
+import stat
+import unicodedata
 
 try:
     # Cargar .env si existe
@@ -47,839 +78,4281 @@ BUCKET = "cvs"
 TURNSTILE_SITE_KEY = os.getenv("TURNSTILE_SITE_KEY", "0x4AAAAAAB221Y9KYrQW9eWq")
 TURNSTILE_SECRET_KEY = os.getenv("TURNSTILE_SECRET_KEY", "0x4AAAAAAB221aquY905tbs0JkvHeMWFDe8")
 TURNSTILE_ENABLED = (os.getenv("TURNSTILE_ENABLED", "true").strip().lower() not in {"0", "false", "no"})
+TURNSTILE_VERIFY_URL = os.getenv("TURNSTILE_VERIFY_URL", "https://challenges.cloudflare.com/turnstile/v0/siteverify")
+TURNSTILE_TIMEOUT = float(os.getenv("TURNSTILE_TIMEOUT", "5") or 5)
 
-supabase: Optional[Client]
-if SUPABASE_ENABLED:
-    try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)  # type: ignore
-    except Exception:
-        supabase = None
-else:
-    supabase = None
+# Envío de postulaciones en segundo plano (spool en disco + pool de workers)
+POSTULACION_ASYNC = (os.getenv("POSTULACION_ASYNC", "true").strip().lower() not in {"0", "false", "no"})
+POSTULACION_WORKERS = int(os.getenv("POSTULACION_WORKERS", "4") or 4)
+# Máximo de envíos en cola por proceso; si se llena, se procesa en el request
+POSTULACION_COLA_MAX = int(os.getenv("POSTULACION_COLA_MAX", "64") or 64)
+POSTULACION_MAX_INTENTOS = int(os.getenv("POSTULACION_MAX_INTENTOS", "5") or 5)
+SPOOL_DIR = os.getenv("SPOOL_DIR") or os.path.join(os.path.dirname(__file__), "spool")
+
+# Almacén local SQLite: postulaciones sin conexión (outbox) + espejo de catálogos y vacantes
+LOCAL_DB_ENABLED = (os.getenv("LOCAL_DB_ENABLED", "true").strip().lower() not in {"0", "false", "no"})
+LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH") or os.path.join(os.path.dirname(__file__), "datos", "local.sqlite3")
+# Reenvío del outbox a Supabase: cada cuánto se revisa (s), filas por lote y
+# reintentos ante errores que no son de red (los de red se reintentan siempre)
+OUTBOX_INTERVALO = float(os.getenv("OUTBOX_INTERVALO", "15") or 15)
+OUTBOX_LOTE = max(1, min(int(os.getenv("OUTBOX_LOTE", "100") or 100), 1000))
+OUTBOX_MAX_INTENTOS = int(os.getenv("OUTBOX_MAX_INTENTOS", "10") or 10)
+
+# Alta de postulación vía RPC transaccional (migrations/001_rpc_registrar_postulacion.sql)
+POSTULACION_RPC = (os.getenv("POSTULACION_RPC", "true").strip().lower() not in {"0", "false", "no"})
+
+# Tamaño máximo del CV (bytes). El body completo admite además los campos del form.
+CV_MAX_BYTES = int(os.getenv("CV_MAX_BYTES", str(5 * 1024 * 1024)) or 5 * 1024 * 1024)
+app.config["MAX_CONTENT_LENGTH"] = CV_MAX_BYTES + 256 * 1024
+
+# Hilos para ejecutar consultas independientes en paralelo dentro de un request (1 = secuencial)
+IO_WORKERS = int(os.getenv("IO_WORKERS", "8") or 1)
+
+# Caché de catálogos (segundos). TTL <= 0 desactiva la caché.
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300") or 0)
+# Ventana extra en la que se sirve el valor vencido mientras se refresca en segundo plano
+CATALOG_CACHE_STALE = float(os.getenv("CATALOG_CACHE_STALE", "3600") or 0)
+# Backend de la caché: memory (por proceso), sqlite (archivo compartido por los workers) o redis
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "postulaciones-cache.sqlite3")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Caché de páginas públicas (home, detalle de vacante). TTL <= 0 la desactiva.
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "300") or 0)
+# Cache-Control de las páginas cacheables. "no-cache" = el navegador revalida con ETag (304);
+# p.ej. "public, max-age=60" para que nginx (proxy_cache) las sirva sin llegar a Flask.
+PAGE_CACHE_CONTROL = os.getenv("PAGE_CACHE_CONTROL", "no-cache").strip()
 
+# Templates Jinja: bytecode compilado en disco (lo reusan los workers y los reinicios),
+# precompilación de todos los templates al arrancar y listados de admin en streaming
+JINJA_BYTECODE_CACHE = (os.getenv("JINJA_BYTECODE_CACHE", "true").strip().lower() not in {"0", "false", "no"})
+# Sin valor: el directorio propio de Jinja (por uid, modo 0700, con chequeo de dueño)
+JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR") or None
+JINJA_PRECOMPILAR = (os.getenv("JINJA_PRECOMPILAR", "true").strip().lower() not in {"0", "false", "no"})
+TEMPLATE_STREAMING = (os.getenv("TEMPLATE_STREAMING", "true").strip().lower() not in {"0", "false", "no"})
+# Tamaño mínimo (caracteres) de cada parte del HTML en streaming: Jinja emite fragmentos
+# de pocos bytes y mandar cada uno sería un write (y un chunk HTTP) por fragmento
+TEMPLATE_STREAM_CHUNK = int(os.getenv("TEMPLATE_STREAM_CHUNK", "8192") or 8192)
+
+# Assets con hash en el nombre (python build_static.py): static/dist/ + manifest.json.
+# Sin build, las URLs apuntan a los archivos originales.
+STATIC_MANIFEST = os.getenv("STATIC_MANIFEST") or os.path.join(os.path.dirname(__file__), "static", "dist", "manifest.json")
+# Cache-Control de lo que está en static/dist/ (el nombre cambia con el contenido)
+STATIC_INMUTABLE_MAX_AGE = int(os.getenv("STATIC_INMUTABLE_MAX_AGE", str(365 * 24 * 3600)) or 0)
+
+# Modo debug (debugger, recarga de código y de templates). Sólo para desarrollo:
+# apagado salvo FLASK_DEBUG=1, y sin él Jinja no revisa el mtime de cada template por render.
+FLASK_DEBUG = (os.getenv("FLASK_DEBUG", "false").strip().lower() in {"1", "true", "yes"})
+app.config["TEMPLATES_AUTO_RELOAD"] = FLASK_DEBUG
+
+# Pool HTTP hacia Supabase (por proceso). Conviene >= IO_WORKERS + POSTULACION_WORKERS.
+SUPABASE_POOL_MAX = int(os.getenv("SUPABASE_POOL_MAX", "20") or 20)
+SUPABASE_POOL_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "10") or 10)
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60") or 60)
+SUPABASE_HTTP2 = (os.getenv("SUPABASE_HTTP2", "true").strip().lower() not in {"0", "false", "no"})
+# Espera máxima (s) entre reintentos de creación del cliente
+SUPABASE_BACKOFF_MAX = float(os.getenv("SUPABASE_BACKOFF_MAX", "60") or 60)
+# Tope (s) del calentamiento en el post_fork de gunicorn
+SUPABASE_WARMUP_TIMEOUT = float(os.getenv("SUPABASE_WARMUP_TIMEOUT", "10") or 10)
+
+# Métricas: latencia por ruta y por llamada a Supabase, Server-Timing y /metrics
+METRICS_ENABLED = (os.getenv("METRICS_ENABLED", "true").strip().lower() not in {"0", "false", "no"})
+SERVER_TIMING = (os.getenv("SERVER_TIMING", "true").strip().lower() not in {"0", "false", "no"})
+# Requests más lentos que esto (ms) se loguean con el detalle de llamadas a Supabase (0 = nunca)
+METRICS_LENTO_MS = float(os.getenv("METRICS_LENTO_MS", "1000") or 0)
+# Bearer token para leer /metrics desde otro host (sin token: sólo localhost o sesión admin)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "").strip()
+# Cada cuánto (s) cada worker publica sus métricas en la caché compartida
+METRICS_PUBLICAR_CADA = float(os.getenv("METRICS_PUBLICAR_CADA", "10") or 10)
+# Un snapshot sin refrescar en este lapso es de un worker muerto o reciclado
+METRICS_VENCEN_EN = max(3 * METRICS_PUBLICAR_CADA, 30.0)
 
 # ==========================
-# Helpers
+# Métricas e instrumentación
 # ==========================
-def normalizar_checkbox(value: Any) -> bool:
-    if isinstance(value, bool):
-        return value
-    if value is None:
-        return False
-    text = str(value).strip().lower()
-    return text in {"si", "sí", "true", "1", "on", "yes"}
+# Histogramas y contadores del proceso en formato Prometheus. Las llamadas a
+# Supabase se miden en el transporte httpx (ver _configurar_http), así que
+# cubren tablas, RPC y Storage sin tocar cada consulta.
+_BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_BUCKETS_LLAMADAS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+# nombre -> (tipo, ayuda, buckets)
+METRICAS_DEF: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "postulaciones_http_requests_total": ("counter", "Requests HTTP por ruta, método y status.", ()),
+    "postulaciones_http_request_duration_seconds": ("histogram", "Duración de los requests HTTP por ruta.", _BUCKETS_SEGUNDOS),
+    "postulaciones_supabase_request_duration_seconds": (
+        "histogram", "Duración de cada request a Supabase (PostgREST / Storage).", _BUCKETS_SEGUNDOS,
+    ),
+    "postulaciones_supabase_errores_total": ("counter", "Requests a Supabase con error (status >= 400 o excepción).", ()),
+    "postulaciones_supabase_llamadas_por_request": (
+        "histogram", "Requests a Supabase hechos por cada request HTTP (detecta N+1).", _BUCKETS_LLAMADAS,
+    ),
+    "postulaciones_repo_duration_seconds": (
+        "histogram", "Duración de cada consulta de los repositorios, por fuente (supabase, sqlite, memoria).", _BUCKETS_SEGUNDOS,
+    ),
+    "postulaciones_template_stream_seconds": (
+        "histogram", "Duración del render en streaming (después de enviar los headers), por template.", _BUCKETS_SEGUNDOS,
+    ),
+}
+Etiquetas = Tuple[Tuple[str, str], ...]
 
 
-def is_pgrst204_error(exc: Exception) -> bool:
-    msg = str(exc) if exc else ""
-    return "PGRST204" in msg or "schema cache" in msg
+class Metricas:
+    """Contadores e histogramas del proceso.
 
+    Los histogramas guardan conteos por bucket (no acumulados; el último es
+    +Inf), la suma y la cantidad. ``snapshot()`` los deja en una estructura
+    JSON para combinarlos con los de los otros workers.
+    """
 
-def _fallback_localidades() -> List[Dict[str, Any]]:
-    # Departamentos de Mendoza para modo sin conexión
-    nombres = [
-        "Capital",
-        "Godoy Cruz",
-        "Guaymallén",
-        "Las Heras",
-        "Maipú",
-        "Luján de Cuyo",
-        "Lavalle",
-        "San Martín",
-        "Rivadavia",
-        "Junín",
-        "Santa Rosa",
-        "La Paz",
-        "Tunuyán",
-        "Tupungato",
-        "San Carlos",
-        "San Rafael",
-        "General Alvear",
-        "Malargüe",
-    ]
-    return [{"id": i + 1, "nombre": n} for i, n in enumerate(nombres)]
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._contadores: Dict[Tuple[str, Etiquetas], float] = {}
+        self._histogramas: Dict[Tuple[str, Etiquetas], List[float]] = {}
 
+    def contar(self, nombre: str, etiquetas: Etiquetas, valor: float = 1.0) -> None:
+        with self._lock:
+            clave = (nombre, etiquetas)
+            self._contadores[clave] = self._contadores.get(clave, 0.0) + valor
 
-def _fallback_areas() -> List[Dict[str, Any]]:
-    return [
-        {"id": 1, "nombre": "Recepción"},
-        {"id": 2, "nombre": "Administración"},
-        {"id": 3, "nombre": "Cocina"},
-        {"id": 4, "nombre": "Mecánica"},
-    ]
+    def observar(self, nombre: str, etiquetas: Etiquetas, valor: float) -> None:
+        buckets = METRICAS_DEF[nombre][2]
+        i = bisect.bisect_left(buckets, valor)
+        with self._lock:
+            h = self._histogramas.get((nombre, etiquetas))
+            if h is None:
+                h = self._histogramas[(nombre, etiquetas)] = [0.0] * (len(buckets) + 3)
+            h[i] += 1
+            h[-2] += valor
+            h[-1] += 1
 
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "contadores": [[n, [list(e) for e in et], v] for (n, et), v in self._contadores.items()],
+                "histogramas": [[n, [list(e) for e in et], list(h)] for (n, et), h in self._histogramas.items()],
+            }
 
-def cargar_catalogos() -> Tuple[Dict[Any, str], Dict[Any, str]]:
-    """Devuelve (map_localidades, map_areas).
+    @staticmethod
+    def combinar(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        contadores: Dict[Tuple[str, Etiquetas], float] = {}
+        histogramas: Dict[Tuple[str, Etiquetas], List[float]] = {}
+        for snap in snapshots:
+            for n, et, v in snap.get("contadores") or []:
+                clave = (n, tuple(tuple(e) for e in et))
+                contadores[clave] = contadores.get(clave, 0.0) + v
+            for n, et, h in snap.get("histogramas") or []:
+                clave = (n, tuple(tuple(e) for e in et))
+                actual = histogramas.get(clave)
+                histogramas[clave] = list(h) if actual is None else [a + b for a, b in zip(actual, h)]
+        return {
+            "contadores": [[n, [list(e) for e in et], v] for (n, et), v in contadores.items()],
+            "histogramas": [[n, [list(e) for e in et], h] for (n, et), h in histogramas.items()],
+        }
 
-    Intenta leer de Supabase; si falla, devuelve valores por defecto.
-    """
-    loc_map: Dict[Any, str] = {}
-    area_map: Dict[Any, str] = {}
+    @staticmethod
+    def exponer(snap: Dict[str, Any]) -> str:
+        """Formato de texto de Prometheus (version 0.0.4)."""
+        def _etiquetas(et: List[List[str]], extra: Optional[Tuple[str, str]] = None) -> str:
+            pares = [tuple(e) for e in et] + ([extra] if extra else [])
+            if not pares:
+                return ""
+            esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pares) + "}"
 
-    if supabase is not None:
-        try:
-            loc_res = supabase.table("localidades").select("id,nombre").execute()
-            for row in (loc_res.data or []):
-                loc_map[row.get("id")] = row.get("nombre")
-        except Exception:
-            pass
-        try:
-            area_res = supabase.table("areas").select("id,nombre").execute()
-            for row in (area_res.data or []):
-                area_map[row.get("id")] = row.get("nombre")
-        except Exception:
-            pass
+        def _num(v: float) -> str:
+            return str(int(v)) if float(v).is_integer() else repr(float(v))
 
-    if not loc_map:
-        for loc in _fallback_localidades():
-            loc_map[loc["id"]] = loc["nombre"]
-    if not area_map:
-        for a in _fallback_areas():
-            area_map[a["id"]] = a["nombre"]
+        por_nombre: Dict[str, List[str]] = {}
+        for n, et, v in sorted(snap.get("contadores") or [], key=lambda x: (x[0], x[1])):
+            por_nombre.setdefault(n, []).append(f"{n}{_etiquetas(et)} {_num(v)}")
+        for n, et, h in sorted(snap.get("histogramas") or [], key=lambda x: (x[0], x[1])):
+            buckets = METRICAS_DEF[n][2]
+            lineas = por_nombre.setdefault(n, [])
+            acumulado = 0.0
+            for limite, c in zip(buckets, h):
+                acumulado += c
+                lineas.append(f"{n}_bucket{_etiquetas(et, ('le', _num(limite)))} {_num(acumulado)}")
+            lineas.append(f"{n}_bucket{_etiquetas(et, ('le', '+Inf'))} {_num(h[-1])}")
+            lineas.append(f"{n}_sum{_etiquetas(et)} {repr(float(h[-2]))}")
+            lineas.append(f"{n}_count{_etiquetas(et)} {_num(h[-1])}")
+        salida: List[str] = []
+        for n in sorted(por_nombre):
+            tipo, ayuda, _ = METRICAS_DEF.get(n, ("untyped", "", ()))
+            salida += [f"# HELP {n} {ayuda}", f"# TYPE {n} {tipo}", *por_nombre[n]]
+        return "\n".join(salida) + "\n"
 
-    return loc_map, area_map
 
+metricas = Metricas()
+# Llamadas a Supabase del request en curso: (operacion, recurso, segundos, status/error).
+# ContextVar para que en_paralelo lo propague a los hilos del pool.
+_traza_supabase: "contextvars.ContextVar[Optional[List[Tuple[str, str, float, str]]]]" = contextvars.ContextVar(
+    "traza_supabase", default=None
+)
+_metricas_publicadas_en = 0.0
+_metricas_lock = threading.Lock()
+_metricas_hilo: Optional[threading.Thread] = None
+_metricas_pid: Optional[int] = None
 
-def cargar_opciones_postulacion() -> Tuple[List[str], List[str], List[str]]:
-    """Devuelve (areas, disponibilidades, localidades) como listas de strings.
+_OPERACIONES_POSTGREST = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "PUT": "upsert", "DELETE": "delete"}
+_OPERACIONES_STORAGE = {"GET": "download", "HEAD": "info", "POST": "upload", "PUT": "update", "DELETE": "remove"}
 
-    No depende de la conexión; usa catálogo si está disponible.
+
+def describir_llamada(componente: str, metodo: str, path: str) -> Tuple[str, str]:
+    """(operación, recurso) de una URL de Supabase, sin ids ni nombres de archivo.
+
+    /rest/v1/candidatos -> (select, candidatos); /rest/v1/rpc/f -> (rpc, f);
+    /storage/v1/object/cvs/x.pdf -> (upload, cvs); /storage/v1/object/list/cvs -> (list, cvs).
     """
-    loc_map, area_map = cargar_catalogos()
-    areas = list(area_map.values()) or ["Recepción", "Administración", "Cocina"]
-    disponibilidades = ["Full time", "Part time", "Fines de semana"]
-    localidades = list(loc_map.values()) or ["Mendoza", "Godoy Cruz", "Guaymallén"]
-    return areas, disponibilidades, localidades
+    partes = [p for p in path.split("/") if p]
+    if componente == "postgrest":
+        if "rpc" in partes[:-1]:
+            return "rpc", partes[partes.index("rpc") + 1]
+        return _OPERACIONES_POSTGREST.get(metodo, metodo.lower()), (partes[-1] if partes else "")
+    if "object" in partes:
+        resto = partes[partes.index("object") + 1:]
+        if resto and resto[0] in {"list", "public", "sign", "move", "copy", "info", "authenticated"}:
+            return resto[0], (resto[1] if len(resto) > 1 else "")
+        return _OPERACIONES_STORAGE.get(metodo, metodo.lower()), (resto[0] if resto else "")
+    return metodo.lower(), "/".join(partes[2:3])
 
 
-def get_areas_preferencia() -> List[str]:
-    fallback = [
-        "Administración",
-        "Recepción",
-        "Enfermería",
-        "Mantenimiento",
-        "Limpieza",
-        "Recursos Humanos",
-        "Farmacia",
-    ]
-    # Unificar catálogo: combinar tabla "areas" y "areas_preferencia" si existen
-    if supabase is None:
-        # Si no hay supabase, usar catálogo local + fallback
-        _, area_map = cargar_catalogos()
-        base = list(area_map.values())
-        final = sorted({*(base or []), *fallback})
-        return final
-    try:
-        nombres_set = set()
-        # 1) Áreas operativas
-        try:
-            res_areas = supabase.table("areas").select("nombre").order("nombre", desc=False).execute()
-            for row in (res_areas.data or []):
-                nombre = row.get("nombre")
-                if nombre:
-                    nombres_set.add(nombre)
-        except Exception:
-            pass
-        # 2) Áreas de preferencia
-        try:
-            res_pref = supabase.table("areas_preferencia").select("nombre").order("nombre", desc=False).execute()
-            for row in (res_pref.data or []):
-                nombre = row.get("nombre")
-                if nombre:
-                    nombres_set.add(nombre)
-        except Exception:
-            pass
-        # 3) Fallback por si ambas vacían
-        if not nombres_set:
-            _, area_map = cargar_catalogos()
-            for v in area_map.values():
-                if v:
-                    nombres_set.add(v)
-        # 4) Unir con fallback estático y devolver ordenado
-        if not nombres_set:
-            nombres_set.update(fallback)
-        return sorted(nombres_set)
-    except Exception:
-        return fallback
+def registrar_llamada_supabase(
+    componente: str, metodo: str, path: str, status: Optional[int], error: Optional[str], segundos: float
+) -> None:
+    operacion, recurso = describir_llamada(componente, metodo, path)
+    etiquetas: Etiquetas = (("componente", componente), ("operacion", operacion), ("recurso", recurso))
+    metricas.observar("postulaciones_supabase_request_duration_seconds", etiquetas, segundos)
+    if error or (status is not None and status >= 400):
+        metricas.contar("postulaciones_supabase_errores_total", etiquetas + (("tipo", error or str(status)),))
+    traza = _traza_supabase.get()
+    if traza is not None:
+        traza.append((operacion, recurso, segundos, error or str(status)))
 
 
-def get_areas_catalogo() -> List[Dict[str, Any]]:
-    """Devuelve lista de áreas como [{id, nombre}] priorizando Supabase clásica.
+class TransporteMedido:
+    """Transporte httpx que mide cada request a Supabase y delega en el real.
 
-    Orden de preferencia:
-    1) Tabla areas_preferencia (esquema original)
-    2) Tabla areas (si existe)
-    3) Catálogo local / fallback
+    Lee el cuerpo dentro de la medición (el cliente lo lee igual) para que la
+    duración incluya la descarga y no sólo los headers.
     """
-    # 1) Preferir areas_preferencia
-    if supabase is not None:
-        try:
-            pref = supabase.table("areas_preferencia").select("id,nombre").order("nombre", desc=False).execute()
-            resultados = [
-                {"id": row.get("id"), "nombre": row.get("nombre")}
-                for row in (pref.data or [])
-                if row.get("nombre")
-            ]
-            if resultados:
-                return resultados
-        except Exception:
-            pass
-        # 2) Fallback a areas
+
+    def __init__(self, interno: Any, componente: str) -> None:
+        self._interno = interno
+        self.componente = componente
+
+    def handle_request(self, request):
+        inicio = time.perf_counter()
+        status: Optional[int] = None
+        error: Optional[str] = None
         try:
-            res = supabase.table("areas").select("id,nombre").order("nombre", desc=False).execute()
-            resultados = [
-                {"id": row.get("id"), "nombre": row.get("nombre")}
-                for row in (res.data or [])
-                if row.get("nombre")
-            ]
-            if resultados:
-                return resultados
-        except Exception:
-            pass
-    # 3) Catálogo local / fallback
-    _, area_map = cargar_catalogos()
-    if area_map:
-        out: List[Dict[str, Any]] = []
-        for k, v in area_map.items():
-            out.append({"id": k, "nombre": v})
-        out.sort(key=lambda x: (str(x.get("nombre") or "").lower()))
-        return out
-    return [{"id": a.get("id"), "nombre": a.get("nombre")} for a in _fallback_areas()]
+            resp = self._interno.handle_request(request)
+            resp.read()
+            status = resp.status_code
+            return resp
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            registrar_llamada_supabase(
+                self.componente, request.method, request.url.path, status, error, time.perf_counter() - inicio
+            )
 
+    def close(self) -> None:
+        self._interno.close()
 
-def resolver_area_desde_form(valor: str) -> Tuple[str, Optional[Any]]:
-    """Convierte un valor de formulario (id numérico, UUID o nombre) a (nombre, id opcional)."""
-    if not valor:
-        return "", None
-    val = valor.strip()
-    # Si parece un ID numérico o UUID, buscar nombre en Supabase o catálogo
-    def _looks_like_uuid(s: str) -> bool:
-        s = s.strip().lower()
-        return len(s) in {32, 36} and ("-" in s or s.isalnum())
+    def __enter__(self):
+        self._interno.__enter__()
+        return self
 
-    if val.isdigit() or _looks_like_uuid(val):
-        area_id: Any = int(val) if val.isdigit() else val
-        # Intentar Supabase: primero areas_preferencia (esquema original), luego areas
-        if supabase is not None:
-            try:
-                rowp = supabase.table("areas_preferencia").select("id,nombre").eq("id", area_id).single().execute()
-                data = getattr(rowp, "data", None) or None
-                if data and data.get("nombre"):
-                    return str(data.get("nombre")), data.get("id")
-            except Exception:
-                pass
-            try:
-                row = supabase.table("areas").select("id,nombre").eq("id", area_id).single().execute()
-                data = getattr(row, "data", None) or None
-                if data and data.get("nombre"):
-                    return str(data.get("nombre")), data.get("id")
-            except Exception:
-                pass
-        # Fallback catálogo local
-        _, area_map = cargar_catalogos()
-        nombre = area_map.get(area_id) if isinstance(area_id, int) else None
-        if nombre:
-            return str(nombre), area_id
-        return val, area_id if isinstance(area_id, int) else None
-    # Si vino nombre textual, devolver como nombre; opcionalmente intentar mapear id
-    nombre_txt = val
-    # Intentar obtener id por nombre en Supabase (preferencia -> areas)
-    if supabase is not None:
-        try:
-            rp = supabase.table("areas_preferencia").select("id,nombre").eq("nombre", nombre_txt).single().execute()
-            data = getattr(rp, "data", None) or None
-            if data and data.get("id") is not None:
-                return nombre_txt, data.get("id")
-        except Exception:
-            pass
-        try:
-            ra = supabase.table("areas").select("id,nombre").eq("nombre", nombre_txt).single().execute()
-            data = getattr(ra, "data", None) or None
-            if data and data.get("id") is not None:
-                return nombre_txt, data.get("id")
-        except Exception:
-            pass
-    # Fallback catálogo local
-    _, area_map = cargar_catalogos()
-    try:
-        by_name_cs = next((k for k, v in area_map.items() if v == nombre_txt), None)
-        if by_name_cs is not None:
-            return nombre_txt, int(by_name_cs) if isinstance(by_name_cs, int) else None
-        by_name_ci = next((k for k, v in area_map.items() if str(v).lower() == nombre_txt.lower()), None)
-        if by_name_ci is not None:
-            return nombre_txt, int(by_name_ci) if isinstance(by_name_ci, int) else None
-    except Exception:
-        pass
-    return nombre_txt, None
+    def __exit__(self, *exc) -> None:
+        self._interno.__exit__(*exc)
 
 
-def _ensure_upload_dir() -> str:
-    upload_dir = os.path.join(os.path.dirname(__file__), "uploads")
-    os.makedirs(upload_dir, exist_ok=True)
-    return upload_dir
+def _ruta_actual() -> str:
+    # La regla ("/admin/postulaciones/<int:postulacion_id>/estado") y no el path: cardinalidad acotada
+    return request.url_rule.rule if request.url_rule is not None else "sin_ruta"
 
 
-def _supabase_public_url(object_path: str) -> Optional[str]:
-    if supabase is None:
-        return None
+def server_timing(segundos: float, traza: List[Tuple[str, str, float, str]], detalle: bool) -> str:
+    """Header Server-Timing: total, suma de Supabase y (si ``detalle``) las consultas más pesadas."""
+    total_sb = sum(t[2] for t in traza)
+    partes = [f"app;dur={segundos * 1000:.1f}", f'supabase;dur={total_sb * 1000:.1f};desc="{len(traza)} llamadas"']
+    if detalle and traza:
+        por_consulta: Dict[Tuple[str, str], List[float]] = {}
+        for op, recurso, dur, _ in traza:
+            por_consulta.setdefault((op, recurso), []).append(dur)
+        pesadas = sorted(por_consulta.items(), key=lambda kv: -sum(kv[1]))[:8]
+        for (op, recurso), durs in pesadas:
+            nombre = re.sub(r"[^A-Za-z0-9_.-]", "_", f"sb-{op}-{recurso}")
+            partes.append(f'{nombre};dur={sum(durs) * 1000:.1f};desc="x{len(durs)}"')
+    return ", ".join(partes)
+
+
+@app.before_request
+def _iniciar_medicion():
+    if not METRICS_ENABLED:
+        return
+    g.inicio_request = time.perf_counter()
+    _traza_supabase.set([])
+
+
+@app.after_request
+def _registrar_medicion(resp):
+    inicio = g.pop("inicio_request", None)
+    if inicio is None:
+        return resp
+    segundos = time.perf_counter() - inicio
+    traza = _traza_supabase.get() or []
+    _traza_supabase.set(None)
+    ruta = _ruta_actual()
+    metricas.contar(
+        "postulaciones_http_requests_total",
+        (("ruta", ruta), ("metodo", request.method), ("status", str(resp.status_code))),
+    )
+    metricas.observar("postulaciones_http_request_duration_seconds", (("ruta", ruta), ("metodo", request.method)), segundos)
+    metricas.observar("postulaciones_supabase_llamadas_por_request", (("ruta", ruta),), len(traza))
+    if SERVER_TIMING:
+        # El detalle por tabla sólo para admin: no exponer el esquema en páginas públicas.
+        # Sin cookie de sesión no se toca session (evita agregar "Vary: Cookie").
+        admin = app.config["SESSION_COOKIE_NAME"] in request.cookies and _is_admin()
+        resp.headers["Server-Timing"] = server_timing(segundos, traza, detalle=admin)
+    if METRICS_LENTO_MS and segundos * 1000 >= METRICS_LENTO_MS:
+        resumen: Dict[Tuple[str, str], List[float]] = {}
+        for op, recurso, dur, _ in traza:
+            resumen.setdefault((op, recurso), []).append(dur)
+        detalle = ", ".join(
+            f"{op} {recurso} x{len(durs)} {sum(durs) * 1000:.0f} ms"
+            for (op, recurso), durs in sorted(resumen.items(), key=lambda kv: -sum(kv[1]))
+        )
+        app.logger.warning(
+            "Request lento: %s %s %.0f ms, %d llamadas a Supabase (%s)",
+            request.method, ruta, segundos * 1000, len(traza), detalle or "ninguna",
+        )
+    publicar_metricas()
+    return resp
+
+
+def _id_worker() -> str:
+    # host:pid: dos máquinas con el mismo Redis pueden repetir pids
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _bucle_metricas() -> None:
+    while True:
+        time.sleep(max(METRICS_PUBLICAR_CADA, 1.0))
+        publicar_metricas(forzar=True)
+
+
+def publicar_metricas(forzar: bool = False) -> None:
+    """Deja el snapshot del worker en el espacio "metricas" del backend (clave "<host>:<pid>").
+
+    Además arranca un hilo que lo re-publica cada METRICS_PUBLICAR_CADA
+    segundos, para que un worker vivo pero sin tráfico no quede como vencido.
+    Con backend memory no hace nada: /metrics muestra sólo el proceso que responde.
+    """
+    global _metricas_publicadas_en, _metricas_hilo, _metricas_pid
+    if not _metricas_backend.compartido:
+        return
+    if _metricas_pid != os.getpid():
+        with _metricas_lock:
+            if _metricas_pid != os.getpid():
+                _metricas_hilo = threading.Thread(target=_bucle_metricas, name="metricas", daemon=True)
+                _metricas_pid = os.getpid()
+                _metricas_hilo.start()
+    ahora = time.time()
+    if not forzar and ahora - _metricas_publicadas_en < METRICS_PUBLICAR_CADA:
+        return
+    _metricas_publicadas_en = ahora
     try:
-        public = supabase.storage.from_(BUCKET).get_public_url(object_path)
-        if isinstance(public, dict) and "data" in public and "publicUrl" in public["data"]:
-            return public["data"]["publicUrl"]
-        if isinstance(public, str):
-            return public
+        _metricas_backend.escribir(_id_worker(), metricas.snapshot(), ahora)
     except Exception:
-        return None
-    return None
+        pass
 
 
-def subir_cv_y_obtener_url(dni: str, file_storage) -> str:
-    """Sube el PDF a Supabase Storage (si está configurado) o a /uploads y devuelve URL pública."""
-    filename = secure_filename(f"{dni}.pdf")
+def exponer_metricas() -> str:
+    """Métricas de todos los workers (si el backend es compartido) en texto Prometheus.
 
-    if supabase is not None:
-        # Intentar sin upsert; si ya existe, renombrar con timestamp y reintentar
+    Los snapshots sin actualizar hace más de METRICS_VENCEN_EN segundos son de
+    workers que ya no existen: no se suman y se borran.
+    """
+    snapshots = [metricas.snapshot()]
+    if _metricas_backend.compartido:
+        publicar_metricas(forzar=True)
+        snapshots, vencidos = [], []
+        limite = time.time() - METRICS_VENCEN_EN
         try:
-            supabase.storage.from_(BUCKET).upload(
-                path=filename,
-                file=file_storage.stream,
-                file_options={"contentType": "application/pdf", "upsert": "false"},
-            )
-            public_url = _supabase_public_url(filename)
-            if public_url:
-                return public_url
+            for clave in _metricas_backend.claves():
+                entrada = _metricas_backend.leer(clave)
+                if entrada is None:
+                    continue
+                if entrada[0] < limite:
+                    vencidos.append(clave)
+                else:
+                    snapshots.append(entrada[1])
+            if vencidos:
+                _metricas_backend.borrar(*vencidos)
         except Exception:
-            # conflicto o error: reintentar con timestamp
-            try:
-                ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-                alt_name = secure_filename(f"{dni}-{ts}.pdf")
-                file_storage.stream.seek(0)
-                supabase.storage.from_(BUCKET).upload(
-                    path=alt_name,
-                    file=file_storage.stream,
-                    file_options={"contentType": "application/pdf", "upsert": "false"},
-                )
-                public_url = _supabase_public_url(alt_name)
-                if public_url:
-                    return public_url
-            except Exception:
-                pass
+            snapshots = [metricas.snapshot()]
+    cuerpo = Metricas.exponer(Metricas.combinar(snapshots))
+    return cuerpo + (
+        "# HELP postulaciones_metricas_workers Workers incluidos en este scrape.\n"
+        "# TYPE postulaciones_metricas_workers gauge\n"
+        f"postulaciones_metricas_workers {len(snapshots)}\n"
+    )
 
-    # Fallback local
-    upload_dir = _ensure_upload_dir()
-    target_path = os.path.join(upload_dir, filename)
-    file_storage.save(target_path)
-    return url_for("uploaded_file", filename=filename, _external=True)
 
+# ==========================
+# Cliente Supabase
+# ==========================
+def _configurar_http(cliente: Any) -> None:
+    """Reemplaza las sesiones httpx de PostgREST y Storage por unas con keep-alive y pool explícitos.
 
-def _insertar_candidato_si_no_existe(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[str]]:
-    """Inserta en Supabase. Si existe por DNI, elimina el previo y re-inserta.
-    Devuelve (ok, error, candidato_id)."""
-    if supabase is None:
-        return True, None, None
+    supabase-py no expone los límites del pool, así que se recrea cada sesión
+    con la misma base_url/headers/timeout. Si algo no calza con la versión
+    instalada se dejan las sesiones por defecto.
+    """
     try:
-        dni_value = data.get("dni")
-        if dni_value:
+        import httpx  # type: ignore
+    except Exception:
+        return
+    limites = httpx.Limits(
+        max_connections=SUPABASE_POOL_MAX,
+        max_keepalive_connections=SUPABASE_POOL_KEEPALIVE,
+        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+    )
+    for componente, attr in (("postgrest", "session"), ("storage", "_client")):
+        try:
+            dueno = getattr(cliente, componente)
+            viejo = getattr(dueno, attr, None)
+            if not isinstance(viejo, httpx.Client):
+                continue
             try:
-                supabase.table("candidatos").delete().eq("dni", dni_value).execute()
-            except Exception:
-                pass
-        # No enviar created_at; lo hace DEFAULT
-        attempts = 0
-        while attempts < 2:
+                transporte = httpx.HTTPTransport(limits=limites, http2=SUPABASE_HTTP2)
+            except ImportError:
+                # http2 necesita el paquete h2
+                transporte = httpx.HTTPTransport(limits=limites)
+            nuevo = type(viejo)(
+                base_url=viejo.base_url,
+                headers=viejo.headers,
+                timeout=viejo.timeout,
+                follow_redirects=viejo.follow_redirects,
+                # Con transporte propio, los límites y http2 van en el transporte
+                transport=TransporteMedido(transporte, componente) if METRICS_ENABLED else transporte,
+            )
+            setattr(dueno, attr, nuevo)
+            viejo.close()
+        except Exception:
+            continue
+
+
+class SupabaseManager:
+    """Crea y conserva el cliente Supabase del proceso.
+
+    El cliente se crea recién cuando se lo necesita (primer request o el
+    calentamiento del worker). Si la creación falla se reintenta más tarde con
+    backoff exponencial en vez de quedar en modo local para siempre. Guarda el
+    PID dueño: un cliente heredado por fork (``preload_app``) se descarta y se
+    crea uno propio, porque las conexiones del pool no se pueden compartir entre
+    procesos.
+    """
+
+    def __init__(self, url: str, key: str, backoff_base: float = 1.0, backoff_max: float = 60.0) -> None:
+        self.url = url
+        self.key = key
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._cliente: Optional[Client] = None
+        self._pid: Optional[int] = None
+        self._fallos = 0
+        self._proximo_intento = 0.0
+        self.ultimo_error: Optional[str] = None
+        self.creado_en: Optional[float] = None
+        self.calentado_en: Optional[float] = None
+
+    @property
+    def habilitado(self) -> bool:
+        return bool(self.url and self.key and create_client)
+
+    def obtener(self) -> Optional[Client]:
+        """Devuelve el cliente, creándolo si hace falta. None si no hay Supabase o está en backoff."""
+        if not self.habilitado:
+            return None
+        cliente = self._cliente
+        if cliente is not None and self._pid == os.getpid():
+            return cliente
+        if time.monotonic() < self._proximo_intento:
+            return None
+        with self._lock:
+            if self._cliente is not None and self._pid == os.getpid():
+                return self._cliente
+            if time.monotonic() < self._proximo_intento:
+                return None
             try:
-                ins = supabase.table("candidatos").insert(data).execute()
-                if ins.data:
-                    return True, None, ins.data[0].get("id")
-                return False, "No se pudo insertar el candidato", None
+                cliente = create_client(self.url, self.key)  # type: ignore[misc]
+                _configurar_http(cliente)
             except Exception as e:
-                if is_pgrst204_error(e) and attempts == 0:
-                    time.sleep(0.5)
-                    attempts += 1
-                    continue
-                return False, str(e), None
-        return False, "No se pudo insertar el candidato", None
-    except Exception as e:
-        return False, str(e), None
+                self._fallos += 1
+                espera = min(self.backoff_max, self.backoff_base * (2 ** (self._fallos - 1)))
+                self._proximo_intento = time.monotonic() + espera * random.uniform(0.5, 1.0)
+                self.ultimo_error = str(e)
+                self._cliente = None
+                return None
+            self._cliente, self._pid = cliente, os.getpid()
+            self._fallos, self._proximo_intento = 0, 0.0
+            self.ultimo_error = None
+            self.creado_en = time.time()
+            return cliente
 
+    def reiniciar(self) -> None:
+        """Descarta el cliente actual; el próximo ``obtener`` crea uno nuevo sin esperar backoff."""
+        with self._lock:
+            self._cliente, self._pid = None, None
+            self._fallos, self._proximo_intento = 0, 0.0
 
-def _insertar_postulacion(candidato_id: Optional[str], vacante_id: Optional[str]) -> Tuple[bool, Optional[str]]:
-    if supabase is None or not candidato_id:
-        return True, None
-    # Algunas instalaciones tienen columnas NOT NULL como 'tipo' y defaults distintos
+    def ping(self) -> Tuple[bool, Optional[str], float]:
+        """Consulta mínima a PostgREST. Devuelve (ok, error, milisegundos)."""
+        cliente = self.obtener()
+        if cliente is None:
+            return False, self.ultimo_error or "cliente no disponible", 0.0
+        t0 = time.perf_counter()
+        try:
+            cliente.table("localidades").select("id").limit(1).execute()
+            return True, None, (time.perf_counter() - t0) * 1000
+        except Exception as e:
+            return False, str(e), (time.perf_counter() - t0) * 1000
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            "habilitado": self.habilitado,
+            "conectado": self._cliente is not None and self._pid == os.getpid(),
+            "pid": os.getpid(),
+            "fallos": self._fallos,
+            "reintento_en_s": max(0.0, round(self._proximo_intento - time.monotonic(), 1)) if self._fallos else 0.0,
+            "ultimo_error": self.ultimo_error,
+            "creado_en": self.creado_en,
+            "calentado_en": self.calentado_en,
+        }
+
+
+supabase_manager = SupabaseManager(SUPABASE_URL, SUPABASE_KEY, backoff_max=SUPABASE_BACKOFF_MAX)
+
+# Se asigna en asegurar_supabase(); el resto del módulo lo lee como global
+supabase: Optional[Client] = None
+
+
+def asegurar_supabase() -> Optional[Client]:
+    """Sincroniza el global ``supabase`` con el manager (crea o reintenta si hace falta)."""
+    global supabase
+    supabase = supabase_manager.obtener()
+    return supabase
+
+
+# ==========================
+# Ingesta de CV (streaming)
+# ==========================
+class CVInvalido(BadRequest):
+    description = "El CV debe ser un archivo PDF."
+
+
+class CVIngest:
+    """Destino de streaming para archivos del multipart de /postular.
+
+    Werkzeug le va pasando los chunks a medida que lee el socket: se valida la
+    cabecera ``%PDF-``, se calcula el SHA-256 y se escribe directo a un archivo
+    temporal dentro de SPOOL_DIR. Si se supera ``max_bytes`` o la cabecera no
+    es de PDF se corta la lectura del body con 413/400.
+    """
+
+    # La especificación admite basura antes de la cabecera dentro del primer KB
+    VENTANA_CABECERA = 1024
+
+    def __init__(self, max_bytes: int) -> None:
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=SPOOL_DIR, suffix=".part")
+        self._fh = os.fdopen(fd, "w+b")
+        self._sha = hashlib.sha256()
+        self._head = b""
+        self._pdf_ok = False
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.persistido = False
+
+    def _verificar_cabecera(self, final: bool) -> None:
+        if self._pdf_ok:
+            return
+        if b"%PDF-" in self._head:
+            self._pdf_ok = True
+        elif final or len(self._head) >= self.VENTANA_CABECERA:
+            raise CVInvalido()
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise RequestEntityTooLarge()
+        if not self._pdf_ok:
+            self._head += data[: self.VENTANA_CABECERA]
+            self._verificar_cabecera(final=False)
+        self._sha.update(data)
+        return self._fh.write(data)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # Werkzeug rebobina al terminar de parsear: último punto para validar archivos chicos
+        if self.size:
+            self._verificar_cabecera(final=True)
+        return self._fh.seek(offset, whence)
+
+    @property
+    def sha256(self) -> str:
+        return self._sha.hexdigest()
+
+    def persistir(self, target: str) -> None:
+        """Mueve el archivo temporal a ``target`` sin copiarlo."""
+        self._fh.flush()
+        self._fh.close()
+        os.replace(self.path, target)
+        self.persistido = True
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+        if not self.persistido:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __getattr__(self, name: str) -> Any:
+        # read, tell, flush, readable... los resuelve el archivo subyacente
+        return getattr(self._fh, name)
+
+
+class PostulacionRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.path == "/postular":
+            stream = CVIngest(CV_MAX_BYTES)
+            # Si el parseo se corta, el archivo no llega a request.files: lo cerramos igual
+            self.__dict__.setdefault("_cv_streams", []).append(stream)
+            return stream
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+    def close(self) -> None:
+        super().close()
+        for stream in self.__dict__.pop("_cv_streams", []):
+            stream.close()
+
+
+app.request_class = PostulacionRequest
+
+
+# ==========================
+# I/O concurrente
+# ==========================
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+
+
+def en_paralelo(*fns) -> List[Any]:
+    """Ejecuta funciones de I/O independientes en paralelo y devuelve sus resultados en orden.
+
+    El cliente sync de Supabase es seguro entre hilos, así que las consultas de
+    un mismo request se superponen en vez de sumar sus RTT. Las excepciones se
+    propagan igual que en una llamada directa.
+    """
+    global _io_pool
+    if IO_WORKERS <= 1 or len(fns) <= 1:
+        return [fn() for fn in fns]
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+    # La primera corre en el hilo del request: uno menos que esperar del pool.
+    # Cada tarea corre en una copia del contexto (traza de métricas del request).
+    futuros = [_io_pool.submit(contextvars.copy_context().run, fn) for fn in fns[1:]]
+    primero = fns[0]()
+    return [primero] + [f.result() for f in futuros]
+
+
+def precargar_catalogos(*extra) -> List[Any]:
+    """Calienta en paralelo las tablas de catálogo y corre ``extra`` junto con ellas.
+
+    Devuelve los resultados de ``extra``; después las lecturas de catálogo del
+    request salen de la caché.
+    """
+    tablas = ("localidades", "areas", "areas_preferencia")
+    if supabase is None:
+        return [fn() for fn in extra]
+    resultados = en_paralelo(*extra, *[(lambda t=t: _catalogo_filas(t)) for t in tablas])
+    return resultados[: len(extra)]
+
+
+# ==========================
+# Caché de catálogos
+# ==========================
+class CacheBackend(ABC):
+    """Almacenamiento detrás de CatalogCache.
+
+    Guarda por clave el par (guardado_en, valor), con ``guardado_en`` en
+    segundos epoch para que el TTL se pueda comparar entre procesos. Los
+    backends compartidos (SQLite, Redis) hacen que los workers de gunicorn
+    vean la misma caché y que una invalidación impacte en todos a la vez.
+    """
+
+    nombre = "base"
+    compartido = False
+
+    @abstractmethod
+    def leer(self, clave: str) -> Optional[Tuple[float, Any]]:
+        ...
+
+    @abstractmethod
+    def escribir(self, clave: str, valor: Any, guardado_en: float) -> None:
+        ...
+
+    @abstractmethod
+    def borrar(self, *claves: str) -> None:
+        ...
+
+    @abstractmethod
+    def borrar_prefijo(self, prefijo: str) -> None:
+        ...
+
+    @abstractmethod
+    def limpiar(self) -> None:
+        ...
+
+    @abstractmethod
+    def claves(self) -> List[str]:
+        ...
+
+
+class MemoriaBackend(CacheBackend):
+    """Diccionario del proceso: cada worker tiene su propia copia."""
+
+    nombre = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+
+    def leer(self, clave: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            return self._entries.get(clave)
+
+    def escribir(self, clave: str, valor: Any, guardado_en: float) -> None:
+        with self._lock:
+            self._entries[clave] = (guardado_en, valor)
+
+    def borrar(self, *claves: str) -> None:
+        with self._lock:
+            for k in claves:
+                self._entries.pop(k, None)
+
+    def borrar_prefijo(self, prefijo: str) -> None:
+        with self._lock:
+            for k in [k for k in self._entries if k.startswith(prefijo)]:
+                del self._entries[k]
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def claves(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+
+class _BackendSerializado(CacheBackend):
+    """Base de los backends compartidos: valores en JSON + memo local decodificado.
+
+    Un hit consulta solo la marca ``guardado_en``; si coincide con la del memo
+    se devuelve el mismo objeto ya decodificado (y los índices memoizados por
+    identidad, como ``indices_area``, siguen sirviendo).
+    """
+
+    compartido = True
+
+    def __init__(self) -> None:
+        self._memo_lock = threading.Lock()
+        self._memo: Dict[str, Tuple[float, Any]] = {}
+
+    @abstractmethod
+    def _marca(self, clave: str) -> Optional[float]:
+        ...
+
+    @abstractmethod
+    def _leer_crudo(self, clave: str) -> Optional[Tuple[float, str]]:
+        ...
+
+    def leer(self, clave: str) -> Optional[Tuple[float, Any]]:
+        marca = self._marca(clave)
+        if marca is None:
+            with self._memo_lock:
+                self._memo.pop(clave, None)
+            return None
+        with self._memo_lock:
+            memo = self._memo.get(clave)
+        if memo is not None and memo[0] == marca:
+            return memo
+        crudo = self._leer_crudo(clave)
+        if crudo is None:
+            return None
+        entry = (crudo[0], json.loads(crudo[1]))
+        with self._memo_lock:
+            self._memo[clave] = entry
+        return entry
+
+    def _recordar(self, clave: str, valor: Any, guardado_en: float) -> None:
+        # Lo recién escrito ya está decodificado: los hits del mismo proceso lo reusan
+        with self._memo_lock:
+            self._memo[clave] = (guardado_en, valor)
+
+    @staticmethod
+    def _serializar(valor: Any) -> str:
+        return json.dumps(valor, default=str, separators=(",", ":"))
+
+
+class SQLiteBackend(_BackendSerializado):
+    """Archivo SQLite (WAL) compartido por todos los workers de la máquina."""
+
+    nombre = "sqlite"
+
+    def __init__(self, path: str, tabla: str = "cache") -> None:
+        super().__init__()
+        if not re.fullmatch(r"[a-z_]+", tabla):
+            raise ValueError(f"nombre de tabla inválido: {tabla!r}")
+        self.path = path
+        self.tabla = tabla
+        directorio = os.path.dirname(path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.tabla} (clave TEXT PRIMARY KEY, guardado_en REAL NOT NULL, valor TEXT NOT NULL)"
+            )
+
+    def _conn(self):
+        import sqlite3
+
+        # Una conexión por hilo y por proceso (las heredadas por fork no se reusan)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _marca(self, clave: str) -> Optional[float]:
+        row = self._conn().execute(f"SELECT guardado_en FROM {self.tabla} WHERE clave = ?", (clave,)).fetchone()
+        return row[0] if row else None
+
+    def _leer_crudo(self, clave: str) -> Optional[Tuple[float, str]]:
+        row = self._conn().execute(f"SELECT guardado_en, valor FROM {self.tabla} WHERE clave = ?", (clave,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def escribir(self, clave: str, valor: Any, guardado_en: float) -> None:
+        self._conn().execute(
+            f"INSERT OR REPLACE INTO {self.tabla} (clave, guardado_en, valor) VALUES (?, ?, ?)",
+            (clave, guardado_en, self._serializar(valor)),
+        )
+        self._recordar(clave, valor, guardado_en)
+
+    def borrar(self, *claves: str) -> None:
+        self._conn().executemany(f"DELETE FROM {self.tabla} WHERE clave = ?", [(k,) for k in claves])
+
+    def borrar_prefijo(self, prefijo: str) -> None:
+        # Rango en vez de LIKE: no hay que escapar '%' ni '_' en la clave
+        self._conn().execute(f"DELETE FROM {self.tabla} WHERE clave >= ? AND clave < ?", (prefijo, prefijo + "\uffff"))
+
+    def limpiar(self) -> None:
+        self._conn().execute(f"DELETE FROM {self.tabla}")
+
+    def claves(self) -> List[str]:
+        return [r[0] for r in self._conn().execute(f"SELECT clave FROM {self.tabla}")]
+
+
+class RedisBackend(_BackendSerializado):
+    """Redis (local o compartido entre máquinas). Requiere el paquete ``redis``."""
+
+    nombre = "redis"
+
+    def __init__(self, url: str, prefijo: str = "postulaciones:cache:") -> None:
+        super().__init__()
+        import redis  # type: ignore
+
+        self.prefijo = prefijo
+        self._r = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._r.ping()
+
+    def _marca(self, clave: str) -> Optional[float]:
+        v = self._r.hget(self.prefijo + clave, "g")
+        return float(v) if v is not None else None
+
+    def _leer_crudo(self, clave: str) -> Optional[Tuple[float, str]]:
+        g, v = self._r.hmget(self.prefijo + clave, ["g", "v"])
+        if g is None or v is None:
+            return None
+        return float(g), v.decode("utf-8")
+
+    def escribir(self, clave: str, valor: Any, guardado_en: float) -> None:
+        self._r.hset(self.prefijo + clave, mapping={"g": repr(guardado_en), "v": self._serializar(valor)})
+        self._recordar(clave, valor, guardado_en)
+
+    def borrar(self, *claves: str) -> None:
+        if claves:
+            self._r.delete(*[self.prefijo + k for k in claves])
+
+    def borrar_prefijo(self, prefijo: str) -> None:
+        llaves = list(self._r.scan_iter(match=self.prefijo + prefijo + "*", count=500))
+        if llaves:
+            self._r.delete(*llaves)
+
+    def limpiar(self) -> None:
+        self.borrar_prefijo("")
+
+    def claves(self) -> List[str]:
+        n = len(self.prefijo)
+        return [k.decode("utf-8")[n:] for k in self._r.scan_iter(match=self.prefijo + "*", count=500)]
+
+
+def crear_cache_backend(nombre: str, espacio: str = "cache") -> Tuple[CacheBackend, Optional[str]]:
+    """Instancia el backend configurado. Si no se puede (falta ``redis``, archivo
+    inaccesible, etc.) cae a memoria y devuelve el motivo.
+
+    ``espacio`` separa datos que no son caché (tabla SQLite / prefijo Redis
+    propios): ``limpiar()`` de un espacio no toca los demás.
+    """
+    nombre = (nombre or "memory").strip().lower()
+    try:
+        if nombre == "sqlite":
+            return SQLiteBackend(CACHE_SQLITE_PATH, tabla=espacio), None
+        if nombre == "redis":
+            return RedisBackend(REDIS_URL, prefijo=f"postulaciones:{espacio}:"), None
+        if nombre != "memory":
+            return MemoriaBackend(), f"CACHE_BACKEND desconocido: {nombre}"
+    except Exception as e:
+        return MemoriaBackend(), f"{nombre}: {e}"
+    return MemoriaBackend(), None
+
+
+class CatalogCache:
+    """Caché con TTL y stale-while-revalidate sobre un CacheBackend.
+
+    - Dentro del TTL: se devuelve el valor cacheado (hit).
+    - Vencido pero dentro de la ventana ``stale``: se devuelve el valor viejo y
+      se refresca en un hilo aparte (stale).
+    - Sin valor o fuera de ventana: se carga en el momento (miss).
+    Si el loader falla y hay un valor previo, se sigue sirviendo ese valor.
+    Si el backend falla, se trata como miss y se usa el loader directo.
+    """
+
+    def __init__(self, ttl: float, stale: float, backend: Optional[CacheBackend] = None) -> None:
+        self.ttl = ttl
+        self.stale = stale
+        self.backend = backend or MemoriaBackend()
+        self.backend_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "refresh_errors": 0, "invalidations": 0, "backend_errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _leer(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            return self.backend.leer(key)
+        except Exception:
+            self._count("backend_errors")
+            return None
+
+    def get(self, key: str, loader) -> Any:
+        if self.ttl <= 0:
+            self._count("misses")
+            return loader()
+        entry = self._leer(key)
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age < self.ttl:
+                self._count("hits")
+                return entry[1]
+            if age < self.ttl + self.stale:
+                self._count("stale")
+                self._refresh_async(key, loader)
+                return entry[1]
+        self._count("misses")
+        try:
+            value = loader()
+        except Exception:
+            if entry is not None:
+                self._count("refresh_errors")
+                return entry[1]
+            raise
+        self.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.backend.escribir(key, value, time.time())
+        except Exception:
+            self._count("backend_errors")
+
+    def _refresh_async(self, key: str, loader) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _run() -> None:
+            try:
+                self.set(key, loader())
+            except Exception:
+                self._count("refresh_errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_run, name=f"catalog-refresh-{key}", daemon=True).start()
+
+    def invalidate(self, *keys: str) -> None:
+        """Invalida las claves indicadas (o todo si no se pasa ninguna).
+
+        Una clave terminada en ``:`` invalida todas las que empiezan así.
+        Con backend compartido el efecto alcanza a todos los workers.
+        """
+        try:
+            if keys:
+                exactas = [k for k in keys if not k.endswith(":")]
+                if exactas:
+                    self.backend.borrar(*exactas)
+                for k in keys:
+                    if k.endswith(":"):
+                        self.backend.borrar_prefijo(k)
+            else:
+                self.backend.limpiar()
+        except Exception:
+            self._count("backend_errors")
+        self._count("invalidations")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+        try:
+            out["keys"] = sorted(self.backend.claves())
+        except Exception:
+            out["keys"] = []
+        out["backend"] = self.backend.nombre
+        out["compartido"] = self.backend.compartido
+        if self.backend_error:
+            out["backend_error"] = self.backend_error
+        out["ttl"] = self.ttl
+        out["stale"] = self.stale
+        return out
+
+
+_cache_backend, _cache_backend_error = crear_cache_backend(CACHE_BACKEND)
+catalog_cache = CatalogCache(CATALOG_CACHE_TTL, CATALOG_CACHE_STALE, _cache_backend)
+catalog_cache.backend_error = _cache_backend_error
+
+# Páginas renderizadas; comparten backend con los catálogos (claves "pagina:...").
+# Sin ventana stale: re-renderizar necesita contexto de request.
+pagina_cache = CatalogCache(PAGE_CACHE_TTL, 0, _cache_backend)
+
+# Snapshots de métricas por worker: mismo almacenamiento, otro espacio (no lo
+# borra una invalidación de la caché).
+_metricas_backend, _ = crear_cache_backend(CACHE_BACKEND, "metricas")
+
+# Hooks de invalidación: tabla modificada -> claves de caché que dependen de ella
+_CACHE_DEPENDENCIAS: Dict[str, Tuple[str, ...]] = {
+    "localidades": ("localidades",),
+    "areas": ("areas", "pagina:"),
+    "areas_preferencia": ("areas_preferencia", "pagina:"),
+    "vacantes": ("vacantes_opciones", "vacantes_abiertas", "vacante:", "pagina:"),
+}
+
+
+def notificar_cambio(*tablas: str) -> None:
+    """Invalida las entradas de caché que dependen de las tablas modificadas.
+
+    Las rutas de admin que escriben datos deben llamarla después de la escritura.
+    """
+    claves = [k for t in tablas for k in _CACHE_DEPENDENCIAS.get(t, ())]
+    if claves:
+        catalog_cache.invalidate(*claves)
+
+
+# ==========================
+# Almacén local (SQLite)
+# ==========================
+# Sin Supabase (no configurado, cliente en backoff o error de red) las
+# postulaciones se guardan acá en vez de perderse: candidato, postulación y
+# una fila de ``outbox`` en una sola transacción. Un hilo por proceso reenvía
+# el outbox en lotes cuando Supabase vuelve (ver reproducir_outbox). Catálogos
+# y vacantes se espejan en cada lectura exitosa para que las rutas públicas
+# sigan funcionando sin conexión. Tablas e índices como en migrations/000 y 003.
+ESQUEMA_LOCAL = """
+create table if not exists localidades (id primary key, nombre text not null unique);
+create table if not exists areas (id primary key, nombre text not null unique);
+create table if not exists areas_preferencia (id primary key, nombre text not null unique);
+
+create table if not exists vacantes (
+    id          primary key,
+    created_at  text,
+    titulo      text,
+    area        text,
+    descripcion text,
+    estado      text not null default 'abierta'
+);
+create index if not exists vacantes_abiertas_created_at_id on vacantes (created_at desc, id desc) where estado = 'abierta';
+
+create table if not exists candidatos (
+    id                  text primary key,
+    created_at          text not null,
+    nombre_apellido     text,
+    dni                 text not null unique,
+    edad                integer,
+    area_preferencia    text,
+    licencia_conducir   integer not null default 0,
+    movilidad_propia    integer not null default 0,
+    disponibilidad      text,
+    celular             text,
+    mail                text,
+    localidad           text,
+    cv_url              text,
+    familiar_en_clinica integer not null default 0,
+    fuente_postulacion  text
+);
+create index if not exists candidatos_created_at_id on candidatos (created_at desc, id desc);
+create index if not exists candidatos_disponibilidad on candidatos (disponibilidad);
+create index if not exists candidatos_area_preferencia on candidatos (area_preferencia);
+create index if not exists candidatos_localidad_area on candidatos (localidad, area_preferencia);
+create index if not exists candidatos_edad on candidatos (edad);
+
+create table if not exists postulaciones (
+    id                integer primary key autoincrement,
+    created_at        text not null,
+    candidato_id      text not null references candidatos(id) on delete cascade,
+    vacante_id        integer,
+    estado            text not null default 'recibido',
+    tipo              text not null default 'general',
+    entrevistado_por  text,
+    observaciones     text,
+    calificacion      integer check (calificacion between 1 and 10)
+);
+create index if not exists postulaciones_created_at_id on postulaciones (created_at desc, id desc);
+create index if not exists postulaciones_candidato_id on postulaciones (candidato_id);
+create index if not exists postulaciones_estado_created_at_id on postulaciones (lower(estado), created_at desc, id desc);
+create index if not exists postulaciones_vacante_created_at_id on postulaciones (vacante_id, created_at desc, id desc);
+
+-- pendiente -> enviando -> enviado (o error tras OUTBOX_MAX_INTENTOS fallos que no son de red)
+create table if not exists outbox (
+    id              integer primary key autoincrement,
+    postulacion_id  integer references postulaciones(id) on delete set null,
+    creado          text not null,
+    payload         text not null,
+    estado          text not null default 'pendiente',
+    intentos        integer not null default 0,
+    proximo_intento real not null default 0,
+    reclamado_en    real,
+    error           text,
+    remoto          text
+);
+create index if not exists outbox_estado_proximo on outbox (estado, proximo_intento, id);
+"""
+
+CANDIDATO_COLUMNAS_LOCAL = (
+    "nombre_apellido", "dni", "edad", "area_preferencia", "licencia_conducir", "movilidad_propia",
+    "disponibilidad", "celular", "mail", "localidad", "cv_url", "familiar_en_clinica", "fuente_postulacion",
+)
+POSTULACION_COLUMNAS_LOCAL = (
+    "id", "created_at", "candidato_id", "vacante_id", "estado", "tipo", "entrevistado_por", "observaciones", "calificacion",
+)
+CANDIDATO_BOOLEANOS = ("licencia_conducir", "movilidad_propia", "familiar_en_clinica")
+# Una fila "enviando" más vieja que esto quedó de un worker que murió a mitad del lote
+OUTBOX_RECLAMO_TTL = 300
+
+
+class AlmacenLocal:
+    """Base SQLite (WAL) con el esquema de Supabase más el outbox de postulaciones.
+
+    Una conexión por hilo y por proceso, como SQLiteBackend: los workers de
+    gunicorn comparten el archivo y se reparten el outbox reclamando filas.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directorio = os.path.dirname(path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(ESQUEMA_LOCAL)
+
+    def _conn(self):
+        import sqlite3
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            # Misma normalización que la búsqueda (sin acentos, minúsculas)
+            conn.create_function("normalizar", 1, normalizar_busqueda, deterministic=True)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaccion(self):
+        # IMMEDIATE: toma el lock de escritura al empezar (sin deadlocks entre workers)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # --- Postulaciones sin conexión ---
+    def registrar(self, data: Dict[str, Any], vacante_id: Optional[str], cv_archivo: Optional[str], motivo: Optional[str]) -> int:
+        """Candidato (upsert por DNI) + postulación + fila de outbox. Devuelve el id del outbox."""
+        ahora = datetime.now(timezone.utc).isoformat()
+        cand = {c: data[c] for c in CANDIDATO_COLUMNAS_LOCAL if c in data}
+        for c in CANDIDATO_BOOLEANOS:
+            if c in cand:
+                cand[c] = 1 if normalizar_checkbox(cand[c]) else 0
+        cols = list(cand)
+        actualizar = ", ".join(f"{c} = excluded.{c}" for c in cols if c != "dni")
+        vid = int(vacante_id) if vacante_id and str(vacante_id).isdigit() else None
+        payload = {"data": data, "vacante_id": vacante_id, "cv_archivo": cv_archivo}
+        with self._transaccion() as conn:
+            conn.execute(
+                f"insert into candidatos (id, created_at, {', '.join(cols)}) values (?, ?{', ?' * len(cols)}) "
+                f"on conflict(dni) do {('update set ' + actualizar) if actualizar else 'nothing'}",
+                [str(uuid.uuid4()), ahora, *cand.values()],
+            )
+            (cand_id,) = conn.execute("select id from candidatos where dni = ?", (cand.get("dni"),)).fetchone()
+            cur = conn.execute(
+                "insert into postulaciones (created_at, candidato_id, vacante_id, estado, tipo) values (?, ?, ?, 'recibido', ?)",
+                (ahora, cand_id, vid, "vacante" if vacante_id else "general"),
+            )
+            cur = conn.execute(
+                "insert into outbox (postulacion_id, creado, payload, error) values (?, ?, ?, ?)",
+                (cur.lastrowid, ahora, json.dumps(payload, ensure_ascii=False, default=str), motivo),
+            )
+            return cur.lastrowid
+
+    def filas_postulaciones(self, filtros: Dict[str, str], cursor: Optional["Cursor"], per_page: int) -> List[Dict[str, Any]]:
+        """Postulaciones guardadas localmente (todavía sin sincronizar), como consultar_filas_postulaciones.
+
+        Mismo contrato que aplicar_keyset: per_page + 1 filas, ascendente si se pagina hacia atrás.
+        """
+        where: List[str] = []
+        params: List[Any] = []
+        if filtros.get("estado"):
+            where.append("lower(p.estado) = ?")
+            params.append(filtros["estado"].lower())
+        if filtros.get("vacante_id"):
+            where.append("p.vacante_id = ?")
+            params.append(int(filtros["vacante_id"]) if filtros["vacante_id"].isdigit() else filtros["vacante_id"])
+        for campo in ("area_preferencia", "localidad", "disponibilidad"):
+            if filtros.get(campo):
+                where.append(f"c.{campo} = ?")
+                params.append(filtros[campo])
+        for campo, col in (("movilidad", "movilidad_propia"), ("licencia", "licencia_conducir")):
+            if filtros.get(campo) in {"Sí", "No"}:
+                where.append(f"c.{col} = ?")
+                params.append(1 if filtros[campo] == "Sí" else 0)
+        for campo, op in (("edad_min", ">="), ("edad_max", "<=")):
+            if str(filtros.get(campo) or "").isdigit():
+                where.append(f"c.edad {op} ?")
+                params.append(int(filtros[campo]))
+        if filtros.get("area"):
+            where.append("instr(normalizar(coalesce(c.area_preferencia, '') || ' | ' || coalesce(v.area, '')), ?) > 0")
+            params.append(normalizar_busqueda(filtros["area"]))
+        tokens, dni = terminos_busqueda(filtros.get("q", ""))
+        for t in tokens:
+            where.append(
+                "instr(normalizar(coalesce(c.nombre_apellido, '') || ' ' || c.dni || ' ' "
+                "|| coalesce(c.mail, '') || ' ' || coalesce(c.celular, '')), ?) > 0"
+            )
+            params.append(t)
+        if dni:
+            where.append("c.dni like ?")
+            params.append(dni + "%")
+        atras = cursor is not None and cursor.direccion == "before"
+        if cursor is not None:
+            op = ">" if atras else "<"
+            where.append(f"(p.created_at {op} ? or (p.created_at = ? and p.id {op} ?))")
+            params += [cursor.created_at, cursor.created_at, cursor.row_id]
+        orden = "asc" if atras else "desc"
+        columnas = ", ".join(
+            [f"p.{c}" for c in POSTULACION_COLUMNAS_LOCAL]
+            + ["c.created_at as c_created_at"]
+            + [f"c.{c} as c_{c}" for c in CANDIDATO_COLUMNAS_LOCAL]
+            + ["v.id as v_id", "v.titulo as v_titulo", "v.area as v_area"]
+        )
+        sql = (
+            f"select {columnas} from postulaciones p join candidatos c on c.id = p.candidato_id "
+            f"left join vacantes v on v.id = p.vacante_id "
+            f"{('where ' + ' and '.join(where)) if where else ''} "
+            f"order by p.created_at {orden}, p.id {orden} limit ?"
+        )
+        filas = []
+        for r in self._conn().execute(sql, [*params, per_page + 1]):
+            postulacion = {c: r[c] for c in POSTULACION_COLUMNAS_LOCAL}
+            postulacion["pendiente_sync"] = True
+            candidato = {"id": r["candidato_id"], "created_at": r["c_created_at"]}
+            candidato.update({c: r[f"c_{c}"] for c in CANDIDATO_COLUMNAS_LOCAL})
+            for c in CANDIDATO_BOOLEANOS:
+                candidato[c] = bool(candidato[c])
+            vacante = {"id": r["v_id"], "titulo": r["v_titulo"], "area": r["v_area"]} if r["v_id"] is not None else None
+            filas.append({"postulacion": postulacion, "candidato": candidato, "vacante": vacante})
+        return filas
+
+    # --- Espejo de catálogos y vacantes ---
+    def espejar_catalogo(self, tabla: str, filas: List[Dict[str, Any]]) -> None:
+        if tabla not in {"localidades", "areas", "areas_preferencia"} or not filas:
+            return
+        with self._transaccion() as conn:
+            conn.execute(f"delete from {tabla}")
+            conn.executemany(
+                f"insert or replace into {tabla} (id, nombre) values (?, ?)",
+                [(r.get("id"), r.get("nombre")) for r in filas if r.get("nombre")],
+            )
+
+    def catalogo(self, tabla: str) -> List[Dict[str, Any]]:
+        if tabla not in {"localidades", "areas", "areas_preferencia"}:
+            return []
+        return [dict(r) for r in self._conn().execute(f"select id, nombre from {tabla} order by rowid")]
+
+    def espejar_vacantes(self, filas: List[Dict[str, Any]], abiertas: bool = False) -> None:
+        """Upsert de vacantes. Con ``abiertas`` (el listado completo de abiertas) las que ya no vinieron se cierran."""
+        with self._transaccion() as conn:
+            for v in filas:
+                cols = [c for c in ("id", "created_at", "titulo", "area", "descripcion", "estado") if c in v]
+                if "id" not in cols:
+                    continue
+                actualizar = ", ".join(f"{c} = excluded.{c}" for c in cols if c != "id") or "id = excluded.id"
+                conn.execute(
+                    f"insert into vacantes ({', '.join(cols)}) values ({', '.join('?' * len(cols))}) "
+                    f"on conflict(id) do update set {actualizar}",
+                    [v[c] for c in cols],
+                )
+            if abiertas:
+                conn.execute(
+                    "update vacantes set estado = 'cerrada' where estado = 'abierta' "
+                    "and id not in (select value from json_each(?))",
+                    (json.dumps([v.get("id") for v in filas]),),
+                )
+
+    # --- Outbox ---
+    def resumen_outbox(self) -> Dict[str, int]:
+        resumen = {"pendiente": 0, "enviando": 0, "enviado": 0, "error": 0}
+        for estado, n in self._conn().execute("select estado, count(*) from outbox group by estado"):
+            resumen[estado] = n
+        return resumen
+
+    def hay_pendientes(self) -> bool:
+        return self._conn().execute(
+            "select 1 from outbox where estado in ('pendiente', 'enviando') limit 1"
+        ).fetchone() is not None
+
+    def reclamar_outbox(self, lote: int) -> List[Dict[str, Any]]:
+        """Marca como ``enviando`` hasta ``lote`` filas listas y las devuelve (una sola vez entre workers)."""
+        ahora = time.time()
+        with self._transaccion() as conn:
+            filas = conn.execute(
+                "select id, payload, intentos from outbox "
+                "where (estado = 'pendiente' and proximo_intento <= ?) or (estado = 'enviando' and reclamado_en < ?) "
+                "order by id limit ?",
+                (ahora, ahora - OUTBOX_RECLAMO_TTL, lote),
+            ).fetchall()
+            conn.executemany(
+                "update outbox set estado = 'enviando', reclamado_en = ? where id = ?", [(ahora, r["id"]) for r in filas]
+            )
+        return [{"id": r["id"], "payload": json.loads(r["payload"]), "intentos": r["intentos"]} for r in filas]
+
+    def actualizar_payload(self, outbox_id: int, payload: Dict[str, Any]) -> None:
+        self._conn().execute(
+            "update outbox set payload = ? where id = ?", (json.dumps(payload, ensure_ascii=False, default=str), outbox_id)
+        )
+
+    def marcar_enviados(self, remotos: Dict[int, Dict[str, Any]]) -> None:
+        """Cierra las filas enviadas y borra la copia local (el outbox queda como registro)."""
+        if not remotos:
+            return
+        ids = json.dumps(list(remotos))
+        with self._transaccion() as conn:
+            conn.execute(
+                "delete from postulaciones where id in (select postulacion_id from outbox where id in (select value from json_each(?)))",
+                (ids,),
+            )
+            conn.executemany(
+                "update outbox set estado = 'enviado', error = null, reclamado_en = null, remoto = ? where id = ?",
+                [(json.dumps(r, default=str), i) for i, r in remotos.items()],
+            )
+            conn.execute("delete from candidatos where id not in (select candidato_id from postulaciones)")
+
+    def marcar_fallidos(self, ids: List[int], error: str, red: bool) -> None:
+        """Vuelve las filas a ``pendiente`` con backoff; sin ``red`` pasan a ``error`` al agotar los intentos."""
+        self._conn().executemany(
+            "update outbox set intentos = intentos + 1, error = ?, reclamado_en = null, "
+            "estado = case when ? and intentos + 1 >= ? then 'error' else 'pendiente' end, "
+            "proximo_intento = ? + (1 << min(intentos + 1, 8)) where id = ?",
+            [(error[:500], not red, OUTBOX_MAX_INTENTOS, time.time(), i) for i in ids],
+        )
+
+    def reintentar_errores(self) -> int:
+        return self._conn().execute(
+            "update outbox set estado = 'pendiente', intentos = 0, proximo_intento = 0 where estado = 'error'"
+        ).rowcount
+
+    def purgar_enviados(self, antiguedad: float) -> None:
+        limite = datetime.fromtimestamp(time.time() - antiguedad, timezone.utc).isoformat()
+        self._conn().execute("delete from outbox where estado = 'enviado' and creado < ?", (limite,))
+
+
+_almacen_local: Optional[AlmacenLocal] = None
+_almacen_local_error: Optional[str] = None
+_almacen_local_lock = threading.Lock()
+
+
+def almacen_local() -> Optional[AlmacenLocal]:
+    """El almacén del proceso (se crea al primer uso). None si está desactivado o no se pudo abrir."""
+    global _almacen_local, _almacen_local_error
+    if _almacen_local is not None or not LOCAL_DB_ENABLED or _almacen_local_error:
+        return _almacen_local
+    with _almacen_local_lock:
+        if _almacen_local is None and not _almacen_local_error:
+            try:
+                _almacen_local = AlmacenLocal(LOCAL_DB_PATH)
+            except Exception as e:
+                _almacen_local_error = str(e)
+                app.logger.error("Almacén local no disponible (%s): %s", LOCAL_DB_PATH, e)
+    return _almacen_local
+
+
+def espejar_local(metodo: str, *args: Any) -> None:
+    """Copia best-effort al almacén local; un error acá nunca afecta al request."""
+    almacen = almacen_local()
+    if almacen is None:
+        return
+    try:
+        getattr(almacen, metodo)(*args)
+    except Exception as e:
+        app.logger.warning("No se pudo espejar en el almacén local (%s): %s", metodo, e)
+
+
+def leer_local(metodo: str, *args: Any) -> Any:
+    """Lectura del almacén local; None si no hay almacén o falla."""
+    almacen = almacen_local()
+    if almacen is None:
+        return None
+    try:
+        return getattr(almacen, metodo)(*args)
+    except Exception as e:
+        app.logger.warning("No se pudo leer el almacén local (%s): %s", metodo, e)
+        return None
+
+
+# ==========================
+# Repositorios (acceso a datos)
+# ==========================
+# Las rutas piden datos a un repositorio por entidad en vez de armar la
+# consulta inline. Cada repositorio declara qué columnas usa cada vista
+# (nada de select("*")) y busca por lotes de ids. La fuente es intercambiable:
+# Supabase, el almacén local SQLite (sin conexión) o una en memoria (tests).
+# Cada consulta se mide en postulaciones_repo_duration_seconds.
+
+# Ids por request en las búsquedas por lote (in.(...) viaja en la URL)
+REPO_LOTE_IDS = 200
+# (columna, operador, valor); operadores: eq, in, contiene (ilike %valor%), gte, lte
+Filtro = Tuple[str, str, Any]
+_OPERADORES_SQL = {"eq": "=", "gte": ">=", "lte": "<="}
+
+
+class FuenteDatos(ABC):
+    """Backend de los repositorios: select con proyección, filtros simples y keyset.
+
+    ``keyset`` = (cursor, per_page) con el mismo contrato que aplicar_keyset.
+    ``opcionales`` son columnas que algunas instalaciones no tienen: si faltan
+    se omiten en vez de fallar.
+    """
+
+    nombre = "base"
+
+    @abstractmethod
+    def seleccionar(
+        self,
+        tabla: str,
+        columnas: Tuple[str, ...],
+        filtros: Tuple[Filtro, ...] = (),
+        keyset: Optional[Tuple[Optional["Cursor"], int]] = None,
+        orden: Optional[str] = None,
+        limite: Optional[int] = None,
+        opcionales: Tuple[str, ...] = (),
+    ) -> List[Dict[str, Any]]:
+        ...
+
+
+class FuenteSupabase(FuenteDatos):
+    nombre = "supabase"
+
+    def __init__(self) -> None:
+        # (tabla, columna) opcionales que la base no tiene (42703)
+        self._faltantes: set = set()
+
+    def seleccionar(self, tabla, columnas, filtros=(), keyset=None, orden=None, limite=None, opcionales=()):
+        if supabase is None:
+            raise RuntimeError("Supabase no disponible")
+        extra = tuple(c for c in opcionales if (tabla, c) not in self._faltantes)
+        query = supabase.table(tabla).select(",".join(columnas + extra))
+        for col, op, valor in filtros:
+            if op == "in":
+                query = query.in_(col, list(valor))
+            elif op == "contiene":
+                query = query.ilike(col, f"%{valor}%")
+            else:
+                query = getattr(query, op)(col, valor)
+        if keyset is not None:
+            query = aplicar_keyset(query, *keyset)
+        else:
+            if orden:
+                query = query.order(orden.lstrip("-"), desc=orden.startswith("-"))
+            if limite:
+                query = query.limit(limite)
+        try:
+            return query.execute().data or []
+        except Exception as e:
+            msg = str(e)
+            faltan = [c for c in extra if c in msg] if ("42703" in msg or "does not exist" in msg) else []
+            if not faltan:
+                raise
+            self._faltantes.update((tabla, c) for c in faltan)
+            return self.seleccionar(tabla, columnas, filtros, keyset, orden, limite, opcionales)
+
+
+class FuenteSQLite(FuenteDatos):
+    """Lee del almacén local: espejo de catálogos/vacantes y lo guardado sin conexión."""
+
+    nombre = "sqlite"
+
+    def __init__(self, almacen: "AlmacenLocal") -> None:
+        self.almacen = almacen
+        self._columnas: Dict[str, set] = {}
+
+    def _existentes(self, tabla: str) -> set:
+        if tabla not in self._columnas:
+            self._columnas[tabla] = {r[1] for r in self.almacen._conn().execute(f"pragma table_info({tabla})")}
+        return self._columnas[tabla]
+
+    def seleccionar(self, tabla, columnas, filtros=(), keyset=None, orden=None, limite=None, opcionales=()):
+        existentes = self._existentes(tabla)
+        if not existentes:
+            return []
+        where: List[str] = []
+        params: List[Any] = []
+        for col, op, valor in filtros:
+            if col not in existentes:
+                return []
+            if op == "in":
+                where.append(f"{col} in (select value from json_each(?))")
+                params.append(json.dumps(list(valor), default=str))
+            elif op == "contiene":
+                where.append(f"instr(lower({col}), ?) > 0")
+                params.append(str(valor).lower())
+            else:
+                where.append(f"{col} {_OPERADORES_SQL[op]} ?")
+                params.append(int(valor) if isinstance(valor, bool) else valor)
+        sufijo = ""
+        if keyset is not None:
+            cursor, per_page = keyset
+            atras = cursor is not None and cursor.direccion == "before"
+            if cursor is not None:
+                op = ">" if atras else "<"
+                where.append(f"(created_at {op} ? or (created_at = ? and id {op} ?))")
+                params += [cursor.created_at, cursor.created_at, cursor.row_id]
+            direccion = "asc" if atras else "desc"
+            sufijo = f" order by created_at {direccion}, id {direccion} limit {int(per_page) + 1}"
+        else:
+            if orden and orden.lstrip("-") in existentes:
+                sufijo = f" order by {orden.lstrip('-')} {'desc' if orden.startswith('-') else 'asc'}"
+            if limite:
+                sufijo += f" limit {int(limite)}"
+        pedidas = columnas + tuple(opcionales)
+        leer = [c for c in pedidas if c in existentes]
+        sql = f"select {', '.join(leer)} from {tabla}{(' where ' + ' and '.join(where)) if where else ''}{sufijo}"
+        filas = []
+        for r in self.almacen._conn().execute(sql, params):
+            fila = {c: r[c] for c in leer}
+            for c in columnas:
+                fila.setdefault(c, None)
+            if tabla == "candidatos":
+                for c in CANDIDATO_BOOLEANOS:
+                    if c in fila and fila[c] is not None:
+                        fila[c] = bool(fila[c])
+            filas.append(fila)
+        return filas
+
+
+class FuenteMemoria(FuenteDatos):
+    """Tablas como listas de dicts. Para tests y desarrollo sin base."""
+
+    nombre = "memoria"
+
+    def __init__(self, tablas: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> None:
+        self.tablas: Dict[str, List[Dict[str, Any]]] = tablas if tablas is not None else {}
+
+    @staticmethod
+    def _cumple(fila: Dict[str, Any], col: str, op: str, valor: Any) -> bool:
+        v = fila.get(col)
+        if op == "eq":
+            return v == valor
+        if op == "in":
+            return v in set(valor)
+        if op == "contiene":
+            return str(valor).casefold() in str(v or "").casefold()
+        if v is None:
+            return False
+        return v >= valor if op == "gte" else v <= valor
+
+    def seleccionar(self, tabla, columnas, filtros=(), keyset=None, orden=None, limite=None, opcionales=()):
+        filas = [f for f in self.tablas.get(tabla, []) if all(self._cumple(f, *flt) for flt in filtros)]
+        if keyset is not None:
+            cursor, per_page = keyset
+            atras = cursor is not None and cursor.direccion == "before"
+            clave = lambda f: (str(f.get("created_at") or ""), f.get("id"))
+            if cursor is not None:
+                tope = (str(cursor.created_at), cursor.row_id)
+                filas = [f for f in filas if (clave(f) > tope if atras else clave(f) < tope)]
+            filas = sorted(filas, key=clave, reverse=not atras)[: per_page + 1]
+        else:
+            if orden:
+                filas = sorted(filas, key=lambda f: f.get(orden.lstrip("-")), reverse=orden.startswith("-"))
+            if limite:
+                filas = filas[:limite]
+        pedidas = columnas + tuple(c for c in opcionales if any(c in f for f in filas))
+        return [{c: f.get(c) for c in pedidas} for f in filas]
+
+
+_fuente_supabase = FuenteSupabase()
+_fuente_sqlite: Optional[FuenteSQLite] = None
+
+
+def fuentes_por_defecto() -> List[FuenteDatos]:
+    """Supabase si hay cliente; el almacén local como respaldo (o única fuente sin conexión)."""
+    global _fuente_sqlite
+    fuentes: List[FuenteDatos] = []
+    if supabase is not None:
+        fuentes.append(_fuente_supabase)
+    almacen = almacen_local()
+    if almacen is not None:
+        if _fuente_sqlite is None or _fuente_sqlite.almacen is not almacen:
+            _fuente_sqlite = FuenteSQLite(almacen)
+        fuentes.append(_fuente_sqlite)
+    return fuentes
+
+
+class _NoEncontrado(Exception):
+    """La consulta no devolvió filas; corta el loader de la caché para no guardar un None."""
+
+
+class Repositorio:
+    """Base de los repositorios: elige la fuente, cachea, mide y cae al almacén local.
+
+    Con ``fuente`` fija (p. ej. FuenteMemoria en tests) no hay caché ni respaldo.
+    """
+
+    tabla = ""
+    # vista -> columnas que lee
+    PROYECCIONES: Dict[str, Tuple[str, ...]] = {}
+
+    def __init__(self, fuente: Optional[FuenteDatos] = None) -> None:
+        self.fuente = fuente
+
+    def _medido(self, consulta: str, fuente: FuenteDatos, fn) -> Any:
+        inicio = time.perf_counter()
+        try:
+            return fn(fuente)
+        finally:
+            if METRICS_ENABLED:
+                metricas.observar(
+                    "postulaciones_repo_duration_seconds",
+                    (("repo", type(self).__name__), ("consulta", consulta), ("fuente", fuente.nombre)),
+                    time.perf_counter() - inicio,
+                )
+
+    def consultar(self, consulta: str, fn, cache: Optional[str] = None) -> Any:
+        """Corre ``fn(fuente)`` en la fuente principal (vía caché si ``cache``).
+
+        Ante un error de red reintenta en el almacén local, sin cachear el
+        resultado. Sin ninguna fuente devuelve None.
+        """
+        fuentes = [self.fuente] if self.fuente is not None else fuentes_por_defecto()
+        if not fuentes:
+            return None
+        principal = fuentes[0]
+        try:
+            if cache and self.fuente is None and principal.nombre == "supabase":
+                return catalog_cache.get(cache, lambda: self._medido(consulta, principal, fn))
+            return self._medido(consulta, principal, fn)
+        except Exception as e:
+            if len(fuentes) < 2 or not _es_error_red(str(e)):
+                raise
+            if has_request_context():
+                g.no_cachear = True
+            return self._medido(consulta, fuentes[1], fn)
+
+    def seleccionar(self, vista: str, filtros: Tuple[Filtro, ...] = (), **kw: Any) -> List[Dict[str, Any]]:
+        """Atajo: una consulta con la proyección de ``vista``."""
+        return self.consultar(
+            vista, lambda f: f.seleccionar(self.tabla, self.PROYECCIONES[vista], filtros, **kw)
+        ) or []
+
+    def por_ids(self, ids, vista: str, columna: str = "id") -> Dict[Any, Dict[str, Any]]:
+        """{id: fila} en lotes de REPO_LOTE_IDS (en paralelo si hay más de uno)."""
+        unicos = list(dict.fromkeys(i for i in ids if i is not None))
+        if not unicos:
+            return {}
+        columnas = self.PROYECCIONES[vista]
+        if columna not in columnas:
+            columnas = (columna,) + columnas
+        lotes = [unicos[i:i + REPO_LOTE_IDS] for i in range(0, len(unicos), REPO_LOTE_IDS)]
+        leer = lambda lote: self.consultar(
+            f"por_ids_{vista}", lambda f: f.seleccionar(self.tabla, columnas, ((columna, "in", lote),))
+        ) or []
+        resultados = en_paralelo(*[(lambda lote=lote: leer(lote)) for lote in lotes]) if len(lotes) > 1 else [leer(lotes[0])]
+        return {fila.get(columna): fila for filas in resultados for fila in filas}
+
+
+class CatalogRepo(Repositorio):
+    TABLAS = ("localidades", "areas", "areas_preferencia")
+
+    def filas(self, tabla: str) -> Optional[List[Dict[str, Any]]]:
+        """{id, nombre} de un catálogo (cacheado y espejado en el almacén local)."""
+        if tabla not in self.TABLAS:
+            raise ValueError(f"Catálogo desconocido: {tabla}")
+
+        def _leer(fuente: FuenteDatos) -> List[Dict[str, Any]]:
+            filas = fuente.seleccionar(tabla, ("id", "nombre"))
+            if fuente.nombre == "supabase":
+                espejar_local("espejar_catalogo", tabla, filas)
+            return filas
+
+        return self.consultar(tabla, _leer, cache=tabla)
+
+
+class VacanteRepo(Repositorio):
+    tabla = "vacantes"
+    PROYECCIONES = {
+        # home (landing.html)
+        "publica": ("id", "titulo", "area", "descripcion", "estado"),
+        # vacante_detalle.html (+ localidad en las instalaciones que la tienen)
+        "detalle": ("id", "titulo", "area", "descripcion", "estado", "created_at"),
+        # selectores y joins del admin
+        "opciones": ("id", "titulo", "area"),
+        # admin/vacantes (vacantes.html); created_at para el keyset
+        "admin": ("id", "created_at", "titulo", "area", "descripcion", "estado"),
+    }
+    OPCIONALES = {"detalle": ("localidad",)}
+
+    def abiertas(self) -> List[Dict[str, Any]]:
+        def _leer(fuente: FuenteDatos) -> List[Dict[str, Any]]:
+            filas = fuente.seleccionar(self.tabla, self.PROYECCIONES["publica"], (("estado", "eq", "abierta"),))
+            if fuente.nombre == "supabase":
+                espejar_local("espejar_vacantes", filas, True)
+            return filas
+
+        return self.consultar("abiertas", _leer, cache="vacantes_abiertas") or []
+
+    def detalle(self, vacante_id: int) -> Optional[Dict[str, Any]]:
+        def _leer(fuente: FuenteDatos) -> Optional[Dict[str, Any]]:
+            filas = fuente.seleccionar(
+                self.tabla, self.PROYECCIONES["detalle"], (("id", "eq", vacante_id),),
+                limite=1, opcionales=self.OPCIONALES["detalle"],
+            )
+            if not filas:
+                # Sin cachear: cada id inexistente que se pida sería una entrada nueva
+                raise _NoEncontrado(vacante_id)
+            if fuente.nombre == "supabase":
+                espejar_local("espejar_vacantes", filas)
+            return filas[0]
+
+        try:
+            return self.consultar("detalle", _leer, cache=f"vacante:{vacante_id}")
+        except _NoEncontrado:
+            return None
+
+    def opciones(self) -> List[Dict[str, Any]]:
+        return self.consultar(
+            "opciones", lambda f: f.seleccionar(self.tabla, self.PROYECCIONES["opciones"]), cache="vacantes_opciones"
+        ) or []
+
+    def listado_admin(self, filtros: Dict[str, str], cursor: Optional["Cursor"], per_page: int) -> List[Dict[str, Any]]:
+        condiciones: List[Filtro] = []
+        if filtros.get("titulo"):
+            condiciones.append(("titulo", "contiene", filtros["titulo"]))
+        if filtros.get("area"):
+            condiciones.append(("area", "contiene", filtros["area"]))
+        if filtros.get("publicada") in {"true", "false"}:
+            condiciones.append(("estado", "eq", "abierta" if filtros["publicada"] == "true" else "cerrada"))
+        return self.seleccionar("admin", tuple(condiciones), keyset=(cursor, per_page))
+
+
+class CandidatoRepo(Repositorio):
+    tabla = "candidatos"
+    PROYECCIONES = {
+        # listado de admin/postulaciones
+        "listado": (
+            "id", "nombre_apellido", "celular", "edad", "area_preferencia", "localidad",
+            "disponibilidad", "movilidad_propia", "cv_url", "created_at",
+        ),
+        # exportación e índice de búsqueda: además los datos de contacto completos
+        "completo": (
+            "id", "nombre_apellido", "celular", "edad", "area_preferencia", "localidad",
+            "disponibilidad", "movilidad_propia", "cv_url", "created_at", "dni", "mail", "licencia_conducir",
+        ),
+        # admin/candidatos (admin_candidatos.html)
+        "admin": ("id", "created_at", "nombre_apellido", "dni", "localidad", "area_preferencia", "disponibilidad", "cv_url"),
+    }
+
+    def listado_admin(self, disponibilidad: Optional[str], cursor: Optional["Cursor"], per_page: int) -> List[Dict[str, Any]]:
+        filtros: Tuple[Filtro, ...] = (("disponibilidad", "eq", disponibilidad),) if disponibilidad else ()
+        return self.seleccionar("admin", filtros, keyset=(cursor, per_page))
+
+
+class PostulacionRepo(Repositorio):
+    tabla = "postulaciones"
+    PROYECCIONES = {
+        # listado de admin, exportación e índice (EXPORT_COLUMNAS)
+        "listado": (
+            "id", "created_at", "candidato_id", "vacante_id", "estado", "tipo",
+            "entrevistado_por", "observaciones", "calificacion",
+        ),
+    }
+
+
+catalogos_repo = CatalogRepo()
+vacantes_repo = VacanteRepo()
+candidatos_repo = CandidatoRepo()
+postulaciones_repo = PostulacionRepo()
+
+
+# ==========================
+# Helpers
+# ==========================
+def normalizar_checkbox(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    text = str(value).strip().lower()
+    return text in {"si", "sí", "true", "1", "on", "yes"}
+
+
+def is_pgrst204_error(exc: Exception) -> bool:
+    msg = str(exc) if exc else ""
+    return "PGRST204" in msg or "schema cache" in msg
+
+
+def _es_error_on_conflict(exc: Exception) -> bool:
+    # 42P10: no hay índice único que coincida con ON CONFLICT (esquema viejo sin UNIQUE(dni))
+    msg = str(exc) if exc else ""
+    return "42P10" in msg or "ON CONFLICT" in msg
+
+
+def con_reintentos(fn, intentos: int = 2, base: float = 0.5, reintentar_si=is_pgrst204_error):
+    """Ejecuta ``fn()`` reintentando con backoff exponencial y jitter.
+
+    Sólo reintenta si ``reintentar_si(exc)`` es verdadero (por defecto, PGRST204
+    mientras PostgREST recarga la caché de esquema); si no, propaga la excepción.
+    """
+    for intento in range(intentos):
+        try:
+            return fn()
+        except Exception as e:
+            if intento + 1 >= intentos or not reintentar_si(e):
+                raise
+            time.sleep(base * (2 ** intento) * (0.5 + random.random() / 2))
+    return None
+
+
+def _fallback_localidades() -> List[Dict[str, Any]]:
+    # Departamentos de Mendoza para modo sin conexión
+    nombres = [
+        "Capital",
+        "Godoy Cruz",
+        "Guaymallén",
+        "Las Heras",
+        "Maipú",
+        "Luján de Cuyo",
+        "Lavalle",
+        "San Martín",
+        "Rivadavia",
+        "Junín",
+        "Santa Rosa",
+        "La Paz",
+        "Tunuyán",
+        "Tupungato",
+        "San Carlos",
+        "San Rafael",
+        "General Alvear",
+        "Malargüe",
+    ]
+    return [{"id": i + 1, "nombre": n} for i, n in enumerate(nombres)]
+
+
+def _fallback_areas() -> List[Dict[str, Any]]:
+    return [
+        {"id": 1, "nombre": "Recepción"},
+        {"id": 2, "nombre": "Administración"},
+        {"id": 3, "nombre": "Cocina"},
+        {"id": 4, "nombre": "Mecánica"},
+    ]
+
+
+def _catalogo_filas(tabla: str) -> Optional[List[Dict[str, Any]]]:
+    """Filas {id, nombre} de una tabla de catálogo (CatalogRepo: caché + espejo local).
+
+    Sin Supabase o si la lectura falla (no se cachea el error) usa la última
+    copia del almacén local; None si tampoco hay.
+    """
+    try:
+        return catalogos_repo.filas(tabla) or None
+    except Exception:
+        return leer_local("catalogo", tabla) or None
+
+
+def cargar_catalogos() -> Tuple[Dict[Any, str], Dict[Any, str]]:
+    """Devuelve (map_localidades, map_areas).
+
+    Intenta leer de Supabase (vía caché); si falla, devuelve valores por defecto.
+    """
+    loc_map: Dict[Any, str] = {}
+    area_map: Dict[Any, str] = {}
+
+    for row in (_catalogo_filas("localidades") or []):
+        loc_map[row.get("id")] = row.get("nombre")
+    for row in (_catalogo_filas("areas") or []):
+        area_map[row.get("id")] = row.get("nombre")
+
+    if not loc_map:
+        for loc in _fallback_localidades():
+            loc_map[loc["id"]] = loc["nombre"]
+    if not area_map:
+        for a in _fallback_areas():
+            area_map[a["id"]] = a["nombre"]
+
+    return loc_map, area_map
+
+
+def cargar_opciones_postulacion() -> Tuple[List[str], List[str], List[str]]:
+    """Devuelve (areas, disponibilidades, localidades) como listas de strings.
+
+    No depende de la conexión; usa catálogo si está disponible.
+    """
+    loc_map, area_map = cargar_catalogos()
+    areas = list(area_map.values()) or ["Recepción", "Administración", "Cocina"]
+    disponibilidades = ["Full time", "Part time", "Fines de semana"]
+    localidades = list(loc_map.values()) or ["Mendoza", "Godoy Cruz", "Guaymallén"]
+    return areas, disponibilidades, localidades
+
+
+def get_areas_preferencia() -> List[str]:
+    fallback = [
+        "Administración",
+        "Recepción",
+        "Enfermería",
+        "Mantenimiento",
+        "Limpieza",
+        "Recursos Humanos",
+        "Farmacia",
+    ]
+    # Unificar catálogo: combinar tabla "areas" y "areas_preferencia" si existen
+    if supabase is None:
+        # Si no hay supabase, usar catálogo local + fallback
+        _, area_map = cargar_catalogos()
+        base = list(area_map.values())
+        final = sorted({*(base or []), *fallback})
+        return final
+    try:
+        nombres_set = set()
+        # 1) Áreas operativas y 2) áreas de preferencia
+        for tabla in ("areas", "areas_preferencia"):
+            for row in (_catalogo_filas(tabla) or []):
+                nombre = row.get("nombre")
+                if nombre:
+                    nombres_set.add(nombre)
+        # 3) Fallback por si ambas vacían
+        if not nombres_set:
+            _, area_map = cargar_catalogos()
+            for v in area_map.values():
+                if v:
+                    nombres_set.add(v)
+        # 4) Unir con fallback estático y devolver ordenado
+        if not nombres_set:
+            nombres_set.update(fallback)
+        return sorted(nombres_set)
+    except Exception:
+        return fallback
+
+
+def get_areas_catalogo() -> List[Dict[str, Any]]:
+    """Devuelve lista de áreas como [{id, nombre}] priorizando Supabase clásica.
+
+    Orden de preferencia:
+    1) Tabla areas_preferencia (esquema original)
+    2) Tabla areas (si existe)
+    3) Catálogo local / fallback
+    """
+    # 1) Preferir areas_preferencia, 2) fallback a areas
+    for tabla in ("areas_preferencia", "areas"):
+        resultados = [
+            {"id": row.get("id"), "nombre": row.get("nombre")}
+            for row in (_catalogo_filas(tabla) or [])
+            if row.get("nombre")
+        ]
+        if resultados:
+            resultados.sort(key=lambda x: str(x.get("nombre")))
+            return resultados
+    # 3) Catálogo local / fallback
+    _, area_map = cargar_catalogos()
+    if area_map:
+        out: List[Dict[str, Any]] = []
+        for k, v in area_map.items():
+            out.append({"id": k, "nombre": v})
+        out.sort(key=lambda x: (str(x.get("nombre") or "").lower()))
+        return out
+    return [{"id": a.get("id"), "nombre": a.get("nombre")} for a in _fallback_areas()]
+
+
+class AreaIndex:
+    """Índice bidireccional de áreas construido una vez por refresco de catálogo.
+
+    Las fuentes se pasan en orden de prioridad: ante ids o nombres repetidos
+    gana la primera. Todas las búsquedas son O(1) y no tocan la red.
+    """
+
+    def __init__(self, *fuentes: List[Dict[str, Any]]) -> None:
+        self.por_id: Dict[Any, str] = {}
+        self.por_id_str: Dict[str, Tuple[Any, str]] = {}
+        self.por_nombre: Dict[str, Any] = {}
+        self.por_nombre_cf: Dict[str, Any] = {}
+        for filas in fuentes:
+            for row in filas:
+                area_id, nombre = row.get("id"), row.get("nombre")
+                if not nombre:
+                    continue
+                nombre = str(nombre)
+                if area_id is not None:
+                    self.por_id.setdefault(area_id, nombre)
+                    self.por_id_str.setdefault(str(area_id), (area_id, nombre))
+                self.por_nombre.setdefault(nombre, area_id)
+                self.por_nombre_cf.setdefault(nombre.casefold(), area_id)
+
+    def buscar_id(self, valor: Any) -> Optional[Tuple[Any, str]]:
+        """Devuelve (id, nombre) para un id (int, UUID o su representación en texto)."""
+        try:
+            if valor in self.por_id:
+                return valor, self.por_id[valor]
+        except TypeError:
+            pass
+        return self.por_id_str.get(str(valor))
+
+    def nombre(self, valor: Any) -> Optional[str]:
+        hit = self.buscar_id(valor)
+        return hit[1] if hit else None
+
+    def id_de(self, nombre: str) -> Optional[Any]:
+        """Id para un nombre exacto o, si no, sin distinguir mayúsculas/minúsculas."""
+        if nombre in self.por_nombre:
+            return self.por_nombre[nombre]
+        return self.por_nombre_cf.get(nombre.casefold())
+
+    def tiene_nombre(self, nombre: str) -> bool:
+        return nombre in self.por_nombre or nombre.casefold() in self.por_nombre_cf
+
+
+_area_index_lock = threading.Lock()
+_area_index_memo: Optional[Tuple[Any, Any, AreaIndex, AreaIndex]] = None
+
+
+def indices_area() -> Tuple[AreaIndex, AreaIndex]:
+    """Devuelve (índice de listados, índice de formularios).
+
+    - Listados: tabla ``areas`` (o fallback), igual que ``cargar_catalogos``.
+    - Formularios: ``areas_preferencia`` primero y luego ``areas``.
+    Se reconstruyen sólo cuando la caché de catálogos entrega filas nuevas.
+    """
+    global _area_index_memo
+    pref_rows = _catalogo_filas("areas_preferencia")
+    area_rows = _catalogo_filas("areas")
+    memo = _area_index_memo
+    if memo is not None and memo[0] is pref_rows and memo[1] is area_rows:
+        return memo[2], memo[3]
+    base = area_rows or _fallback_areas()
+    listado = AreaIndex(base)
+    formulario = AreaIndex(pref_rows or [], base)
+    with _area_index_lock:
+        _area_index_memo = (pref_rows, area_rows, listado, formulario)
+    return listado, formulario
+
+
+def enriquecer_area(vacantes: List[Dict[str, Any]], indice: Optional[AreaIndex] = None) -> None:
+    """Agrega ``area_nombre`` a cada vacante cuyo ``area`` sea un id de catálogo."""
+    if not vacantes:
+        return
+    if indice is None:
+        indice, _ = indices_area()
+    for v in vacantes:
+        nombre = indice.nombre(v.get("area"))
+        if nombre:
+            v["area_nombre"] = nombre
+
+
+def resolver_area_desde_form(valor: str) -> Tuple[str, Optional[Any]]:
+    """Convierte un valor de formulario (id numérico, UUID o nombre) a (nombre, id opcional)."""
+    if not valor:
+        return "", None
+    val = valor.strip()
+    _, indice = indices_area()
+    # Si parece un ID numérico o UUID, buscar nombre en el índice
+    def _looks_like_uuid(s: str) -> bool:
+        s = s.strip().lower()
+        return len(s) in {32, 36} and ("-" in s or s.isalnum())
+
+    if val.isdigit() or _looks_like_uuid(val):
+        area_id: Any = int(val) if val.isdigit() else val
+        hit = indice.buscar_id(area_id)
+        if hit:
+            return hit[1], hit[0]
+        return val, area_id if isinstance(area_id, int) else None
+    # Si vino nombre textual, devolver como nombre; opcionalmente mapear id
+    if indice.tiene_nombre(val):
+        return val, indice.id_de(val)
+    return val, None
+
+
+def _ensure_upload_dir() -> str:
+    upload_dir = os.path.join(os.path.dirname(__file__), "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    return upload_dir
+
+
+# Paths de CV ya presentes en Storage (por proceso) para saltear la subida
+_cv_subidos: "OrderedDict[str, None]" = OrderedDict()
+_CV_SUBIDOS_MAX = 4096
+
+
+def cv_public_url(object_path: str) -> str:
+    """URL pública del objeto; es función pura de SUPABASE_URL + bucket + path."""
+    return f"{SUPABASE_URL}/storage/v1/object/public/{BUCKET}/{urllib.parse.quote(object_path)}"
+
+
+def hash_stream(stream, chunk_size: int = 64 * 1024) -> str:
+    """SHA-256 del contenido; deja el stream rebobinado."""
+    h = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        h.update(chunk)
+    stream.seek(0)
+    return h.hexdigest()
+
+
+def cv_object_path(dni: str, digest: str) -> str:
+    # Direccionado por contenido: el mismo PDF cae en el mismo path y uno nuevo
+    # nunca choca con el anterior, así la primera subida no falla por conflicto.
+    return secure_filename(f"{dni}-{digest[:16]}.pdf")
+
+
+def _es_conflicto_storage(exc: Exception) -> bool:
+    msg = str(exc) if exc else ""
+    return "Duplicate" in msg or "already exists" in msg or "409" in msg
+
+
+def _recordar_cv_subido(object_path: str) -> None:
+    _cv_subidos[object_path] = None
+    _cv_subidos.move_to_end(object_path)
+    while len(_cv_subidos) > _CV_SUBIDOS_MAX:
+        _cv_subidos.popitem(last=False)
+
+
+def subir_cv_y_obtener_url(dni: str, file_storage, digest: Optional[str] = None) -> str:
+    """Sube el PDF a Supabase Storage (si está configurado) o a /uploads y devuelve URL pública.
+
+    Hace como máximo un request a Storage: si el mismo PDF ya se subió para
+    ese DNI no sube nada, y un conflicto (409) significa que ya existe.
+    """
+    stream = file_storage.stream
+    digest = digest or (stream.sha256 if isinstance(stream, CVIngest) else hash_stream(stream))
+    filename = cv_object_path(dni, digest)
+
+    if supabase is not None:
+        if filename in _cv_subidos:
+            return cv_public_url(filename)
+        try:
+            supabase.storage.from_(BUCKET).upload(
+                path=filename,
+                file=file_storage.stream,
+                file_options={"contentType": "application/pdf", "upsert": "false"},
+            )
+            _recordar_cv_subido(filename)
+            return cv_public_url(filename)
+        except Exception as e:
+            if _es_conflicto_storage(e):
+                _recordar_cv_subido(filename)
+                return cv_public_url(filename)
+            # error de Storage: seguimos con el fallback local
+            file_storage.stream.seek(0)
+
+    # Fallback local
+    upload_dir = _ensure_upload_dir()
+    target_path = os.path.join(upload_dir, filename)
+    if not os.path.exists(target_path):
+        file_storage.save(target_path)
+    return url_for("uploaded_file", filename=filename, _external=True)
+
+
+def _insertar_candidato_si_no_existe(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Upsert en Supabase por DNI: crea o actualiza el candidato en un solo request.
+    Devuelve (ok, error, candidato_id)."""
+    if supabase is None:
+        return False, "Supabase no disponible", None
+    # No enviar created_at; lo hace DEFAULT
+    try:
+        res = con_reintentos(
+            lambda: supabase.table("candidatos").upsert(data, on_conflict="dni").execute()  # type: ignore[union-attr]
+        )
+        if res.data:
+            return True, None, res.data[0].get("id")
+        return False, "No se pudo insertar el candidato", None
+    except Exception as e:
+        if not _es_error_on_conflict(e):
+            return False, str(e), None
+    # Esquema sin UNIQUE(dni): comportamiento anterior (borrar el previo y re-insertar)
+    try:
+        dni_value = data.get("dni")
+        if dni_value:
+            try:
+                supabase.table("candidatos").delete().eq("dni", dni_value).execute()
+            except Exception:
+                pass
+        ins = con_reintentos(lambda: supabase.table("candidatos").insert(data).execute())  # type: ignore[union-attr]
+        if ins.data:
+            return True, None, ins.data[0].get("id")
+        return False, "No se pudo insertar el candidato", None
+    except Exception as e:
+        return False, str(e), None
+
+
+def _insertar_postulacion(candidato_id: Optional[str], vacante_id: Optional[str]) -> Tuple[bool, Optional[str]]:
+    if supabase is None:
+        return False, "Supabase no disponible"
+    if not candidato_id:
+        return False, "El candidato no tiene id"
+    # Algunas instalaciones tienen columnas NOT NULL como 'tipo' y defaults distintos
     payload = {
         "candidato_id": candidato_id,
         "estado": "recibido",
         "tipo": "vacante" if vacante_id else "general",
     }
-    if vacante_id:
-        payload["vacante_id"] = int(vacante_id) if str(vacante_id).isdigit() else vacante_id
-    attempts = 0
-    while attempts < 2:
+    if vacante_id:
+        payload["vacante_id"] = int(vacante_id) if str(vacante_id).isdigit() else vacante_id
+    try:
+        ins = con_reintentos(lambda: supabase.table("postulaciones").insert(payload).execute())  # type: ignore[union-attr]
+    except Exception as e:
+        return False, str(e)
+    if ins.data:
+        return True, None
+    return False, "No se pudo registrar la postulación"
+
+
+def validar_campos_postulacion(form, files) -> Tuple[bool, List[str]]:
+    errores: List[str] = []
+    required_fields = [
+        "nombre_apellido",
+        "dni",
+        "edad",
+        "localidad",
+        "disponibilidad",
+        "area_preferencia",
+        "celular",
+        "mail",
+        "licencia_conducir",
+        "movilidad_propia",
+        "familiar_en_clinica",
+        "fuente_postulacion",
+    ]
+    for f in required_fields:
+        if not (form.get(f) or str(form.get(f)) == "0"):
+            errores.append(f)
+    # Validar DNI: solo dígitos
+    dni_val = (form.get("dni") or "").strip()
+    if not dni_val.isdigit():
+        if "dni" not in errores:
+            errores.append("dni")
+    file_cv = files.get("cv")
+    if not file_cv or file_cv.filename == "":
+        errores.append("cv")
+    elif isinstance(file_cv.stream, CVIngest) and file_cv.stream.size == 0:
+        errores.append("cv")
+    return (len(errores) == 0), errores
+
+
+class TurnstileClient:
+    """Cliente de siteverify con conexiones keep-alive reutilizadas y caché de veredictos.
+
+    Un token de Turnstile es de un solo uso y vence a los 300 s. Durante ese
+    tiempo se recuerda que ya se usó: un rechazo sigue siendo rechazo y un
+    token aprobado queda consumido, así que el segundo uso da False sin salir
+    a la red (Cloudflare respondería "timeout-or-duplicate").
+    """
+
+    TOKEN_TTL = 300.0
+
+    def __init__(self, url: str, secret: str, timeout: float, pool_size: int = 8, max_cache: int = 10000) -> None:
+        parts = urllib.parse.urlsplit(url)
+        self.url = url
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or ""
+        self._port = parts.port
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.secret = secret
+        self.timeout = timeout
+        self._conns: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+        self._cache: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._max_cache = max_cache
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _nueva_conexion(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self.timeout)
+
+    def _post(self, body: bytes) -> Dict[str, Any]:
+        headers = {"Content-Type": "application/x-www-form-urlencoded", "Connection": "keep-alive"}
+        # Si la conexión reutilizada estaba cerrada por el servidor, un reintento con una nueva
+        for intento in range(2):
+            try:
+                conn = self._conns.get_nowait()
+                reutilizada = True
+            except queue.Empty:
+                conn = self._nueva_conexion()
+                reutilizada = False
+            try:
+                conn.request("POST", self._path, body=body, headers=headers)
+                resp = conn.getresponse()
+                payload = json.loads(resp.read().decode("utf-8") or "{}")
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reutilizada and intento == 0:
+                    continue
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                try:
+                    self._conns.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            return payload
+        return {}
+
+    def _cacheado(self, token: str) -> Optional[bool]:
+        with self._cache_lock:
+            hit = self._cache.get(token)
+            if hit is None:
+                return None
+            if hit[0] < time.monotonic():
+                self._cache.pop(token, None)
+                return None
+            return hit[1]
+
+    def _guardar(self, token: str, veredicto: bool) -> None:
+        with self._cache_lock:
+            self._cache[token] = (time.monotonic() + self.TOKEN_TTL, veredicto)
+            while len(self._cache) > self._max_cache:
+                self._cache.popitem(last=False)
+
+    def verificar(self, token: Optional[str], remote_ip: Optional[str]) -> bool:
+        if not token:
+            return False
+        cached = self._cacheado(token)
+        if cached is not None:
+            return cached
+        body = urllib.parse.urlencode({
+            "secret": self.secret,
+            "response": token,
+            "remoteip": remote_ip or "",
+        }).encode()
+        try:
+            veredicto = bool(self._post(body).get("success"))
+        except Exception:
+            # Error de red: no se cachea, el usuario puede reintentar
+            return False
+        # Aprobado o no, el token ya no sirve para otro envío
+        self._guardar(token, False)
+        return veredicto
+
+    def verificar_async(self, token: Optional[str], remote_ip: Optional[str]):
+        """Lanza la verificación en segundo plano; devuelve un Future[bool]."""
+        if self._executor is None:
+            with self._cache_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._conns.maxsize, thread_name_prefix="turnstile")
+        return self._executor.submit(self.verificar, token, remote_ip)
+
+
+turnstile_client = TurnstileClient(TURNSTILE_VERIFY_URL, TURNSTILE_SECRET_KEY, TURNSTILE_TIMEOUT)
+
+
+def verificar_turnstile(token: Optional[str], remote_ip: Optional[str]) -> bool:
+    if not TURNSTILE_ENABLED:
+        return True
+    return turnstile_client.verificar(token, remote_ip)
+
+
+class _VeredictoFijo:
+    """Future ya resuelto (Turnstile deshabilitado o sin token)."""
+
+    def __init__(self, valor: bool) -> None:
+        self.valor = valor
+
+    def result(self, timeout: Optional[float] = None) -> bool:
+        return self.valor
+
+
+def verificar_turnstile_async(token: Optional[str], remote_ip: Optional[str]):
+    """Como ``verificar_turnstile`` pero devuelve un objeto con ``.result()``."""
+    if not TURNSTILE_ENABLED:
+        return _VeredictoFijo(True)
+    if not token:
+        return _VeredictoFijo(False)
+    return turnstile_client.verificar_async(token, remote_ip)
+
+
+# Mensajes de httpx/socket cuando no se llega a Supabase (DNS, conexión, timeout)
+ERRORES_RED = (
+    "getaddrinfo failed",
+    "Name or service not known",
+    "Temporary failure in name resolution",
+    "Connection refused",
+    "Connection reset",
+    "Network is unreachable",
+    "Server disconnected",
+    "timed out",
+    "Supabase no disponible",
+)
+
+
+def _es_error_red(msg_text: str) -> bool:
+    return any(s in msg_text for s in ERRORES_RED)
+
+
+# None = todavía no probado; False = la función no existe en la base
+_rpc_soportado: Optional[bool] = None
+
+
+def _es_error_funcion_inexistente(exc: Exception) -> bool:
+    msg = str(exc) if exc else ""
+    return "PGRST202" in msg or "Could not find the function" in msg
+
+
+def _registrar_postulacion_rpc(data: Dict[str, Any], vacante_id: Optional[str]) -> Optional[Tuple[bool, Optional[str]]]:
+    """Candidato + postulación en una llamada atómica. None si la RPC no está instalada."""
+    global _rpc_soportado
+    if supabase is None or not POSTULACION_RPC or _rpc_soportado is False:
+        return None
+    params = {
+        "p_candidato": data,
+        "p_vacante_id": int(vacante_id) if vacante_id and str(vacante_id).isdigit() else None,
+    }
+    try:
+        res = con_reintentos(lambda: supabase.rpc("registrar_postulacion", params).execute())  # type: ignore[union-attr]
+    except Exception as e:
+        if _es_error_funcion_inexistente(e):
+            _rpc_soportado = False
+            return None
+        return False, str(e)
+    _rpc_soportado = True
+    if getattr(res, "data", None):
+        return True, None
+    return False, "No se pudo registrar la postulación"
+
+
+def _cv_archivo_local(cv_url: Optional[str]) -> Optional[str]:
+    """Nombre del PDF si ``cv_url`` apunta al fallback local /uploads (hay que subirlo al sincronizar)."""
+    if not cv_url or not SUPABASE_ENABLED:
+        return None
+    path = urllib.parse.urlsplit(cv_url).path
+    if "/uploads/" not in path:
+        return None
+    nombre = urllib.parse.unquote(path.rsplit("/uploads/", 1)[1])
+    return nombre if os.path.isfile(os.path.join(_ensure_upload_dir(), nombre)) else None
+
+
+def _registrar_local(data: Dict[str, Any], vacante_id: Optional[str], motivo: str) -> Tuple[bool, Optional[str]]:
+    """Guarda la postulación en el almacén local; el outbox la reenvía cuando vuelva Supabase."""
+    almacen = almacen_local()
+    if almacen is None:
+        return False, f"Sin conexión con la base ({motivo}) y sin almacén local"
+    try:
+        almacen.registrar(data, vacante_id, _cv_archivo_local(data.get("cv_url")), motivo)
+    except Exception as e:
+        return False, f"No se pudo guardar la postulación localmente: {e}"
+    return True, None
+
+
+def registrar_postulacion(
+    data: Dict[str, Any], vacante_id: Optional[str], tolerar_red: bool = True
+) -> Tuple[bool, Optional[str]]:
+    """Inserta candidato + postulación. Devuelve (ok, mensaje de error).
+
+    Usa la RPC transaccional si está instalada; si no, upsert + insert por separado.
+    Con ``tolerar_red``, sin Supabase o ante un error de red/DNS la postulación
+    se guarda en el almacén local (outbox); sin él se devuelve el error para que
+    el llamador pueda reintentar.
+    """
+    if supabase is None:
+        motivo = f"Supabase no disponible: {supabase_manager.ultimo_error or 'no configurado'}"
+        return _registrar_local(data, vacante_id, motivo) if tolerar_red else (False, motivo)
+
+    res_rpc = _registrar_postulacion_rpc(data, vacante_id)
+    if res_rpc is not None:
+        ok_rpc, err_rpc = res_rpc
+        if ok_rpc:
+            _outbox_evento.set()
+            return True, None
+        msg_text = str(err_rpc or "Error desconocido")
+        if tolerar_red and _es_error_red(msg_text):
+            return _registrar_local(data, vacante_id, msg_text)
+        return False, (
+            "Se actualizó el esquema. Probá nuevamente." if "PGRST204" in msg_text else msg_text
+        )
+
+    ok_ins, err_ins, cand_id = _insertar_candidato_si_no_existe(data)
+    if not ok_ins:
+        # Si hay error de red/DNS (p.ej. getaddrinfo failed), se guarda localmente
+        msg_text = str(err_ins or "Error desconocido")
+        if tolerar_red and _es_error_red(msg_text):
+            return _registrar_local(data, vacante_id, msg_text)
+        return False, (
+            "Se actualizó el esquema. Probá nuevamente." if (err_ins and "PGRST204" in msg_text) else msg_text
+        )
+
+    ok_pos, err_pos = _insertar_postulacion(cand_id, vacante_id)
+    if not ok_pos:
+        msg_text = str(err_pos or "Error desconocido")
+        if tolerar_red and _es_error_red(msg_text):
+            # El upsert del candidato es idempotente: el reenvío lo repite sin problema
+            return _registrar_local(data, vacante_id, msg_text)
+        return False, (
+            "Se actualizó el esquema. Probá nuevamente." if (err_pos and "PGRST204" in msg_text) else msg_text
+        )
+    _outbox_evento.set()
+    return True, None
+
+
+# ==========================
+# Outbox: reenvío a Supabase
+# ==========================
+_outbox_evento = threading.Event()
+_outbox_lock = threading.Lock()
+_outbox_hilo: Optional[threading.Thread] = None
+_outbox_pid: Optional[int] = None
+
+
+def _subir_cv_pendiente(almacen: AlmacenLocal, fila: Dict[str, Any]) -> Optional[str]:
+    """Sube a Storage el CV que quedó en /uploads y corrige cv_url en el payload. Devuelve el error o None."""
+    payload = fila["payload"]
+    nombre = payload.get("cv_archivo")
+    if not nombre:
+        return None
+    path = os.path.join(_ensure_upload_dir(), nombre)
+    if os.path.isfile(path):
+        try:
+            with open(path, "rb") as fh:
+                supabase.storage.from_(BUCKET).upload(  # type: ignore[union-attr]
+                    path=nombre, file=fh, file_options={"contentType": "application/pdf", "upsert": "false"}
+                )
+        except Exception as e:
+            if not _es_conflicto_storage(e):
+                return str(e)
+        _recordar_cv_subido(nombre)
+        payload["data"]["cv_url"] = cv_public_url(nombre)
+    # Sin archivo (borrado a mano) queda la URL local que ya tenía
+    payload["cv_archivo"] = None
+    almacen.actualizar_payload(fila["id"], payload)
+    return None
+
+
+def _enviar_lote_outbox(filas: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Un upsert de candidatos (por DNI) y un insert de postulaciones para todo el lote."""
+    candidatos: Dict[str, Dict[str, Any]] = {}
+    for f in filas:
+        data = f["payload"]["data"]
+        # El último envío de cada DNI es el que vale (como en el upsert individual)
+        candidatos[str(data.get("dni"))] = data
+    res_c = con_reintentos(
+        lambda: supabase.table("candidatos").upsert(list(candidatos.values()), on_conflict="dni").execute()  # type: ignore[union-attr]
+    )
+    ids = {str(c.get("dni")): c.get("id") for c in (res_c.data or [])}
+    faltan = [dni for dni in candidatos if not ids.get(dni)]
+    if faltan:
+        raise RuntimeError(f"El upsert no devolvió los candidatos {', '.join(faltan[:5])}")
+    payload = []
+    for f in filas:
+        vid = f["payload"].get("vacante_id")
+        payload.append({
+            "candidato_id": ids[str(f["payload"]["data"].get("dni"))],
+            "vacante_id": (int(vid) if str(vid).isdigit() else vid) if vid else None,
+            "estado": "recibido",
+            "tipo": "vacante" if vid else "general",
+        })
+    res_p = con_reintentos(lambda: supabase.table("postulaciones").insert(payload).execute())  # type: ignore[union-attr]
+    creadas = res_p.data or []
+    if len(creadas) != len(payload):
+        raise RuntimeError("El insert de postulaciones no devolvió todas las filas")
+    return {
+        f["id"]: {"candidato_id": p["candidato_id"], "postulacion_id": c.get("id")}
+        for f, p, c in zip(filas, payload, creadas)
+    }
+
+
+def reproducir_outbox(lote: int = OUTBOX_LOTE) -> Dict[str, int]:
+    """Reenvía a Supabase un lote del outbox local. Devuelve {"enviadas", "fallidas"}.
+
+    Todo el lote va en dos requests; si falla por algo que no es de red se
+    reintenta fila por fila para aislar la que tiene el problema.
+    """
+    resultado = {"enviadas": 0, "fallidas": 0}
+    almacen = almacen_local()
+    if almacen is None or asegurar_supabase() is None:
+        return resultado
+    listas: List[Dict[str, Any]] = []
+    for fila in almacen.reclamar_outbox(lote):
+        err = _subir_cv_pendiente(almacen, fila)
+        if err:
+            almacen.marcar_fallidos([fila["id"]], err, red=_es_error_red(err))
+            resultado["fallidas"] += 1
+        else:
+            listas.append(fila)
+    if not listas:
+        return resultado
+
+    try:
+        remotos = _enviar_lote_outbox(listas)
+    except Exception as e:
+        msg = str(e)
+        if _es_error_red(msg):
+            almacen.marcar_fallidos([f["id"] for f in listas], msg, red=True)
+            resultado["fallidas"] += len(listas)
+            return resultado
+        app.logger.warning("outbox: el lote falló (%s); se reintenta fila por fila", msg)
+        remotos = {}
+        for fila in listas:
+            ok, err = registrar_postulacion(fila["payload"]["data"], fila["payload"].get("vacante_id"), tolerar_red=False)
+            if ok:
+                remotos[fila["id"]] = {}
+            else:
+                almacen.marcar_fallidos([fila["id"]], err or "Error desconocido", red=_es_error_red(err or ""))
+                resultado["fallidas"] += 1
+    almacen.marcar_enviados(remotos)
+    resultado["enviadas"] += len(remotos)
+    return resultado
+
+
+def _bucle_outbox() -> None:
+    vueltas = 0
+    while True:
+        _outbox_evento.wait(OUTBOX_INTERVALO)
+        _outbox_evento.clear()
+        try:
+            almacen = almacen_local()
+            if almacen is None:
+                continue
+            # Mientras avance, sigue con el próximo lote sin esperar
+            while almacen.hay_pendientes() and reproducir_outbox()["enviadas"]:
+                pass
+            vueltas += 1
+            if vueltas % 240 == 0:
+                almacen.purgar_enviados(ENVIO_RETENCION)
+        except Exception as e:
+            app.logger.warning("outbox: %s", e)
+
+
+def iniciar_outbox() -> None:
+    """Arranca el hilo de reenvío de este proceso (idempotente, también tras un fork)."""
+    global _outbox_hilo, _outbox_pid
+    if not supabase_manager.habilitado or almacen_local() is None:
+        return
+    with _outbox_lock:
+        if _outbox_hilo is not None and _outbox_pid == os.getpid() and _outbox_hilo.is_alive():
+            return
+        _outbox_hilo = threading.Thread(target=_bucle_outbox, name="outbox", daemon=True)
+        _outbox_pid = os.getpid()
+        _outbox_hilo.start()
+
+
+# ==========================
+# Envío de postulaciones en segundo plano
+# ==========================
+# Cada envío queda en SPOOL_DIR como <id>.pdf + <id>.json antes de responder;
+# un pool acotado sube el CV y escribe en la DB con reintentos. Si el proceso
+# se reinicia, los envíos pendientes se retoman al arrancar.
+_envios_pool: Optional[ThreadPoolExecutor] = None
+_envios_cupos = threading.BoundedSemaphore(POSTULACION_COLA_MAX)
+_envios_lock = threading.Lock()
+ENVIO_LOCK_TTL = 600  # segundos; un lock más viejo se considera abandonado
+ENVIO_REINTENTO_COLA_LLENA = 5.0  # segundos hasta volver a probar si la cola estaba llena
+
+
+class _ClaveEnvio:
+    """Estado de un (dni, vacante) mientras tenga envíos en curso.
+
+    ``ultimo`` es el envío vigente (los anteriores todavía en cola se
+    descartan) y ``lock`` serializa los intentos. La entrada se borra cuando
+    termina el último envío de ``en_curso``: sin eso habría una por DNI para
+    toda la vida del worker.
+    """
+
+    __slots__ = ("lock", "ultimo", "en_curso")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.ultimo: Optional[str] = None
+        self.en_curso: set = set()
+
+
+_envios_claves: Dict[str, _ClaveEnvio] = {}
+
+
+def _spool_path(envio_id: str, ext: str) -> str:
+    return os.path.join(SPOOL_DIR, f"{secure_filename(envio_id)}.{ext}")
+
+
+def _guardar_envio(rec: Dict[str, Any]) -> None:
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    target = _spool_path(rec["id"], "json")
+    tmp = target + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(rec, fh, ensure_ascii=False)
+    os.replace(tmp, target)
+
+
+def leer_envio(envio_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_spool_path(envio_id, "json"), encoding="utf-8") as fh:
+            return json.load(fh)
+    except Exception:
+        return None
+
+
+def _reclamar_envio(envio_id: str) -> bool:
+    """Lock entre procesos (gunicorn) para que un envío lo procese un solo worker."""
+    lock = _spool_path(envio_id, "lock")
+    for _ in range(2):
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock) > ENVIO_LOCK_TTL:
+                    os.remove(lock)
+                    continue
+            except OSError:
+                pass
+            return False
+    return False
+
+
+def _liberar_envio(envio_id: str) -> None:
+    try:
+        os.remove(_spool_path(envio_id, "lock"))
+    except OSError:
+        pass
+
+
+def _clave_envio(dni: str, vacante_id: Optional[str]) -> str:
+    return f"{dni}:{vacante_id or 'general'}"
+
+
+def crear_envio(data: Dict[str, Any], vacante_id: Optional[str], file_storage, url_root: str) -> Dict[str, Any]:
+    """Guarda el PDF y el registro pendiente en disco. No toca la red."""
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    envio_id = uuid.uuid4().hex
+    stream = getattr(file_storage, "stream", None)
+    if isinstance(stream, CVIngest):
+        # Ya está en disco: se mueve en vez de copiarse
+        stream.persistir(_spool_path(envio_id, "pdf"))
+        digest: Optional[str] = stream.sha256
+    else:
+        file_storage.save(_spool_path(envio_id, "pdf"))
+        digest = None
+    rec = {
+        "id": envio_id,
+        "sha256": digest,
+        "dni": data.get("dni"),
+        "vacante_id": vacante_id,
+        "data": data,
+        "url_root": url_root,
+        "estado": "pendiente",
+        "intentos": 0,
+        "error": None,
+        "cv_url": None,
+        "creado": datetime.now(timezone.utc).isoformat(),
+    }
+    _guardar_envio(rec)
+    return rec
+
+
+def marcar_ultimo_envio(rec: Dict[str, Any]) -> None:
+    """Registra ``rec`` como el envío vigente de su (dni, vacante); los anteriores en cola se descartan.
+
+    Sólo con el captcha aprobado: un envío rechazado no puede reemplazar a uno real.
+    """
+    with _envios_lock:
+        estado = _envios_claves.setdefault(_clave_envio(rec.get("dni") or "", rec.get("vacante_id")), _ClaveEnvio())
+        estado.ultimo = rec["id"]
+        estado.en_curso.add(rec["id"])
+
+
+def _terminar_envio(clave: str, envio_id: str) -> None:
+    """Saca el envío de los en curso; sin otros pendientes se olvida la clave."""
+    with _envios_lock:
+        estado = _envios_claves.get(clave)
+        if estado is None:
+            return
+        estado.en_curso.discard(envio_id)
+        if not estado.en_curso:
+            del _envios_claves[clave]
+
+
+def _pool_envios() -> ThreadPoolExecutor:
+    global _envios_pool
+    with _envios_lock:
+        if _envios_pool is None:
+            _envios_pool = ThreadPoolExecutor(max_workers=POSTULACION_WORKERS, thread_name_prefix="postulacion")
+        return _envios_pool
+
+
+def encolar_envio(envio_id: str) -> bool:
+    """Encola el envío; devuelve False si la cola está llena (backpressure)."""
+    if not _envios_cupos.acquire(blocking=False):
+        return False
+
+    def _run() -> None:
+        try:
+            procesar_envio(envio_id)
+        finally:
+            _envios_cupos.release()
+
+    _pool_envios().submit(_run)
+    return True
+
+
+def _reintentar_envio(envio_id: str, espera: float) -> None:
+    """Vuelve a encolar el envío dentro de ``espera`` segundos.
+
+    La espera corre en un Timer: el hilo del pool y el lock del DNI quedan
+    libres para otros envíos mientras tanto.
+    """
+
+    def _encolar() -> None:
+        if not encolar_envio(envio_id):
+            _reintentar_envio(envio_id, ENVIO_REINTENTO_COLA_LLENA)
+
+    timer = threading.Timer(espera, _encolar)
+    timer.daemon = True
+    timer.start()
+
+
+def procesar_envio(envio_id: str) -> Dict[str, Any]:
+    """Un intento de subir el CV y registrar la postulación de un envío del spool.
+
+    Si falla y quedan intentos, el envío vuelve a "pendiente" y se reprograma
+    con backoff (ver _reintentar_envio); al agotarlos queda en "error".
+    """
+    rec = leer_envio(envio_id)
+    if rec is None or rec.get("estado") in {"ok", "reemplazado"}:
+        return rec or {"id": envio_id, "estado": "desconocido"}
+    if not _reclamar_envio(envio_id):
+        return rec
+    clave = _clave_envio(rec.get("dni") or "", rec.get("vacante_id"))
+    with _envios_lock:
+        # Tras un reinicio el envío no pasó por marcar_ultimo_envio
+        estado = _envios_claves.setdefault(clave, _ClaveEnvio())
+        estado.en_curso.add(envio_id)
+    espera: Optional[float] = None
+    try:
+        with estado.lock:
+            # Idempotencia por DNI: si llegó un envío más nuevo, éste se descarta
+            if estado.ultimo and estado.ultimo != envio_id and not rec.get("cv_url"):
+                rec["estado"] = "reemplazado"
+                _guardar_envio(rec)
+                _borrar_pdf_spool(envio_id)
+                return rec
+            rec["estado"] = "procesando"
+            _guardar_envio(rec)
+            # Los hilos del pool no pasan por before_request. Si Supabase está
+            # configurado pero el cliente aún no se pudo crear y no hay almacén
+            # local, se reintenta más tarde; con almacén va al outbox.
+            local = almacen_local() is not None
+            if asegurar_supabase() is None and supabase_manager.habilitado and not local:
+                ok, err = False, f"Supabase no disponible: {supabase_manager.ultimo_error}"
+            else:
+                try:
+                    # url_for necesita contexto de request para el fallback local de /uploads
+                    with app.test_request_context(base_url=rec.get("url_root") or "http://localhost/"):
+                        if not rec.get("cv_url"):
+                            with open(_spool_path(envio_id, "pdf"), "rb") as fh:
+                                cv = FileStorage(stream=fh, filename=f"{rec.get('dni')}.pdf", content_type="application/pdf")
+                                rec["cv_url"] = subir_cv_y_obtener_url(str(rec.get("dni") or ""), cv, rec.get("sha256"))
+                            rec["data"]["cv_url"] = rec["cv_url"]
+                            _guardar_envio(rec)
+                        ok, err = registrar_postulacion(rec["data"], rec.get("vacante_id"), tolerar_red=local)
+                except Exception as e:
+                    ok, err = False, str(e)
+            rec["intentos"] = int(rec.get("intentos") or 0) + 1
+            if ok:
+                rec["estado"], rec["error"] = "ok", None
+                _guardar_envio(rec)
+                _borrar_pdf_spool(envio_id)
+                return rec
+            rec["error"] = err
+            if rec["intentos"] >= POSTULACION_MAX_INTENTOS:
+                # Queda en disco para reprocesar a mano; no se pierde la postulación
+                rec["estado"] = "error"
+                _guardar_envio(rec)
+                return rec
+            rec["estado"] = "pendiente"
+            _guardar_envio(rec)
+            espera = min(30.0, 2 ** rec["intentos"]) * (0.5 + random.random() / 2)
+            return rec
+    finally:
+        _liberar_envio(envio_id)
+        if espera is not None:
+            _reintentar_envio(envio_id, espera)
+        else:
+            _terminar_envio(clave, envio_id)
+
+
+def _borrar_pdf_spool(envio_id: str) -> None:
+    try:
+        os.remove(_spool_path(envio_id, "pdf"))
+    except OSError:
+        pass
+
+
+def descartar_envio(envio_id: str) -> None:
+    """Borra un envío que todavía no se encoló (p.ej. Turnstile rechazado)."""
+    rec = leer_envio(envio_id)
+    if rec is not None:
+        clave = _clave_envio(rec.get("dni") or "", rec.get("vacante_id"))
+        with _envios_lock:
+            estado = _envios_claves.get(clave)
+            if estado is not None and estado.ultimo == envio_id:
+                estado.ultimo = None
+        _terminar_envio(clave, envio_id)
+    _borrar_pdf_spool(envio_id)
+    try:
+        os.remove(_spool_path(envio_id, "json"))
+    except OSError:
+        pass
+
+
+ENVIO_RETENCION = 7 * 24 * 3600  # segundos que se conservan los envíos terminados
+
+
+def reanudar_envios_pendientes() -> int:
+    """Re-encola envíos pendientes del spool (p.ej. tras un reinicio) y purga los terminados viejos."""
+    if not os.path.isdir(SPOOL_DIR):
+        return 0
+    n = 0
+    for name in sorted(os.listdir(SPOOL_DIR)):
+        if not name.endswith(".json"):
+            continue
+        rec = leer_envio(name[:-5])
+        if not rec:
+            continue
+        if rec.get("estado") in {"pendiente", "procesando"}:
+            if encolar_envio(rec["id"]):
+                n += 1
+        elif rec.get("estado") in {"ok", "reemplazado"}:
+            try:
+                if time.time() - os.path.getmtime(os.path.join(SPOOL_DIR, name)) > ENVIO_RETENCION:
+                    os.remove(os.path.join(SPOOL_DIR, name))
+            except OSError:
+                pass
+    return n
+
+
+# ==========================
+# Caché de páginas públicas
+# ==========================
+class _NoCacheable(Exception):
+    """La vista devolvió algo que no debe guardarse (redirect, error, datos parciales)."""
+
+    def __init__(self, response) -> None:
+        self.response = response
+
+
+def _clave_pagina() -> str:
+    # Sólo la ruta: las vistas cacheadas no leen la query string, y con ella en la
+    # clave cada "/?x=<azar>" sería una entrada nueva (sin límite en SQLite/Redis)
+    return f"pagina:{request.path}"
+
+
+def cache_pagina(view):
+    """Cachea el HTML de una vista pública GET con ETag/Last-Modified y responde 304.
+
+    La clave es sólo la ruta: no usar con vistas que dependan de
+    ``request.args``. Se saltea la caché si hay mensajes flash
+    pendientes en la sesión (el HTML saldría con ellos) y no se guarda la
+    respuesta si no es 200, si no hay Supabase o si la vista marcó
+    ``g.no_cachear`` (p.ej. una consulta falló y se mostró la página vacía).
+    Las entradas se invalidan vía notificar_cambio("vacantes"/"areas"...).
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if PAGE_CACHE_TTL <= 0 or supabase is None or session.get("_flashes"):
+            resp = make_response(view(*args, **kwargs))
+            resp.headers.setdefault("Cache-Control", "private, no-cache")
+            return resp
+
+        def _renderizar() -> Dict[str, Any]:
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code != 200 or g.get("no_cachear") or supabase is None:
+                raise _NoCacheable(resp)
+            cuerpo = resp.get_data(as_text=True)
+            return {
+                "cuerpo": cuerpo,
+                "mimetype": resp.mimetype,
+                "etag": hashlib.sha256(cuerpo.encode("utf-8")).hexdigest()[:32],
+                "modificado": int(time.time()),
+            }
+
+        try:
+            pagina = pagina_cache.get(_clave_pagina(), _renderizar)
+        except _NoCacheable as e:
+            e.response.headers.setdefault("Cache-Control", "private, no-cache")
+            return e.response
+        resp = app.response_class(pagina["cuerpo"], mimetype=pagina["mimetype"])
+        resp.set_etag(pagina["etag"])
+        resp.last_modified = datetime.fromtimestamp(pagina["modificado"], timezone.utc)
+        if PAGE_CACHE_CONTROL:
+            resp.headers["Cache-Control"] = PAGE_CACHE_CONTROL
+        return resp.make_conditional(request)
+
+    return wrapper
+
+
+# ==========================
+# Templates (Jinja)
+# ==========================
+# Jinja guarda el bytecode por nombre de template y lo invalida por checksum del
+# fuente: un deploy con templates nuevos no levanta bytecode viejo. El bytecode
+# se ejecuta al cargarlo, así que el directorio no puede ser escribible por otros.
+def cache_bytecode(directorio: Optional[str]) -> FileSystemBytecodeCache:
+    """FileSystemBytecodeCache en ``directorio`` (se crea con modo 0700) o en el de Jinja si es None.
+
+    Lanza OSError si el directorio no es del usuario del proceso, es un symlink
+    o tiene escritura para el grupo u otros.
+    """
+    patron = "postulaciones-%s.cache"
+    if directorio is None:
+        return FileSystemBytecodeCache(pattern=patron)
+    os.makedirs(directorio, mode=0o700, exist_ok=True)
+    st = os.lstat(directorio)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise OSError(f"{directorio} debe ser un directorio del usuario {os.getuid()} sin escritura para otros")
+    return FileSystemBytecodeCache(directorio, patron)
+
+
+def _configurar_jinja() -> None:
+    if not JINJA_BYTECODE_CACHE:
+        return
+    try:
+        app.jinja_env.bytecode_cache = cache_bytecode(JINJA_CACHE_DIR)
+    except (OSError, RuntimeError) as e:
+        # RuntimeError: el directorio por defecto de Jinja no pasó su chequeo de dueño/permisos
+        app.logger.warning("Sin caché de bytecode de Jinja (%s): %s", JINJA_CACHE_DIR or "directorio de Jinja", e)
+
+
+_configurar_jinja()
+
+
+def precompilar_templates() -> int:
+    """Compila todos los templates y los deja en la caché del Environment (y en disco).
+
+    El primer request de cada página no paga el parseo y un template roto aparece
+    en el log al arrancar. Devuelve cuántos compilaron.
+    """
+    compilados = 0
+    for nombre in app.jinja_env.list_templates(extensions=["html"]):
+        try:
+            app.jinja_env.get_template(nombre)
+            compilados += 1
+        except Exception as e:
+            app.logger.error("El template %s no compila: %s", nombre, e)
+    return compilados
+
+
+def _en_partes(fragmentos: Iterable[str], minimo: int) -> Iterator[str]:
+    """Junta los fragmentos de Jinja en partes de al menos ``minimo`` caracteres."""
+    buffer: List[str] = []
+    largo = 0
+    for fragmento in fragmentos:
+        buffer.append(fragmento)
+        largo += len(fragmento)
+        if largo >= minimo:
+            yield "".join(buffer)
+            buffer, largo = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def render_listado(nombre: str, **contexto: Any):
+    """render_template en streaming para los listados de admin.
+
+    Las consultas ya se hicieron en la vista (errores y redirects siguen
+    funcionando); lo que sale de a partes es el HTML, así el navegador baja el
+    <head> mientras se renderizan las filas y el worker no arma la página entera
+    en memoria. Con mensajes flash pendientes se renderiza de una, como en
+    cache_pagina: en streaming la cookie de sesión sale antes que el cuerpo y el
+    flash quedaría sin consumir.
+    """
+    if not TEMPLATE_STREAMING or session.get("_flashes"):
+        return render_template(nombre, **contexto)
+    plantilla = app.jinja_env.get_template(nombre)
+    app.update_template_context(contexto)
+
+    def _generar() -> Iterator[str]:
+        inicio = time.perf_counter()
+        yield from _en_partes(plantilla.generate(contexto), TEMPLATE_STREAM_CHUNK)
+        if METRICS_ENABLED:
+            metricas.observar("postulaciones_template_stream_seconds", (("template", nombre),), time.perf_counter() - inicio)
+
+    resp = Response(stream_with_context(_generar()), mimetype="text/html")
+    # Nginx no debe bufferear la página entera antes de reenviarla
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
+# ==========================
+# Assets estáticos (build_static.py)
+# ==========================
+_MIME_IMAGEN = {"avif": "image/avif", "webp": "image/webp"}
+_manifest_assets: Optional[Dict[str, Any]] = None
+
+
+def manifest_assets() -> Dict[str, Any]:
+    """manifest.json del último build ({} si no se corrió). En debug se relee en cada uso."""
+    global _manifest_assets
+    if _manifest_assets is None or FLASK_DEBUG:
+        try:
+            with open(STATIC_MANIFEST, "r", encoding="utf-8") as f:
+                _manifest_assets = json.load(f)
+        except FileNotFoundError:
+            _manifest_assets = {}
+        except (OSError, ValueError) as e:
+            app.logger.warning("Manifest de assets ilegible (%s): %s", STATIC_MANIFEST, e)
+            _manifest_assets = {}
+    return _manifest_assets
+
+
+@app.template_global()
+def asset_url(nombre: str) -> str:
+    """URL de un archivo de static/: la copia con hash si hay build, si no el original."""
+    return url_for("static", filename=manifest_assets().get("archivos", {}).get(nombre, nombre))
+
+
+@app.template_global()
+def asset_imagen(nombre: str, alto: int) -> Dict[str, Any]:
+    """Fuentes de una imagen mostrada a ``alto`` px: AVIF/WebP y el formato original, en 1x y 2x.
+
+    Lo usa la macro ``imagen`` de templates/macros.html para armar el <picture>.
+    Sin variantes para esa altura devuelve sólo ``src`` (la copia con hash o el original).
+    """
+    resultado: Dict[str, Any] = {"src": asset_url(nombre), "srcset": "", "fuentes": [], "ancho": None, "alto": None}
+    info = manifest_assets().get("imagenes", {}).get(nombre)
+    por_formato: Dict[str, Dict[int, Dict[str, Any]]] = {}
+    for v in (info or {}).get("variantes", []):
+        if v["alto"] == alto:
+            por_formato.setdefault(v["formato"], {})[v["escala"]] = v
+    base = next((f for f in por_formato if f not in _MIME_IMAGEN), None)
+    if base is None:
+        return resultado
+
+    def _srcset(escalas: Dict[int, Dict[str, Any]]) -> str:
+        return ", ".join(f"{url_for('static', filename=v['archivo'])} {e}x" for e, v in sorted(escalas.items()))
+
+    uno = por_formato[base].get(1) or next(iter(por_formato[base].values()))
+    resultado.update(
+        src=url_for("static", filename=uno["archivo"]),
+        srcset=_srcset(por_formato[base]),
+        ancho=uno["ancho_px"],
+        alto=uno["alto_px"],
+        fuentes=[
+            {"tipo": mime, "srcset": _srcset(por_formato[formato])}
+            for formato, mime in _MIME_IMAGEN.items()
+            if formato in por_formato
+        ],
+    )
+    return resultado
+
+
+@app.after_request
+def _cache_assets(resp):
+    # Nginx sirve /static/ directo; esto cubre el servidor de desarrollo y gunicorn solo
+    if (
+        STATIC_INMUTABLE_MAX_AGE > 0
+        and request.endpoint == "static"
+        and str((request.view_args or {}).get("filename", "")).startswith("dist/")
+        and resp.status_code in (200, 304)
+    ):
+        resp.headers["Cache-Control"] = f"public, max-age={STATIC_INMUTABLE_MAX_AGE}, immutable"
+    return resp
+
+
+# ==========================
+# Arranque del worker y salud
+# ==========================
+@app.before_request
+def _supabase_por_request():
+    # Barato si el cliente ya existe; si no, lo crea o reintenta pasado el backoff
+    asegurar_supabase()
+
+
+def calentar_worker(timeout: float = SUPABASE_WARMUP_TIMEOUT) -> bool:
+    """Crea el cliente y abre las conexiones antes del primer request.
+
+    Pensado para el ``post_fork`` de gunicorn (ver gunicorn_config.py): carga los
+    catálogos en la caché y deja conexiones keep-alive abiertas hacia PostgREST
+    y Storage. No espera más de ``timeout`` segundos; si Supabase no responde
+    el worker arranca igual y reintenta en los requests.
+    """
+    def _calentar() -> None:
+        if asegurar_supabase() is None:
+            return
+        precargar_catalogos(lambda: supabase.storage.from_(BUCKET).list("", {"limit": 1}))  # type: ignore[union-attr]
+        supabase_manager.calentado_en = time.time()
+
+    def _seguro() -> None:
+        try:
+            _calentar()
+        except Exception as e:
+            supabase_manager.ultimo_error = str(e)
+
+    hilo = threading.Thread(target=_seguro, name="warmup", daemon=True)
+    hilo.start()
+    # Lo que quedó en el outbox local se reenvía apenas haya conexión
+    iniciar_outbox()
+    _outbox_evento.set()
+    hilo.join(timeout)
+    return supabase_manager.calentado_en is not None
+
+
+# notify() del worker de gunicorn (lo registra post_fork); None fuera de gunicorn
+_latido_worker: Optional[Any] = None
+
+
+def registrar_latido_worker(notify) -> None:
+    global _latido_worker
+    _latido_worker = notify
+
+
+def latido_worker() -> None:
+    """Avisa al arbiter que el worker sigue vivo durante una respuesta larga.
+
+    Con workers sync gunicorn mata al que no da señales en ``timeout`` segundos,
+    aunque esté enviando datos (p. ej. una exportación en streaming).
+    """
+    if _latido_worker is not None:
+        try:
+            _latido_worker()
+        except Exception:
+            pass
+
+
+@app.get("/healthz")
+def healthz():
+    """Probe para el balanceador/systemd. ``?profundo=1`` además consulta PostgREST."""
+    asegurar_supabase()
+    estado = supabase_manager.estado()
+    ok = supabase is not None or not supabase_manager.habilitado
+    cuerpo: Dict[str, Any] = {"ok": ok, "modo": "supabase" if supabase is not None else "local", "supabase": estado}
+    outbox = leer_local("resumen_outbox")
+    if outbox is not None:
+        cuerpo["outbox"] = outbox
+    elif LOCAL_DB_ENABLED:
+        cuerpo["outbox"] = {"error": _almacen_local_error}
+    if request.args.get("profundo") and supabase is not None:
+        ping_ok, err, ms = supabase_manager.ping()
+        cuerpo["ping"] = {"ok": ping_ok, "ms": round(ms, 1), "error": err}
+        ok = ok and ping_ok
+        cuerpo["ok"] = ok
+    return cuerpo, (200 if ok else 503)
+
+
+def _metricas_autorizado() -> bool:
+    if METRICS_TOKEN and hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {METRICS_TOKEN}"):
+        return True
+    if _is_admin():
+        return True
+    # Scrape directo al puerto local; lo que llega por Nginx trae X-Forwarded-For
+    proxied = request.headers.get("X-Forwarded-For") or request.headers.get("X-Real-IP")
+    return request.remote_addr in {"127.0.0.1", "::1"} and not proxied
+
+
+@app.get("/metrics")
+def metrics():
+    """Métricas en formato Prometheus (ver la sección Métricas e instrumentación)."""
+    if not _metricas_autorizado():
+        return {"ok": False, "error": "No autorizado"}, 403
+    return Response(exponer_metricas(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ==========================
+# Rutas públicas
+# ==========================
+@app.route("/")
+@cache_pagina
+def home():
+    vacantes: List[Dict[str, Any]] = []
+    try:
+        # Sólo abiertas, en paralelo con los catálogos (sin conexión: la última copia local)
+        (filas,) = precargar_catalogos(vacantes_repo.abiertas)
+        # Copia: enriquecer_area modifica las filas y éstas viven en la caché
+        vacantes = [dict(v) for v in filas]
+    except Exception:
+        vacantes = []
+        # No guardar en caché de páginas un listado vacío por un error transitorio
+        g.no_cachear = True
+    # Enriquecer con nombres de catálogos (área)
+    enriquecer_area(vacantes)
+    return render_template("landing.html", vacantes=vacantes)
+
+
+# Nueva ruta: detalle de vacante
+@app.route("/vacante/<int:vacante_id>")
+@cache_pagina
+def vacante_detalle(vacante_id: int):
+    vacante: Optional[Dict[str, Any]] = None
+    try:
+        (v,) = precargar_catalogos(lambda: vacantes_repo.detalle(vacante_id))
+        vacante = dict(v) if v else None
+    except Exception:
+        vacante = None
+        g.no_cachear = True
+    # Mapear nombre de área si viene como id
+    if vacante and vacante.get("area") is not None:
+        enriquecer_area([vacante])
+    if not vacante:
+        flash("Vacante no encontrada", "warning")
+        return redirect(url_for("home"))
+    return render_template("vacante_detalle.html", vacante=vacante)
+
+
+@app.route("/form")
+def form_postulante():
+    # Formulario alternativo (plantilla extendida de base)
+    loc_map, _ = cargar_catalogos()
+    localidades = [{"id": i, "nombre": n} for i, n in loc_map.items()]
+    areas_cat = get_areas_catalogo()
+    return render_template("form_postulante.html", localidades=localidades, areas=areas_cat, turnstile_site_key=TURNSTILE_SITE_KEY)
+
+
+@app.route("/postular", methods=["GET", "POST"])
+def postular():
+    if request.method == "GET":
+        vacante_id = request.args.get("vacante_id") or ""
+        area_prefill = request.args.get("area") or request.args.get("area_prefill") or ""
+
+        def _area_de_vacante() -> Optional[Any]:
+            if not vacante_id.isdigit() or area_prefill:
+                return None
+            try:
+                # Misma entrada de caché que el detalle de la vacante
+                v = vacantes_repo.detalle(int(vacante_id))
+                return v.get("area") if v else None
+            except Exception:
+                return None
+
+        # Catálogos y prefill de la vacante en paralelo
+        (area_vacante,) = precargar_catalogos(_area_de_vacante)
+        area_prefill = area_prefill or area_vacante or ""
+        areas, disponibilidades, localidades = cargar_opciones_postulacion()
+        # Reemplazar areas con catálogo con id/nombre
+        areas = get_areas_catalogo()
+        # Normalizar: si area_prefill es id, convertir a nombre usando catálogo
+        if area_prefill:
+            indice, _ = indices_area()
+            area_prefill = indice.nombre(area_prefill) or area_prefill
+        return render_template(
+            "postular.html",
+            mensaje=None,
+            exito=None,
+            areas=areas,
+            disponibilidades=disponibilidades,
+            localidades=localidades,
+            area_prefill=area_prefill,
+            vacante_id=vacante_id,
+            turnstile_site_key=TURNSTILE_SITE_KEY,
+        )
+
+    # POST: procesar envío
+    form = request.form
+    files = request.files
+
+    ok, errs = validar_campos_postulacion(form, files)
+    if not ok:
+        areas, disponibilidades, localidades = cargar_opciones_postulacion()
+        areas = get_areas_catalogo()
+        return (
+            render_template(
+                "postular.html",
+                mensaje="Completá todos los campos.",
+                exito=False,
+                areas=areas,
+                disponibilidades=disponibilidades,
+                localidades=localidades,
+                area_prefill=form.get("area_preferencia"),
+                vacante_id=form.get("vacante_id"),
+                turnstile_site_key=TURNSTILE_SITE_KEY,
+            ),
+            400,
+        )
+
+    # Turnstile se verifica en paralelo con el guardado/subida del CV; nada se
+    # registra en la DB hasta tener el veredicto.
+    ts_token = request.form.get("cf-turnstile-response")
+    veredicto = verificar_turnstile_async(ts_token, request.remote_addr)
+
+    def _turnstile_fallido():
+        areas, disponibilidades, localidades = cargar_opciones_postulacion()
+        areas = get_areas_catalogo()
+        return (
+            render_template(
+                "postular.html",
+                mensaje="Prueba fallida, intentá de nuevo.",
+                exito=False,
+                areas=areas,
+                disponibilidades=disponibilidades,
+                localidades=localidades,
+                area_prefill=form.get("area_preferencia"),
+                vacante_id=form.get("vacante_id"),
+                turnstile_site_key=TURNSTILE_SITE_KEY,
+            ),
+            400,
+        )
+
+    # Resolver área de preferencia (aceptar id o nombre)
+    area_nombre, area_id = resolver_area_desde_form(form.get("area_preferencia", ""))
+
+    data = {
+        "nombre_apellido": form.get("nombre_apellido", "").strip(),
+        "dni": form.get("dni", "").strip(),
+        "edad": int(form.get("edad", 0) or 0),
+        "area_preferencia": area_nombre,
+        "licencia_conducir": normalizar_checkbox(form.get("licencia_conducir")),
+        "movilidad_propia": normalizar_checkbox(form.get("movilidad_propia")),
+        "disponibilidad": form.get("disponibilidad", "").strip(),
+        "celular": form.get("celular", "").strip(),
+        "mail": form.get("mail", "").strip(),
+        "localidad": form.get("localidad", "").strip(),
+        "cv_url": None,
+        # Nuevos campos opcionales
+        "familiar_en_clinica": normalizar_checkbox(form.get("familiar_en_clinica")),
+        "fuente_postulacion": (form.get("fuente_postulacion", "") or "").strip() or None,
+    }
+    vacante_id = form.get("vacante_id") or None
+    file_cv = files.get("cv")
+
+    if POSTULACION_ASYNC:
+        # Spool a disco + registro pendiente; el pool sube el CV y escribe en la DB
         try:
-            ins = supabase.table("postulaciones").insert(payload).execute()
-            if ins.data:
-                return True, None
-            return False, "No se pudo registrar la postulación"
+            rec = crear_envio(data, vacante_id, file_cv, request.url_root)
         except Exception as e:
-            if is_pgrst204_error(e) and attempts == 0:
-                time.sleep(0.5)
-                attempts += 1
-                continue
-            return False, str(e)
-    return False, "No se pudo registrar la postulación"
+            return redirect(url_for("confirmacion", ok=0, error=f"Error guardando CV: {e}"))
+        if not veredicto.result():
+            descartar_envio(rec["id"])
+            return _turnstile_fallido()
+        marcar_ultimo_envio(rec)
+        if encolar_envio(rec["id"]):
+            return redirect(url_for("confirmacion", ok=1, error="", ref=rec["id"]))
+        # Cola llena: procesar en este request (el envío ya está a salvo en disco)
+        rec = procesar_envio(rec["id"])
+        if rec.get("estado") in {"ok", "pendiente"}:
+            # "pendiente": falló el primer intento y quedó reprogramado
+            return redirect(url_for("confirmacion", ok=1, error="", ref=rec["id"]))
+        return redirect(url_for("confirmacion", ok=0, error=rec.get("error") or "Error desconocido"))
+
+    try:
+        data["cv_url"] = subir_cv_y_obtener_url(data["dni"], file_cv)
+    except Exception as e:
+        if not veredicto.result():
+            return _turnstile_fallido()
+        return redirect(url_for("confirmacion", ok=0, error=f"Error subiendo CV: {e}"))
+    if not veredicto.result():
+        return _turnstile_fallido()
 
+    ok_reg, err_reg = registrar_postulacion(data, vacante_id)
+    if not ok_reg:
+        return redirect(url_for("confirmacion", ok=0, error=err_reg))
+    return redirect(url_for("confirmacion", ok=1, error=""))
 
-def validar_campos_postulacion(form, files) -> Tuple[bool, List[str]]:
-    errores: List[str] = []
-    required_fields = [
-        "nombre_apellido",
-        "dni",
-        "edad",
-        "localidad",
-        "disponibilidad",
-        "area_preferencia",
-        "celular",
-        "mail",
-        "licencia_conducir",
-        "movilidad_propia",
-        "familiar_en_clinica",
-        "fuente_postulacion",
-    ]
-    for f in required_fields:
-        if not (form.get(f) or str(form.get(f)) == "0"):
-            errores.append(f)
-    # Validar DNI: solo dígitos
-    dni_val = (form.get("dni") or "").strip()
-    if not dni_val.isdigit():
-        if "dni" not in errores:
-            errores.append("dni")
-    file_cv = files.get("cv")
-    if not file_cv or file_cv.filename == "":
-        errores.append("cv")
-    return (len(errores) == 0), errores
+
+@app.errorhandler(CVInvalido)
+@app.errorhandler(RequestEntityTooLarge)
+def cv_rechazado(exc):
+    # La lectura del body se cortó: no hay form para re-llenar, sólo el mensaje
+    if request.path != "/postular":
+        return exc
+    areas, disponibilidades, localidades = cargar_opciones_postulacion()
+    areas = get_areas_catalogo()
+    if isinstance(exc, RequestEntityTooLarge):
+        mensaje = f"El CV supera el tamaño máximo ({CV_MAX_BYTES // (1024 * 1024)} MB)."
+    else:
+        mensaje = "El CV debe ser un archivo PDF."
+    return (
+        render_template(
+            "postular.html",
+            mensaje=mensaje,
+            exito=False,
+            areas=areas,
+            disponibilidades=disponibilidades,
+            localidades=localidades,
+            area_prefill="",
+            vacante_id=request.args.get("vacante_id", ""),
+            turnstile_site_key=TURNSTILE_SITE_KEY,
+        ),
+        exc.code,
+    )
+
+
+@app.route("/confirmacion")
+def confirmacion():
+    ok = request.args.get("ok", "0") in {"1", "true", "True", "sí", "si"}
+    error = request.args.get("error")
+    ref = request.args.get("ref")
+    return render_template("confirmacion.html", ok=ok, error=error, ref=ref)
+
+
+@app.get("/postulacion/<envio_id>/estado")
+def estado_postulacion(envio_id: str):
+    """Estado de un envío en segundo plano (pendiente, procesando, ok, error, reemplazado)."""
+    rec = leer_envio(envio_id)
+    if rec is None:
+        return {"ok": False, "error": "No encontrado"}, 404
+    return {
+        "ok": True,
+        "estado": rec.get("estado"),
+        "intentos": rec.get("intentos", 0),
+        "error": rec.get("error") if rec.get("estado") == "error" else None,
+    }
+
+
+@app.route("/uploads/<path:filename>")
+def uploaded_file(filename: str):
+    return send_from_directory(_ensure_upload_dir(), filename)
+
+
+# ==========================
+# Paginación por cursor (keyset)
+# ==========================
+class Cursor:
+    """Posición de paginación sobre (created_at, id), orden descendente.
+
+    ``direccion`` es "after" (página siguiente) o "before" (página anterior).
+    ``pagina`` sólo se usa para mostrar el número de página.
+    """
+
+    def __init__(self, created_at: str, row_id: Any, pagina: int, direccion: str) -> None:
+        self.created_at = created_at
+        self.row_id = row_id
+        self.pagina = pagina
+        self.direccion = direccion
+
+    def encode(self) -> str:
+        raw = json.dumps([self.created_at, self.row_id, self.pagina], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: Optional[str], direccion: str) -> Optional["Cursor"]:
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            created_at, row_id, pagina = json.loads(raw.decode("utf-8"))
+            if not created_at or row_id is None:
+                return None
+            return cls(str(created_at), row_id, max(int(pagina), 1), direccion)
+        except Exception:
+            return None
+
+    @classmethod
+    def from_request(cls) -> Optional["Cursor"]:
+        return cls.decode(request.args.get("after"), "after") or cls.decode(request.args.get("before"), "before")
+
+
+def _pg_quote(value: Any) -> str:
+    # Valores entre comillas dentro de or=(...) para tolerar ':', '+', '.', etc.
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def aplicar_keyset(query, cursor: Optional[Cursor], per_page: int):
+    """Ordena por (created_at, id) y filtra a partir del cursor; pide per_page + 1 filas.
+
+    Reemplaza a ``.range()`` + ``count="exact"``: el costo no crece con el número de página.
+    """
+    if cursor is not None:
+        op = "gt" if cursor.direccion == "before" else "lt"
+        ts, rid = _pg_quote(cursor.created_at), _pg_quote(cursor.row_id)
+        query = query.or_(f"created_at.{op}.{ts},and(created_at.eq.{ts},id.{op}.{rid})")
+        # Cota redundante: Postgres no saca límites de índice del OR, sí de este AND
+        # (sin ella el índice (created_at, id) se recorre desde el principio)
+        query = query.gte("created_at", cursor.created_at) if op == "gt" else query.lte("created_at", cursor.created_at)
+    # Un único parámetro order (postgrest-py no combina varias llamadas a .order())
+    if cursor is not None and cursor.direccion == "before":
+        query = query.order("created_at,id")
+    else:
+        query = query.order("created_at.desc,id", desc=True)
+    return query.limit(per_page + 1)
+
+
+def paginar_keyset(
+    rows: List[Dict[str, Any]],
+    cursor: Optional[Cursor],
+    per_page: int,
+    clave=lambda r: r,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Recorta el resultado de ``aplicar_keyset`` y arma la navegación.
+
+    ``clave`` extrae de cada fila el dict con ``created_at``/``id`` de la tabla paginada.
+    Devuelve (filas, nav) con nav = {page, has_prev, has_next, after, before}.
+    """
+    hay_mas = len(rows) > per_page
+    rows = rows[:per_page]
+    pagina = cursor.pagina if cursor else 1
+    if cursor is not None and cursor.direccion == "before":
+        rows = list(reversed(rows))
+        has_prev, has_next = hay_mas, True
+    else:
+        has_prev, has_next = cursor is not None, hay_mas
+    nav: Dict[str, Any] = {"page": pagina, "has_prev": has_prev, "has_next": has_next, "after": None, "before": None}
+    if rows:
+        primero, ultimo = clave(rows[0]), clave(rows[-1])
+        if has_next and ultimo.get("created_at") is not None:
+            nav["after"] = Cursor(ultimo["created_at"], ultimo.get("id"), pagina + 1, "after").encode()
+        if has_prev and primero.get("created_at") is not None:
+            nav["before"] = Cursor(primero["created_at"], primero.get("id"), max(pagina - 1, 1), "before").encode()
+    nav["has_next"] = bool(nav["after"])
+    nav["has_prev"] = bool(nav["before"])
+    return rows, nav
+
+
+# ==========================
+# Admin (mínimo viable)
+# ==========================
+def _is_admin() -> bool:
+    return bool(session.get("is_admin"))
+
+
+@app.route("/admin/login", methods=["GET", "POST"])
+def admin_login():
+    if request.method == "POST":
+        username = (request.form.get("username", "") or "").strip()
+        password = (request.form.get("password", "") or "").strip()
+        env_user = (
+            os.getenv("ADMIN_USERNAME")
+            or os.getenv("ADMIN_USER")
+            or "admin"
+        )
+        env_pass = (
+            os.getenv("ADMIN_PASSWORD")
+            or os.getenv("ADMIN_PASS")
+            or "admin"
+        )
+        if username == env_user.strip() and password == env_pass.strip():
+            session["is_admin"] = True
+            flash("Ingreso exitoso", "success")
+            return redirect(url_for("admin_vacantes"))
+        flash("Credenciales inválidas", "warning")
+    return render_template("admin_login.html")
+
+
+@app.route("/admin/logout")
+def admin_logout():
+    session.pop("is_admin", None)
+    flash("Sesión cerrada", "success")
+    return redirect(url_for("home"))
+
+
+@app.route("/admin/candidatos")
+def admin_candidatos():
+    if not _is_admin():
+        return redirect(url_for("admin_login"))
+
+    disponibilidad_filtro = request.args.get("disponibilidad")
+    candidatos: List[Dict[str, Any]] = []
+    cursor = Cursor.from_request()
+    per_page = 50
+    nav = paginar_keyset([], None, per_page)[1]
+    try:
+        filas = candidatos_repo.listado_admin(disponibilidad_filtro, cursor, per_page)
+        candidatos, nav = paginar_keyset(filas, cursor, per_page)
+        # Adaptación para el template viejo: nombres de columna anteriores al esquema actual
+        for c in candidatos:
+            c["localidad_nombre"] = c.get("localidad")
+            c["area_preferencia_nombre"] = c.get("area_preferencia")
+            try:
+                c["fecha_postulacion"] = datetime.fromisoformat(str(c.get("created_at")).replace("Z", "+00:00"))
+            except ValueError:
+                c["fecha_postulacion"] = None
+    except Exception:
+        candidatos = []
+    return render_listado("admin_candidatos.html", candidatos=candidatos, nav=nav)
 
 
-def verificar_turnstile(token: Optional[str], remote_ip: Optional[str]) -> bool:
-    if not TURNSTILE_ENABLED:
-        return True
-    if not token:
-        return False
+@app.route("/admin/vacantes")
+def admin_vacantes():
+    if not _is_admin():
+        return redirect(url_for("admin_login"))
+
+    filtros = {
+        "titulo": request.args.get("titulo", ""),
+        "area": request.args.get("area", ""),
+        # el template usa 'publicada' pero la DB tiene 'estado' (abierta/cerrada)
+        "publicada": request.args.get("publicada", ""),
+    }
+    vacantes: List[Dict[str, Any]] = []
+    cursor = Cursor.from_request()
+    per_page = 10
+    nav = paginar_keyset([], None, per_page)[1]
     try:
-        data = urllib.parse.urlencode({
-            "secret": TURNSTILE_SECRET_KEY,
-            "response": token,
-            "remoteip": remote_ip or "",
-        }).encode()
-        req = urllib.request.Request(
-            url="https://challenges.cloudflare.com/turnstile/v0/siteverify",
-            data=data,
-            method="POST",
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
-            return bool(payload.get("success"))
+        (filas,) = precargar_catalogos(lambda: vacantes_repo.listado_admin(filtros, cursor, per_page))
+        vacantes, nav = paginar_keyset(filas, cursor, per_page)
+        # Adaptación para el template viejo: derivar 'publicada' desde 'estado'
+        for v in vacantes:
+            v["publicada"] = (v.get("estado") == "abierta")
+        # Enriquecer con nombre de área si aplica
+        enriquecer_area(vacantes)
     except Exception:
-        return False
+        vacantes = []
+
+    # Render de la versión simple
+    return render_listado("vacantes.html", vacantes=vacantes, filtros=filtros, mensaje=None, nav=nav)
 
 
-# ==========================
-# Rutas públicas
-# ==========================
-@app.route("/")
-def home():
-    vacantes: List[Dict[str, Any]] = []
+@app.route("/admin/vacantes/nueva", methods=["GET", "POST"])
+def admin_vacante_nueva():
+    if not _is_admin():
+        return redirect(url_for("admin_login"))
+    # Catálogo con id/nombre
+    areas = get_areas_catalogo()
+    if request.method == "POST":
+        titulo = (request.form.get("titulo") or "").strip()
+        area_val = (request.form.get("area") or "").strip()
+        area_nombre, area_id = resolver_area_desde_form(area_val)
+        descripcion = (request.form.get("descripcion") or "").strip()
+        estado = (request.form.get("estado") or "abierta").strip()
+        if not (titulo and area_nombre and descripcion and estado):
+            flash("Completá todos los campos.", "warning")
+            return render_template("admin_vacante_nueva.html", areas=areas), 400
+        if supabase is not None:
+            payload = {"titulo": titulo, "area": area_nombre, "descripcion": descripcion, "estado": estado}
+            try:
+                con_reintentos(lambda: supabase.table("vacantes").insert(payload).execute())
+                notificar_cambio("vacantes")
+                flash("Vacante creada", "success")
+                return redirect(url_for("admin_vacantes"))
+            except Exception:
+                flash("No se pudo crear la vacante", "warning")
+        else:
+            flash("Modo local: se omitió el guardado en DB.", "warning")
+            return redirect(url_for("admin_vacantes"))
+    return render_template("admin_vacante_nueva.html", areas=areas)
+
+
+@app.route("/admin/vacantes/<int:vacante_id>/cerrar", methods=["POST"])
+def admin_cerrar_vacante(vacante_id: int):
+    if not _is_admin():
+        return redirect(url_for("admin_login"))
     if supabase is not None:
         try:
-            # Mostrar solo abiertas según el esquema confirmado
-            res = supabase.table("vacantes").select("id,titulo,area,descripcion,estado").eq("estado", "abierta").execute()
-            vacantes = res.data or []
-            # Enriquecer con nombres de catálogos (área)
-            _, area_map = cargar_catalogos()
-            if area_map and vacantes:
-                for v in vacantes:
-                    area_val = v.get("area")
-                    # Si el valor es un id (numérico o UUID), mapear a nombre
-                    if area_val in area_map:
-                        v["area_nombre"] = area_map[area_val]
-                    else:
-                        # Intento por comparación de string con claves
-                        try:
-                            match = next((nombre for k, nombre in area_map.items() if str(k) == str(area_val)), None)
-                            if match:
-                                v["area_nombre"] = match
-                        except Exception:
-                            pass
+            con_reintentos(lambda: supabase.table("vacantes").update({"estado": "cerrada"}).eq("id", vacante_id).execute())
+            notificar_cambio("vacantes")
+            flash("Vacante cerrada", "success")
         except Exception:
-            vacantes = []
-    return render_template("landing.html", vacantes=vacantes)
+            flash("No se pudo cerrar la vacante", "warning")
+    return redirect(url_for("admin_vacantes"))
 
 
-# Nueva ruta: detalle de vacante
-@app.route("/vacante/<int:vacante_id>")
-def vacante_detalle(vacante_id: int):
-    vacante: Optional[Dict[str, Any]] = None
+@app.route("/admin/vacantes/<int:vacante_id>/eliminar", methods=["POST"])
+def admin_eliminar_vacante(vacante_id: int):
+    if not _is_admin():
+        return redirect(url_for("admin_login"))
     if supabase is not None:
         try:
-            # Traer todos los campos para ser tolerantes a diferencias de esquema
-            v = supabase.table("vacantes").select("*").eq("id", vacante_id).single().execute()
-            vacante = getattr(v, "data", None) or None
-            # Mapear nombre de área si viene como id
-            if vacante and vacante.get("area") is not None:
-                _, area_map = cargar_catalogos()
-                area_val = vacante.get("area")
-                if area_val in area_map:
-                    vacante["area_nombre"] = area_map[area_val]
-                else:
-                    try:
-                        match = next((nombre for k, nombre in area_map.items() if str(k) == str(area_val)), None)
-                        if match:
-                            vacante["area_nombre"] = match
-                    except Exception:
-                        pass
+            supabase.table("vacantes").delete().eq("id", vacante_id).execute()
+            notificar_cambio("vacantes")
+            flash("Vacante eliminada", "success")
+        except Exception as e:
+            flash(f"No se pudo eliminar: {e}", "warning")
+    return redirect(url_for("admin_vacantes"))
+
+
+@app.get("/admin/cache")
+def admin_cache_stats():
+    if not _is_admin():
+        return {"ok": False, "error": "No autorizado"}, 401
+    return {"ok": True, "catalogos": catalog_cache.stats()}
+
+
+@app.post("/admin/outbox/reproducir")
+def admin_outbox_reproducir():
+    # Fuerza el reenvío del outbox local (``errores=1`` también reintenta las que agotaron intentos)
+    if not _is_admin():
+        return {"ok": False, "error": "No autorizado"}, 401
+    almacen = almacen_local()
+    if almacen is None:
+        return {"ok": False, "error": "Almacén local no disponible"}, 503
+    if request.form.get("errores") or request.args.get("errores"):
+        almacen.reintentar_errores()
+    resultado = reproducir_outbox()
+    # El resto (si hay más de un lote) lo sigue el hilo de reenvío
+    _outbox_evento.set()
+    if asegurar_supabase() is None:
+        return {"ok": False, "error": "Supabase no disponible", "outbox": almacen.resumen_outbox()}, 503
+    return {"ok": True, **resultado, "outbox": almacen.resumen_outbox()}
+
+
+@app.post("/admin/cache/invalidar")
+def admin_cache_invalidar():
+    # Para cuando se editan catálogos directamente en Supabase
+    if not _is_admin():
+        return {"ok": False, "error": "No autorizado"}, 401
+    tablas = [t for t in (request.form.get("tablas") or "").split(",") if t.strip()]
+    if tablas:
+        notificar_cambio(*[t.strip() for t in tablas])
+    else:
+        catalog_cache.invalidate()
+    return {"ok": True, "catalogos": catalog_cache.stats()}
+
+
+# ==========================
+# Postulaciones: consulta + join
+# ==========================
+# Proyecciones de los repositorios como select de PostgREST
+CANDIDATO_COLUMNAS_LISTADO = ",".join(CandidatoRepo.PROYECCIONES["listado"])
+CANDIDATO_COLUMNAS_COMPLETAS = ",".join(CandidatoRepo.PROYECCIONES["completo"])
+POSTULACION_COLUMNAS = ",".join(PostulacionRepo.PROYECCIONES["listado"])
+VACANTE_COLUMNAS_OPCIONES = ",".join(VacanteRepo.PROYECCIONES["opciones"])
+
+
+def select_embebido(vista_candidato: str = "listado") -> str:
+    """Select con recursos embebidos de PostgREST (requiere FKs candidato_id / vacante_id)."""
+    columnas = ",".join(CandidatoRepo.PROYECCIONES[vista_candidato])
+    return f"{POSTULACION_COLUMNAS}, candidatos({columnas}), vacantes({VACANTE_COLUMNAS_OPCIONES})"
+
+POSTULACIONES_EMBED = (os.getenv("POSTULACIONES_EMBED", "true").strip().lower() not in {"0", "false", "no"})
+# None = todavía no probado; False = el esquema no tiene la relación
+_embed_soportado: Optional[bool] = None
+
+
+def _es_error_relacion(exc: Exception) -> bool:
+    msg = str(exc) if exc else ""
+    return "PGRST200" in msg or "relationship" in msg.lower()
+
+
+def _vacantes_opciones() -> List[Dict[str, Any]]:
+    """Lista liviana de vacantes (id, titulo, area) para selectores y joins, cacheada."""
+    try:
+        return vacantes_repo.opciones()
+    except Exception:
+        return []
+
+
+def _hay_filtros_candidato(filtros: Dict[str, str]) -> bool:
+    return bool(
+        filtros["area_preferencia"] or filtros["localidad"] or filtros["disponibilidad"]
+        or filtros["movilidad"] in {"Sí", "No"} or filtros["licencia"] in {"Sí", "No"}
+        or filtros["edad_min"] or filtros["edad_max"]
+    )
+
+
+def _aplicar_filtros_candidato(query, filtros: Dict[str, str], prefijo: str = ""):
+    """Aplica los filtros de candidato; ``prefijo`` permite filtrar un recurso embebido."""
+    if filtros["area_preferencia"]:
+        query = query.eq(f"{prefijo}area_preferencia", filtros["area_preferencia"])
+    if filtros["localidad"]:
+        query = query.eq(f"{prefijo}localidad", filtros["localidad"])
+    if filtros["disponibilidad"]:
+        query = query.eq(f"{prefijo}disponibilidad", filtros["disponibilidad"])
+    if filtros["movilidad"] in {"Sí", "No"}:
+        query = query.eq(f"{prefijo}movilidad_propia", filtros["movilidad"] == "Sí")
+    if filtros["licencia"] in {"Sí", "No"}:
+        query = query.eq(f"{prefijo}licencia_conducir", filtros["licencia"] == "Sí")
+    if filtros["edad_min"]:
+        try:
+            query = query.gte(f"{prefijo}edad", int(filtros["edad_min"]))
         except Exception:
-            vacante = None
-    if not vacante:
-        flash("Vacante no encontrada", "warning")
-        return redirect(url_for("home"))
-    return render_template("vacante_detalle.html", vacante=vacante)
+            pass
+    if filtros["edad_max"]:
+        try:
+            query = query.lte(f"{prefijo}edad", int(filtros["edad_max"]))
+        except Exception:
+            pass
+    return query
 
 
-@app.route("/form")
-def form_postulante():
-    # Formulario alternativo (plantilla extendida de base)
-    loc_map, _ = cargar_catalogos()
-    localidades = [{"id": i, "nombre": n} for i, n in loc_map.items()]
-    areas_cat = get_areas_catalogo()
-    return render_template("form_postulante.html", localidades=localidades, areas=areas_cat, turnstile_site_key=TURNSTILE_SITE_KEY)
+# None = todavía no probado; True si la base tiene el campo calculado de migrations/003_indices.sql
+_estado_normalizado: Optional[bool] = None
 
 
-@app.route("/postular", methods=["GET", "POST"])
-def postular():
-    if request.method == "GET":
-        areas, disponibilidades, localidades = cargar_opciones_postulacion()
-        # Reemplazar areas con catálogo con id/nombre
-        areas = get_areas_catalogo()
-        vacante_id = request.args.get("vacante_id") or ""
-        area_prefill = request.args.get("area") or request.args.get("area_prefill") or ""
-        if supabase is not None and vacante_id and not area_prefill:
-            try:
-                v = supabase.table("vacantes").select("area").eq("id", vacante_id).single().execute()
-                if getattr(v, "data", None) and v.data.get("area"):
-                    area_prefill = v.data.get("area")
-            except Exception:
-                pass
-        # Normalizar: si area_prefill es id, convertir a nombre usando catálogo
-        if area_prefill:
-            try:
-                _, area_map = cargar_catalogos()
-                if area_prefill in area_map:
-                    area_prefill = area_map[area_prefill]
-                else:
-                    match = next((nombre for k, nombre in area_map.items() if str(k) == str(area_prefill)), None)
-                    if match:
-                        area_prefill = match
-            except Exception:
-                pass
-        return render_template(
-            "postular.html",
-            mensaje=None,
-            exito=None,
-            areas=areas,
-            disponibilidades=disponibilidades,
-            localidades=localidades,
-            area_prefill=area_prefill,
-            vacante_id=vacante_id,
-            turnstile_site_key=TURNSTILE_SITE_KEY,
-        )
+def _estado_normalizado_disponible() -> bool:
+    """Prueba una vez por proceso si existe ``estado_normalizado`` (= lower(estado), indexado)."""
+    global _estado_normalizado
+    if _estado_normalizado is None:
+        try:
+            supabase.table("postulaciones").select("id").eq("estado_normalizado", "").limit(1).execute()  # type: ignore[union-attr]
+            _estado_normalizado = True
+        except Exception as e:
+            if "42703" in str(e) or "does not exist" in str(e) or "PGRST" in str(e):
+                _estado_normalizado = False
+            return False
+    return _estado_normalizado
 
-    # POST: procesar envío
-    form = request.form
-    files = request.files
 
-    ok, errs = validar_campos_postulacion(form, files)
-    if not ok:
-        areas, disponibilidades, localidades = cargar_opciones_postulacion()
-        areas = get_areas_catalogo()
-        return (
-            render_template(
-                "postular.html",
-                mensaje="Completá todos los campos.",
-                exito=False,
-                areas=areas,
-                disponibilidades=disponibilidades,
-                localidades=localidades,
-                area_prefill=form.get("area_preferencia"),
-                vacante_id=form.get("vacante_id"),
-                turnstile_site_key=TURNSTILE_SITE_KEY,
-            ),
-            400,
-        )
+def _aplicar_filtros_postulacion(query, filtros: Dict[str, str]):
+    if filtros["estado"]:
+        # [CHANGE] Comparación case-insensitive para compatibilidad con datos antiguos
+        if _estado_normalizado_disponible():
+            # Igualdad sobre lower(estado): usa el índice postulaciones_estado_created_at
+            query = query.eq("estado_normalizado", filtros["estado"].lower())
+        else:
+            query = query.ilike("estado", filtros["estado"])
+    if filtros["vacante_id"]:
+        vid = filtros["vacante_id"]
+        query = query.eq("vacante_id", int(vid) if str(vid).isdigit() else vid)
+    return query
 
-    # Verificar Turnstile antes de procesar
-    ts_token = request.form.get("cf-turnstile-response")
-    if not verificar_turnstile(ts_token, request.remote_addr):
-        areas, disponibilidades, localidades = cargar_opciones_postulacion()
-        areas = get_areas_catalogo()
-        return (
-            render_template(
-                "postular.html",
-                mensaje="Prueba fallida, intentá de nuevo.",
-                exito=False,
-                areas=areas,
-                disponibilidades=disponibilidades,
-                localidades=localidades,
-                area_prefill=form.get("area_preferencia"),
-                vacante_id=form.get("vacante_id"),
-                turnstile_site_key=TURNSTILE_SITE_KEY,
-            ),
-            400,
-        )
 
+def _filas_embebidas(
+    filtros: Dict[str, str], cursor: Optional[Cursor], per_page: int, vista_candidato: str = "listado"
+) -> Optional[List[Dict[str, Any]]]:
+    """Postulaciones + candidato + vacante en un único request.
+
+    Devuelve None si el esquema no soporta el embebido o la consulta falla,
+    para que el llamador use el join en memoria.
+    """
+    global _embed_soportado
+    if not POSTULACIONES_EMBED or _embed_soportado is False:
+        return None
+    filtra_cand = _hay_filtros_candidato(filtros)
+    select = select_embebido(vista_candidato)
+    # !inner hace que los filtros sobre el candidato descarten la postulación
+    if filtra_cand:
+        select = select.replace("candidatos(", "candidatos!inner(")
     try:
-        file_cv = files.get("cv")
-        cv_url = subir_cv_y_obtener_url(form.get("dni", "").strip(), file_cv)
+        query = supabase.table("postulaciones").select(select)  # type: ignore[union-attr]
+        query = _aplicar_filtros_postulacion(query, filtros)
+        query = _aplicar_filtros_candidato(query, filtros, prefijo="candidatos.")
+        res = aplicar_keyset(query, cursor, per_page).execute()
     except Exception as e:
-        return redirect(url_for("confirmacion", ok=0, error=f"Error subiendo CV: {e}"))
+        if _es_error_relacion(e):
+            _embed_soportado = False
+        return None
+    _embed_soportado = True
+    filas: List[Dict[str, Any]] = []
+    for p in (getattr(res, "data", None) or []):
+        c = p.pop("candidatos", None) or {}
+        v = p.pop("vacantes", None)
+        filas.append({"postulacion": p, "candidato": c, "vacante": v})
+    return filas
 
-    # Resolver área de preferencia (aceptar id o nombre)
-    area_nombre, area_id = resolver_area_desde_form(form.get("area_preferencia", ""))
 
-    data = {
-        "nombre_apellido": form.get("nombre_apellido", "").strip(),
-        "dni": form.get("dni", "").strip(),
-        "edad": int(form.get("edad", 0) or 0),
-        "area_preferencia": area_nombre,
-        "licencia_conducir": normalizar_checkbox(form.get("licencia_conducir")),
-        "movilidad_propia": normalizar_checkbox(form.get("movilidad_propia")),
-        "disponibilidad": form.get("disponibilidad", "").strip(),
-        "celular": form.get("celular", "").strip(),
-        "mail": form.get("mail", "").strip(),
-        "localidad": form.get("localidad", "").strip(),
-        "cv_url": cv_url,
-        # Nuevos campos opcionales
-        "familiar_en_clinica": normalizar_checkbox(form.get("familiar_en_clinica")),
-        "fuente_postulacion": (form.get("fuente_postulacion", "") or "").strip() or None,
-    }
-    vacante_id = form.get("vacante_id") or None
+def _aplicar_busqueda_candidato(query, q: str):
+    """Texto libre sin la vista de búsqueda: ilike por palabra sobre nombre, DNI, mail y celular.
 
-    ok_ins, err_ins, cand_id = _insertar_candidato_si_no_existe(data)
-    if not ok_ins:
-        # Si hay error de red/DNS (p.ej. getaddrinfo failed), continuar en modo local
-        msg_text = str(err_ins or "Error desconocido")
-        if ("getaddrinfo failed" in msg_text) or ("Name or service not known" in msg_text) or ("Temporary failure in name resolution" in msg_text):
-            cand_id = None  # modo local sin id
-        else:
-            msg = (
-                "Se actualizó el esquema. Probá nuevamente." if (err_ins and "PGRST204" in msg_text) else msg_text
-            )
-            return redirect(url_for("confirmacion", ok=0, error=msg))
+    Sin f_unaccent: los acentos tienen que coincidir. Un DNI va como prefijo.
+    """
+    q = (q or "").strip()
+    compacto = re.sub(r"[.\s]", "", q)
+    if compacto.isdigit():
+        return query.like("dni", f"{compacto}*")
+    palabras = [re.sub(r"[^\w@.+-]", "", t) for t in q.lower().split()]
+    for t in [t for t in palabras if t][:6]:
+        patron = _pg_quote(f"*{t}*")
+        query = query.or_(",".join(f"{col}.ilike.{patron}" for col in ("nombre_apellido", "dni", "mail", "celular")))
+    return query
 
-    ok_pos, err_pos = _insertar_postulacion(cand_id, vacante_id)
-    if not ok_pos:
-        msg_text = str(err_pos or "Error desconocido")
-        if ("getaddrinfo failed" in msg_text) or ("Name or service not known" in msg_text) or ("Temporary failure in name resolution" in msg_text):
-            # Continuar en modo local
-            return redirect(url_for("confirmacion", ok=1, error=""))
-        msg = (
-            "Se actualizó el esquema. Probá nuevamente." if (err_pos and "PGRST204" in msg_text) else msg_text
-        )
-        return redirect(url_for("confirmacion", ok=0, error=msg))
 
-    return redirect(url_for("confirmacion", ok=1, error=""))
+def _ids_candidatos(filtros: Dict[str, str], area: bool = False) -> List[Any]:
+    """IDs de candidatos que cumplen los filtros (y el área, si ``area``).
 
+    Con texto libre o área el resultado se corta en BUSQUEDA_SIN_VISTA_MAX:
+    sin la migración 002 no hay índice que acote la búsqueda.
+    """
+    query = _aplicar_filtros_candidato(supabase.table("candidatos").select("id"), filtros)  # type: ignore[union-attr]
+    if filtros.get("q"):
+        query = _aplicar_busqueda_candidato(query, filtros["q"])
+    if area:
+        query = query.ilike("area_preferencia", f"*{filtros['area']}*")
+    if filtros.get("q") or area:
+        query = query.order("created_at", desc=True).limit(BUSQUEDA_SIN_VISTA_MAX)
+    return [c.get("id") for c in (query.execute().data or []) if c.get("id")]
 
-@app.route("/confirmacion")
-def confirmacion():
-    ok = request.args.get("ok", "0") in {"1", "true", "True", "sí", "si"}
-    error = request.args.get("error")
-    return render_template("confirmacion.html", ok=ok, error=error)
 
+def _filas_hash_join(
+    filtros: Dict[str, str], cursor: Optional[Cursor], per_page: int, vista_candidato: str = "listado"
+) -> List[Dict[str, Any]]:
+    """Fallback sin embebido: consultas separadas unidas con dict/set (O(P + C + V)).
+
+    Sólo se traen los candidatos de la página actual (un ``in_`` con proyección
+    acotada), así el costo no depende del tamaño de la tabla. El texto libre y
+    el área (OR candidato/vacante) se filtran en la base con los IDs que
+    matchean, acotados por BUSQUEDA_SIN_VISTA_MAX.
+    """
+    cand_ids: Optional[List[Any]] = None
+    if _hay_filtros_candidato(filtros) or filtros.get("q"):
+        # Si filtramos por atributos de candidato, restringimos por sus IDs (AND)
+        try:
+            cand_ids = _ids_candidatos(filtros)
+        except Exception:
+            cand_ids = []
+        if not cand_ids:
+            return []
+    area_ids: List[Any] = []
+    area_vacantes: List[Any] = []
+    if filtros["area"]:
+        # [CHANGE] Filtro 'area' (texto): OR entre candidato.area_preferencia y vacante.area
+        needle = filtros["area"].casefold()
+        area_vacantes = [v.get("id") for v in _vacantes_opciones() if needle in str(v.get("area") or "").casefold()]
+        try:
+            area_ids = _ids_candidatos(filtros, area=True)
+        except Exception:
+            area_ids = []
+        if not area_ids and not area_vacantes:
+            return []
+
+    try:
+        post_q = _aplicar_filtros_postulacion(supabase.table("postulaciones").select(POSTULACION_COLUMNAS), filtros)  # type: ignore[union-attr]
+        if cand_ids is not None:
+            post_q = post_q.in_("candidato_id", cand_ids)
+        if filtros["area"]:
+            condiciones = []
+            if area_ids:
+                condiciones.append(f"candidato_id.in.({','.join(_pg_quote(i) for i in area_ids)})")
+            if area_vacantes:
+                condiciones.append(f"vacante_id.in.({','.join(str(i) for i in area_vacantes)})")
+            post_q = post_q.or_(",".join(condiciones))
+        res_post = aplicar_keyset(post_q, cursor, per_page).execute()
+        postulaciones = (getattr(res_post, "data", None) or [])
+    except Exception:
+        # Si no hay tabla de postulaciones, emulamos una fila por candidato
+        try:
+            cand_q = _aplicar_filtros_candidato(
+                supabase.table("candidatos").select(",".join(CandidatoRepo.PROYECCIONES[vista_candidato])), filtros  # type: ignore[union-attr]
+            )
+            candidatos = aplicar_keyset(cand_q, cursor, per_page).execute().data or []
+        except Exception:
+            candidatos = []
+        return [
+            {
+                "postulacion": {
+                    "id": c.get("id"),
+                    "estado": "recibido",
+                    "created_at": c.get("created_at"),
+                    "entrevistado_por": None,
+                    "observaciones": None,
+                },
+                "candidato": c,
+                "vacante": None,
+            }
+            for c in candidatos
+        ]
+
+    try:
+        by_id = candidatos_repo.por_ids((p.get("candidato_id") for p in postulaciones), vista_candidato)
+    except Exception:
+        by_id = {}
+
+    vac_by_id: Dict[Any, Dict[str, Any]] = {v.get("id"): v for v in _vacantes_opciones()}
+    faltantes = {p.get("vacante_id") for p in postulaciones if p.get("vacante_id") is not None} - set(vac_by_id)
+    if faltantes:
+        # Vacantes creadas después del último refresco de la caché
+        try:
+            vac_by_id.update(vacantes_repo.por_ids(faltantes, "opciones"))
+        except Exception:
+            pass
 
-@app.route("/uploads/<path:filename>")
-def uploaded_file(filename: str):
-    return send_from_directory(_ensure_upload_dir(), filename)
+    return [
+        {
+            "postulacion": p,
+            "candidato": by_id.get(p.get("candidato_id"), {}),
+            "vacante": vac_by_id.get(p.get("vacante_id")),
+        }
+        for p in postulaciones
+    ]
 
 
 # ==========================
-# Admin (mínimo viable)
+# Búsqueda de postulaciones (texto libre + facetas)
 # ==========================
-def _is_admin() -> bool:
-    return bool(session.get("is_admin"))
-
-
-@app.route("/admin/login", methods=["GET", "POST"])
-def admin_login():
-    if request.method == "POST":
-        username = (request.form.get("username", "") or "").strip()
-        password = (request.form.get("password", "") or "").strip()
-        env_user = (
-            os.getenv("ADMIN_USERNAME")
-            or os.getenv("ADMIN_USER")
-            or "admin"
-        )
-        env_pass = (
-            os.getenv("ADMIN_PASSWORD")
-            or os.getenv("ADMIN_PASS")
-            or "admin"
-        )
-        if username == env_user.strip() and password == env_pass.strip():
-            session["is_admin"] = True
-            flash("Ingreso exitoso", "success")
-            return redirect(url_for("admin_vacantes"))
-        flash("Credenciales inválidas", "warning")
-    return render_template("admin_login.html")
+# Vista y RPC de migrations/002_busqueda_postulaciones.sql
+POSTULACIONES_VISTA_BUSQUEDA = "postulaciones_busqueda"
+# None = todavía no probado; False = la migración no está aplicada
+_busqueda_soportada: Optional[bool] = None
+# None = todavía no probado; False = la RPC facetas_postulaciones no existe
+_facetas_rpc_soportada: Optional[bool] = None
+# Sin la migración: tope de candidatos que matchean texto libre / área (van en un in_)
+BUSQUEDA_SIN_VISTA_MAX = int(os.getenv("BUSQUEDA_SIN_VISTA_MAX", "200") or 200)
+FACETAS = ("area_preferencia", "localidad", "disponibilidad", "estado")
 
 
-@app.route("/admin/logout")
-def admin_logout():
-    session.pop("is_admin", None)
-    flash("Sesión cerrada", "success")
-    return redirect(url_for("home"))
+def normalizar_busqueda(texto: Any) -> str:
+    """Minúsculas y sin acentos, igual que f_unaccent(lower(...)) en la base."""
+    texto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    return "".join(ch for ch in texto if not unicodedata.combining(ch))
 
 
-@app.route("/admin/candidatos")
-def admin_candidatos():
-    if not _is_admin():
-        return redirect(url_for("admin_login"))
+def terminos_busqueda(q: str) -> Tuple[List[str], Optional[str]]:
+    """Convierte la búsqueda libre en (tokens, prefijo_dni).
 
-    disponibilidad_filtro = request.args.get("disponibilidad")
-    candidatos: List[Dict[str, Any]] = []
-    if supabase is not None:
-        try:
-            query = supabase.table("candidatos").select("*")
-            if disponibilidad_filtro:
-                query = query.eq("disponibilidad", disponibilidad_filtro)
-            res = query.order("created_at", desc=True).execute()
-            candidatos = res.data or []
-        except Exception:
-            candidatos = []
-    return render_template("admin_candidatos.html", candidatos=candidatos)
+    Sólo dígitos (con puntos o espacios, como se suele escribir un DNI) se toma
+    como prefijo de DNI. Si no, cada palabra es un token que debe aparecer en
+    nombre, DNI, mail o celular. Se descartan los comodines de LIKE/PostgREST.
+    """
+    q = (q or "").strip()
+    if not q:
+        return [], None
+    compacto = re.sub(r"[.\s]", "", q)
+    if compacto.isdigit():
+        return [], compacto
+    tokens = [re.sub(r"[^\w@.+-]", "", t) for t in normalizar_busqueda(q).split()]
+    return [t for t in tokens if t][:6], None
 
 
-@app.route("/admin/vacantes")
-def admin_vacantes():
-    if not _is_admin():
-        return redirect(url_for("admin_login"))
+def _es_error_tabla_inexistente(exc: Exception) -> bool:
+    msg = str(exc) if exc else ""
+    return any(s in msg for s in ("PGRST205", "PGRST202", "42P01", "42883")) or "does not exist" in msg
 
-    filtros = {
-        "titulo": request.args.get("titulo", ""),
-        "area": request.args.get("area", ""),
-        # el template usa 'publicada' pero la DB tiene 'estado' (abierta/cerrada)
-        "publicada": request.args.get("publicada", ""),
-    }
-    vacantes: List[Dict[str, Any]] = []
-    page = int(request.args.get("page", "1") or 1)
-    page = max(page, 1)
-    per_page = 10
-    from_row = (page - 1) * per_page
-    to_row = from_row + per_page - 1
-    if supabase is not None:
-        try:
-            query = supabase.table("vacantes").select("*")
-            if filtros["titulo"]:
-                query = query.ilike("titulo", f"%{filtros['titulo']}%")
-            if filtros["area"]:
-                query = query.ilike("area", f"%{filtros['area']}%")
-            if filtros["publicada"] in {"true", "false"}:
-                estado_val = "abierta" if filtros["publicada"] == "true" else "cerrada"
-                query = query.eq("estado", estado_val)
-            res = query.order("created_at", desc=True).range(from_row, to_row).execute()
-            vacantes = res.data or []
-            # Adaptación para el template viejo: derivar 'publicada' desde 'estado'
-            for v in vacantes:
-                v["publicada"] = (v.get("estado") == "abierta")
-            # Enriquecer con nombre de área si aplica
-            _, area_map = cargar_catalogos()
-            if area_map and vacantes:
-                for v in vacantes:
-                    area_val = v.get("area")
-                    if area_val in area_map:
-                        v["area_nombre"] = area_map[area_val]
-                    else:
-                        try:
-                            match = next((nombre for k, nombre in area_map.items() if str(k) == str(area_val)), None)
-                            if match:
-                                v["area_nombre"] = match
-                        except Exception:
-                            pass
-        except Exception:
-            vacantes = []
 
-    # Render de la versión simple
-    return render_template("vacantes.html", vacantes=vacantes, filtros=filtros, mensaje=None)
+def _fila_desde_vista(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Separa una fila aplanada de la vista en {postulacion, candidato, vacante}."""
+    candidato: Dict[str, Any] = {"id": r.get("candidato_id")}
+    postulacion: Dict[str, Any] = {}
+    for k, v in r.items():
+        if k.startswith("c_"):
+            candidato[k[2:]] = v
+        elif not k.startswith("v_") and k not in {"area_texto", "estado_normalizado"}:
+            postulacion[k] = v
+    candidato.pop("busqueda", None)
+    vacante = None
+    if r.get("vacante_id") is not None:
+        vacante = {"id": r.get("vacante_id"), "titulo": r.get("v_titulo"), "area": r.get("v_area")}
+    return {"postulacion": postulacion, "candidato": candidato, "vacante": vacante}
 
 
-@app.route("/admin/vacantes/nueva", methods=["GET", "POST"])
-def admin_vacante_nueva():
-    if not _is_admin():
-        return redirect(url_for("admin_login"))
-    # Catálogo con id/nombre
-    areas = get_areas_catalogo()
-    if request.method == "POST":
-        titulo = (request.form.get("titulo") or "").strip()
-        area_val = (request.form.get("area") or "").strip()
-        area_nombre, area_id = resolver_area_desde_form(area_val)
-        descripcion = (request.form.get("descripcion") or "").strip()
-        estado = (request.form.get("estado") or "abierta").strip()
-        if not (titulo and area_nombre and descripcion and estado):
-            flash("Completá todos los campos.", "warning")
-            return render_template("admin_vacante_nueva.html", areas=areas), 400
-        if supabase is not None:
-            payload = {"titulo": titulo, "area": area_nombre, "descripcion": descripcion, "estado": estado}
-            attempts = 0
-            while attempts < 2:
-                try:
-                    supabase.table("vacantes").insert(payload).execute()
-                    flash("Vacante creada", "success")
-                    return redirect(url_for("admin_vacantes"))
-                except Exception as e:
-                    if is_pgrst204_error(e) and attempts == 0:
-                        time.sleep(0.5)
-                        attempts += 1
-                        continue
-                    flash("No se pudo crear la vacante", "warning")
-                    break
-        else:
-            flash("Modo local: se omitió el guardado en DB.", "warning")
-            return redirect(url_for("admin_vacantes"))
-    return render_template("admin_vacante_nueva.html", areas=areas)
+def _filas_busqueda(filtros: Dict[str, str], cursor: Optional[Cursor], per_page: int) -> Optional[List[Dict[str, Any]]]:
+    """Listado filtrado entero del lado del servidor sobre la vista de búsqueda.
 
+    Incluye el texto libre y el filtro de área (OR candidato/vacante), que
+    antes se aplicaba en Python sólo sobre la página actual. Devuelve None si
+    la migración no está aplicada o la consulta falla.
+    """
+    global _busqueda_soportada
+    if _busqueda_soportada is False:
+        return None
+    tokens, dni = terminos_busqueda(filtros.get("q", ""))
+    try:
+        query = supabase.table(POSTULACIONES_VISTA_BUSQUEDA).select("*")  # type: ignore[union-attr]
+        query = _aplicar_filtros_postulacion(query, filtros)
+        query = _aplicar_filtros_candidato(query, filtros, prefijo="c_")
+        if filtros["area"]:
+            query = query.ilike("area_texto", f"*{filtros['area']}*")
+        for t in tokens:
+            query = query.like("c_busqueda", f"*{t}*")
+        if dni:
+            query = query.like("c_dni", f"{dni}*")
+        res = aplicar_keyset(query, cursor, per_page).execute()
+    except Exception as e:
+        if _es_error_tabla_inexistente(e):
+            _busqueda_soportada = False
+        return None
+    _busqueda_soportada = True
+    return [_fila_desde_vista(r) for r in (getattr(res, "data", None) or [])]
 
-@app.route("/admin/vacantes/<int:vacante_id>/cerrar", methods=["POST"])
-def admin_cerrar_vacante(vacante_id: int):
-    if not _is_admin():
-        return redirect(url_for("admin_login"))
-    if supabase is not None:
-        attempts = 0
-        while attempts < 2:
-            try:
-                supabase.table("vacantes").update({"estado": "cerrada"}).eq("id", vacante_id).execute()
-                flash("Vacante cerrada", "success")
-                break
-            except Exception as e:
-                if is_pgrst204_error(e) and attempts == 0:
-                    time.sleep(0.5)
-                    attempts += 1
-                    continue
-                flash("No se pudo cerrar la vacante", "warning")
-                break
-    return redirect(url_for("admin_vacantes"))
 
+def facetas_postulaciones(filtros: Dict[str, str]) -> Dict[str, List[Tuple[str, int]]]:
+    """Conteos por área, localidad, disponibilidad y estado para los filtros actuales.
 
-@app.route("/admin/vacantes/<int:vacante_id>/eliminar", methods=["POST"])
-def admin_eliminar_vacante(vacante_id: int):
-    if not _is_admin():
-        return redirect(url_for("admin_login"))
-    if supabase is not None:
+    Requiere la migración 002 (los calcula la base con una RPC); sin ella no
+    hay facetas: contarlas exigiría leer las tablas enteras.
+    """
+    global _facetas_rpc_soportada
+    if supabase is None:
+        return {}
+    if _facetas_rpc_soportada is not False and _busqueda_soportada is not False:
+        tokens, dni = terminos_busqueda(filtros.get("q", ""))
+        params = {k: v for k, v in filtros.items() if k != "q" and v}
+        params.update({"tokens": tokens, "dni_prefijo": dni or ""})
         try:
-            supabase.table("vacantes").delete().eq("id", vacante_id).execute()
-            flash("Vacante eliminada", "success")
+            res = supabase.rpc("facetas_postulaciones", {"p_filtros": params}).execute()
+            data = getattr(res, "data", None) or {}
+            _facetas_rpc_soportada = True
+            return {campo: [(it.get("valor"), int(it.get("n") or 0)) for it in (data.get(campo) or [])] for campo in FACETAS}
         except Exception as e:
-            flash(f"No se pudo eliminar: {e}", "warning")
-    return redirect(url_for("admin_vacantes"))
+            if _es_error_tabla_inexistente(e):
+                _facetas_rpc_soportada = False
+    return {}
+
+
+def consultar_filas_postulaciones(
+    filtros: Dict[str, str],
+    cursor: Optional[Cursor],
+    per_page: int,
+    vista_candidato: str = "listado",
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Devuelve (filas, nav) para el listado de admin, paginado por cursor.
+
+    Orden de preferencia: vista de búsqueda (migración 002, todo filtrado en la
+    base); select embebido; join en memoria. Sin la vista, el texto libre y el
+    área se resuelven en el join con ilike acotado (ver _filas_hash_join).
+    ``vista_candidato`` (proyección de CandidatoRepo) sólo afecta a los dos
+    últimos (la vista ya trae todas).
+    """
+    filas = _filas_busqueda(filtros, cursor, per_page)
+    if filas is None and not (filtros.get("q") or filtros["area"]):
+        filas = _filas_embebidas(filtros, cursor, per_page, vista_candidato)
+    if filas is None:
+        filas = _filas_hash_join(filtros, cursor, per_page, vista_candidato)
+    return paginar_keyset(filas, cursor, per_page, clave=lambda f: f["postulacion"])
+
+
+def filtros_postulaciones_request() -> Dict[str, str]:
+    """Filtros del listado de postulaciones tomados del query string (GET)."""
+    filtros = {
+        "q": request.args.get("q", "").strip(),
+        "area": request.args.get("area", ""),
+        "area_preferencia": request.args.get("area_preferencia", ""),
+        "localidad": request.args.get("localidad", ""),
+        "disponibilidad": request.args.get("disponibilidad", ""),
+        "estado": request.args.get("estado", ""),
+        "vacante_id": request.args.get("vacante_id", ""),
+        "edad_min": request.args.get("edad_min", ""),
+        "edad_max": request.args.get("edad_max", ""),
+        "movilidad": request.args.get("movilidad", ""),
+        "licencia": request.args.get("licencia", ""),
+    }
+    return filtros
 
 
 @app.route("/admin/postulaciones", methods=["GET", "POST"])
@@ -894,181 +4367,270 @@ def admin_postulaciones():
             entrevistado_por = request.form.get("entrevistado_por")
             observaciones = request.form.get("observaciones")
             if pid:
-                supabase.table("postulaciones").update(
-                    {
-                        "estado": estado,
-                        "entrevistado_por": entrevistado_por,
-                        "observaciones": observaciones,
-                    }
-                ).eq("id", pid).execute()
+                cambios = {
+                    "estado": estado,
+                    "entrevistado_por": entrevistado_por,
+                    "observaciones": observaciones,
+                }
+                supabase.table("postulaciones").update(cambios).eq("id", pid).execute()
                 flash("Postulación actualizada", "success")
         except Exception as e:
             flash(f"Error al actualizar: {e}", "warning")
 
     # [CHANGE] Filtros via GET y opciones del formulario
-    areas, dispon, loc = cargar_opciones_postulacion()
-    # Estandarizar áreas desde catálogo
-    areas = get_areas_preferencia()
-    filtros = {
-        "area": request.args.get("area", ""),
-        "area_preferencia": request.args.get("area_preferencia", ""),
-        "localidad": request.args.get("localidad", ""),
-        "disponibilidad": request.args.get("disponibilidad", ""),
-        "estado": request.args.get("estado", ""),
-        "vacante_id": request.args.get("vacante_id", ""),
-        "edad_min": request.args.get("edad_min", ""),
-        "edad_max": request.args.get("edad_max", ""),
-        "movilidad": request.args.get("movilidad", ""),
-        "licencia": request.args.get("licencia", ""),
-    }
+    filtros = filtros_postulaciones_request()
 
-    vacantes: List[Dict[str, Any]] = []
-    candidatos: List[Dict[str, Any]] = []
-    postulaciones: List[Dict[str, Any]] = []
-    # Paginación
-    page = int(request.args.get("page", "1") or 1)
-    page = max(page, 1)
+    # Paginación por cursor
+    cursor = Cursor.from_request()
     per_page = 50
-    from_row = (page - 1) * per_page
-    # range es inclusivo, pedimos uno extra para detectar "siguiente"
-    to_row = from_row + per_page  # per_page + 1 items
-    has_prev = page > 1
-    has_next = False
+    nav = paginar_keyset([], None, per_page)[1]
 
+    # Catálogos, selector de vacantes y listado son independientes: en paralelo
+    filas: List[Dict[str, Any]] = []
+    facetas: Dict[str, List[Tuple[str, int]]] = {}
     if supabase is not None:
-        try:
-            # [CHANGE] Traer vacantes, opcionalmente filtrando por área (texto)
-            vac_q = supabase.table("vacantes").select("id,titulo,area")
-            if filtros["area"]:
-                vac_q = vac_q.ilike("area", f"%{filtros['area']}%")
-            vacantes = (vac_q.execute().data) or []
-        except Exception:
-            vacantes = []
+        vacantes, (filas, nav), facetas = precargar_catalogos(
+            _vacantes_opciones,
+            lambda: consultar_filas_postulaciones(filtros, cursor, per_page),
+            lambda: facetas_postulaciones(filtros),
+        )
+    else:
+        # Sin conexión: lo guardado en el almacén local (todavía sin sincronizar)
+        vacantes = _vacantes_opciones()
+        locales = leer_local("filas_postulaciones", filtros, cursor, per_page)
+        if locales is not None:
+            filas, nav = paginar_keyset(locales, cursor, per_page, clave=lambda f: f["postulacion"])
+    outbox = leer_local("resumen_outbox")
+    areas, dispon, loc = cargar_opciones_postulacion()
+    # Estandarizar áreas desde catálogo
+    areas = get_areas_preferencia()
 
-        # [CHANGE] Aplicar filtros sobre candidatos en la DB cuando haya valores
-        try:
-            cand_q = supabase.table("candidatos").select("*")
-            if filtros["area_preferencia"]:
-                cand_q = cand_q.eq("area_preferencia", filtros["area_preferencia"])
-            if filtros["localidad"]:
-                cand_q = cand_q.eq("localidad", filtros["localidad"])
-            if filtros["disponibilidad"]:
-                cand_q = cand_q.eq("disponibilidad", filtros["disponibilidad"])
-            if filtros["movilidad"] in {"Sí", "No"}:
-                mov_bool = True if filtros["movilidad"] == "Sí" else False
-                cand_q = cand_q.eq("movilidad_propia", mov_bool)
-            if filtros["licencia"] in {"Sí", "No"}:
-                lic_bool = True if filtros["licencia"] == "Sí" else False
-                cand_q = cand_q.eq("licencia_conducir", lic_bool)
-            if filtros["edad_min"]:
-                try:
-                    cand_q = cand_q.gte("edad", int(filtros["edad_min"]))
-                except Exception:
-                    pass
-            if filtros["edad_max"]:
-                try:
-                    cand_q = cand_q.lte("edad", int(filtros["edad_max"]))
-                except Exception:
-                    pass
-            # Búsqueda textual en área (campo preferencia del candidato)
-            if filtros["area"]:
-                cand_q = cand_q.ilike("area_preferencia", f"%{filtros['area']}%")
-            candidatos = (cand_q.execute().data) or []
-        except Exception:
-            candidatos = []
+    # [CHANGE] Vacantes para el selector (cacheadas), opcionalmente filtrando por área (texto)
+    if filtros["area"]:
+        needle = filtros["area"].casefold()
+        vacantes = [v for v in vacantes if needle in str(v.get("area") or "").casefold()]
 
-        # [CHANGE] Aplicar filtros sobre postulaciones en la DB cuando haya valores
-        try:
-            # Pedimos count para potenciales usos futuros; range para paginar
-            post_q = supabase.table("postulaciones").select("*", count="exact")
-            if filtros["estado"]:
-                # [CHANGE] Comparación case-insensitive para compatibilidad con datos antiguos
-                post_q = post_q.ilike("estado", filtros["estado"])
-            if filtros["vacante_id"]:
-                vid = filtros["vacante_id"]
-                post_q = post_q.eq("vacante_id", int(vid) if str(vid).isdigit() else vid)
-            # Si filtramos por atributos de candidato, restringimos por sus IDs (AND)
-            cand_ids = [c.get("id") for c in candidatos if c.get("id")]
-            aplico_filtros_candidato = bool(
-                filtros["area_preferencia"] or filtros["localidad"] or filtros["disponibilidad"] or filtros["movilidad"] or filtros["edad_min"] or filtros["edad_max"]
-            )
-            if aplico_filtros_candidato:
-                if cand_ids:
-                    post_q = post_q.in_("candidato_id", cand_ids)
-                else:
-                    postulaciones = []
-                    candidatos = []
-                    vacantes = vacantes or []
-                    filas: List[Dict[str, Any]] = []
-                    opciones = {"areas_pref": areas, "localidades": loc, "dispon": dispon}
-                    return render_template(
-                        "admin_postulaciones.html",
-                        filtros=filtros,
-                        opciones=opciones,
-                        vacantes=vacantes,
-                        filas=filas,
-                        mensaje=None,
-                        page=page,
-                        has_prev=has_prev,
-                        has_next=has_next,
-                    )
-            # Aplicar orden y rango (solicitamos uno extra para saber si hay siguiente)
-            res_post = post_q.order("created_at", desc=True).range(from_row, to_row).execute()
-            postulaciones = (getattr(res_post, "data", None) or [])
-            if len(postulaciones) > per_page:
-                has_next = True
-                postulaciones = postulaciones[:per_page]
-
-            # [CHANGE] Si hay filtro 'area' (texto), aplicar OR: candidato.area_preferencia o vacante.area
-            if filtros["area"]:
-                vac_ids = [v.get("id") for v in vacantes if v.get("id")]
-                if cand_ids or vac_ids:
-                    postulaciones = [
-                        p for p in postulaciones
-                        if (p.get("candidato_id") in cand_ids) or (p.get("vacante_id") in vac_ids)
-                    ]
-        except Exception:
-            postulaciones = []
+    # Facetas como links que agregan (o quitan, si ya está activo) ese filtro
+    activos = {k: v for k, v in filtros.items() if v}
+    facetas_links = {
+        campo: [
+            {
+                "valor": valor,
+                "n": n,
+                "activo": filtros.get(campo) == valor,
+                "url": url_for(
+                    "admin_postulaciones",
+                    **{k: v for k, v in activos.items() if k != campo},
+                    **({} if filtros.get(campo) == valor else {campo: valor}),
+                ),
+            }
+            for valor, n in items
+        ]
+        for campo, items in facetas.items()
+        if items
+    }
 
-    # Unir por candidato_id (nuevo esquema). Fallback si no hay tabla postulaciones.
-    by_id: Dict[str, Dict[str, Any]] = {c.get("id"): c for c in candidatos if c.get("id")}
-    filas: List[Dict[str, Any]] = []
-    if postulaciones:
-        for p in postulaciones:
-            c = by_id.get(p.get("candidato_id"), {})
-            v = next((vv for vv in vacantes if vv.get("id") == p.get("vacante_id")), None)
-            filas.append({"postulacion": p, "candidato": c, "vacante": v})
-    else:
-        # Si no hay tabla de postulaciones, emulamos una fila por candidato
-        for c in candidatos:
-            filas.append(
-                {
-                    "postulacion": {
-                        "id": c.get("id"),
-                        "estado": "recibido",
-                        "created_at": c.get("created_at"),
-                        "entrevistado_por": None,
-                        "observaciones": None,
-                    },
-                    "candidato": c,
-                    "vacante": None,
-                }
-            )
+    # Exportar con los mismos filtros (sin cursor: siempre el resultado completo)
+    exportar = {
+        formato: url_for("admin_exportar_postulaciones", formato=formato, **activos)
+        for formato in EXPORT_FORMATOS
+        if formato != "xlsx" or exportacion_xlsx_disponible()
+    }
 
     opciones = {"areas_pref": areas, "localidades": loc, "dispon": dispon}
-    return render_template(
+    return render_listado(
         "admin_postulaciones.html",
         filtros=filtros,
         opciones=opciones,
         vacantes=vacantes,
         filas=filas,
+        facetas=facetas_links,
+        exportar=exportar,
         mensaje=None,
-        page=page,
-        has_prev=has_prev,
-        has_next=has_next,
+        nav=nav,
+        outbox=outbox,
     )
 
 
+# ==========================
+# Exportación de postulaciones (CSV / NDJSON / XLSX)
+# ==========================
+# Filas por request a la base. PostgREST corta en 1000 (db-max-rows) y el keyset
+# pide lote + 1 para saber si hay más: con 1000 la respuesta llega recortada a
+# 1000 filas, parece la última página y la exportación termina sin error.
+EXPORT_LOTE = max(1, min(int(os.getenv("EXPORT_LOTE", "999") or 999), 999))
+# XLSX no se puede emitir a medias (es un zip): se arma entero antes de enviarlo
+EXPORT_XLSX_MAX_FILAS = int(os.getenv("EXPORT_XLSX_MAX_FILAS", "100000") or 100000)
+EXPORT_FORMATOS = ("csv", "ndjson", "xlsx")
+_EXPORT_MIME = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# (encabezado, sección de la fila, campo)
+EXPORT_COLUMNAS: List[Tuple[str, str, str]] = [
+    ("postulacion_id", "postulacion", "id"),
+    ("fecha", "postulacion", "created_at"),
+    ("estado", "postulacion", "estado"),
+    ("tipo", "postulacion", "tipo"),
+    ("calificacion", "postulacion", "calificacion"),
+    ("entrevistado_por", "postulacion", "entrevistado_por"),
+    ("observaciones", "postulacion", "observaciones"),
+    ("nombre_apellido", "candidato", "nombre_apellido"),
+    ("dni", "candidato", "dni"),
+    ("mail", "candidato", "mail"),
+    ("celular", "candidato", "celular"),
+    ("edad", "candidato", "edad"),
+    ("localidad", "candidato", "localidad"),
+    ("area_preferencia", "candidato", "area_preferencia"),
+    ("disponibilidad", "candidato", "disponibilidad"),
+    ("movilidad_propia", "candidato", "movilidad_propia"),
+    ("licencia_conducir", "candidato", "licencia_conducir"),
+    ("cv_url", "candidato", "cv_url"),
+    ("vacante_id", "postulacion", "vacante_id"),
+    ("vacante", "vacante", "titulo"),
+    ("vacante_area", "vacante", "area"),
+]
+
+
+def exportacion_xlsx_disponible() -> bool:
+    try:
+        import openpyxl  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def iterar_postulaciones(filtros: Dict[str, str], lote: int = EXPORT_LOTE):
+    """Recorre todo el resultado filtrado de a ``lote`` filas con el cursor keyset.
+
+    Usa la misma cadena de consultas que el listado de admin, así que la
+    exportación coincide con lo que se ve en pantalla. Memoria constante: sólo
+    hay un lote en vuelo.
+    """
+    cursor: Optional[Cursor] = None
+    while True:
+        filas, nav = consultar_filas_postulaciones(filtros, cursor, lote, "completo")
+        latido_worker()
+        yield from filas
+        if not nav["has_next"] or not nav["after"]:
+            return
+        cursor = Cursor.decode(nav["after"], "after")
+        if cursor is None:
+            return
+
+
+def fila_exportacion(f: Dict[str, Any]) -> Dict[str, Any]:
+    """Aplana {postulacion, candidato, vacante} en las columnas de EXPORT_COLUMNAS."""
+    return {col: (f.get(seccion) or {}).get(campo) for col, seccion, campo in EXPORT_COLUMNAS}
+
+
+# Excel/LibreOffice evalúan como fórmula un campo que empieza con alguno de
+# estos caracteres; los números y celulares ("+54 9 261...", "-3,5") se dejan.
+_INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+_NUMERO_O_TELEFONO = re.compile(r"[+-]?\d+(?:[.,]\d+)?|\+?\d[\d ()\-]*\d")
+
+
+def _valor_csv(v: Any) -> Any:
+    if isinstance(v, bool):
+        return "Sí" if v else "No"
+    # Evita que Excel interprete como fórmula un texto cargado por el candidato
+    if isinstance(v, str) and v.startswith(_INICIO_FORMULA) and not _NUMERO_O_TELEFONO.fullmatch(v):
+        return "'" + v
+    return "" if v is None else v
+
+
+def _celda_xlsx(hoja, v: Any) -> Any:
+    """Valor tal cual para XLSX; los textos que empiezan con "=" se fuerzan a texto."""
+    if isinstance(v, bool):
+        return "Sí" if v else "No"
+    if isinstance(v, str) and v.startswith("="):
+        # openpyxl guarda como fórmula todo string que empieza con "="
+        from openpyxl.cell import WriteOnlyCell  # type: ignore
+
+        celda = WriteOnlyCell(hoja, value=v)
+        celda.data_type = "s"
+        return celda
+    return v
+
+
+def generar_csv(filas) -> Any:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM: Excel abre el archivo como UTF-8 (acentos, ñ)
+    buffer.write("\ufeff")
+    writer.writerow([col for col, _, _ in EXPORT_COLUMNAS])
+    for i, f in enumerate(filas, 1):
+        writer.writerow([_valor_csv(v) for v in fila_exportacion(f).values()])
+        if i % EXPORT_LOTE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def generar_ndjson(filas) -> Any:
+    lineas: List[str] = []
+    for f in filas:
+        lineas.append(json.dumps(fila_exportacion(f), ensure_ascii=False, default=str))
+        if len(lineas) >= EXPORT_LOTE:
+            yield "\n".join(lineas) + "\n"
+            lineas = []
+    if lineas:
+        yield "\n".join(lineas) + "\n"
+
+
+def generar_xlsx(filas) -> Any:
+    """Planilla en modo write_only (las filas van a disco, no a memoria)."""
+    import openpyxl  # type: ignore
+
+    libro = openpyxl.Workbook(write_only=True)
+    hoja = libro.create_sheet("Postulaciones")
+    hoja.append([col for col, _, _ in EXPORT_COLUMNAS])
+    for i, f in enumerate(filas):
+        if i >= EXPORT_XLSX_MAX_FILAS:
+            hoja.append([f"(recortado a {EXPORT_XLSX_MAX_FILAS} filas: exportar en CSV para el resto)"])
+            break
+        hoja.append([_celda_xlsx(hoja, v) for v in fila_exportacion(f).values()])
+    with tempfile.TemporaryFile() as tmp:
+        libro.save(tmp)
+        tmp.seek(0)
+        while True:
+            bloque = tmp.read(64 * 1024)
+            if not bloque:
+                break
+            yield bloque
+
+
+@app.get("/admin/postulaciones/exportar")
+def admin_exportar_postulaciones():
+    if not _is_admin():
+        return redirect(url_for("admin_login"))
+    formato = (request.args.get("formato") or "csv").strip().lower()
+    if formato not in EXPORT_FORMATOS:
+        return {"ok": False, "error": "Formato inválido (csv, ndjson o xlsx)"}, 400
+    if formato == "xlsx" and not exportacion_xlsx_disponible():
+        return {"ok": False, "error": "XLSX requiere openpyxl; usar CSV"}, 400
+    if supabase is None:
+        return {"ok": False, "error": "Base de datos no disponible"}, 503
+
+    filtros = filtros_postulaciones_request()
+    generador = {"csv": generar_csv, "ndjson": generar_ndjson, "xlsx": generar_xlsx}[formato]
+    nombre = f"postulaciones_{datetime.now().strftime('%Y%m%d_%H%M')}.{formato}"
+    # Generador: cada lote se envía apenas llega de la base, así una exportación
+    # grande no junta todo en memoria ni espera el timeout de gunicorn/nginx
+    resp = Response(stream_with_context(generador(iterar_postulaciones(filtros))), content_type=_EXPORT_MIME[formato])
+    resp.headers["Content-Disposition"] = f'attachment; filename="{nombre}"'
+    resp.headers["Cache-Control"] = "no-store"
+    # Nginx no debe bufferear la respuesta entera antes de reenviarla
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
+# Catálogo de estados que acepta la UI de admin
+ESTADOS_POSTULACION = ("Recibido", "Preseleccionado", "Entrevista", "Ingresado", "Rechazado")
+
+
 # [CHANGE] Nueva ruta para calificar postulaciones (1..10)
 @app.post("/admin/postulaciones/<int:postulacion_id>/calificar")
 def calificar_postulacion(postulacion_id: int):
@@ -1082,17 +4644,9 @@ def calificar_postulacion(postulacion_id: int):
         if cal < 1 or cal > 10:
             return {"ok": False, "error": "Fuera de rango (1..10)"}, 400
         if supabase is not None:
-            attempts = 0
-            while attempts < 2:
-                try:
-                    supabase.table("postulaciones").update({"calificacion": cal}).eq("id", postulacion_id).execute()
-                    break
-                except Exception as e:
-                    if is_pgrst204_error(e) and attempts == 0:
-                        time.sleep(0.6)
-                        attempts += 1
-                        continue
-                    raise
+            con_reintentos(
+                lambda: supabase.table("postulaciones").update({"calificacion": cal}).eq("id", postulacion_id).execute()
+            )
         return {"ok": True, "calificacion": cal}
     except Exception as e:
         return {"ok": False, "error": str(e)}, 400
@@ -1103,28 +4657,134 @@ def calificar_postulacion(postulacion_id: int):
 def actualizar_estado_postulacion(postulacion_id: int):
     if not _is_admin():
         return {"ok": False, "error": "No autorizado"}, 401
-    allowed = {"Recibido", "Preseleccionado", "Entrevista", "Ingresado", "Rechazado"}
     try:
         estado = (request.form.get("estado") or "").strip()
-        if estado not in allowed:
+        if estado not in ESTADOS_POSTULACION:
             return {"ok": False, "error": "Estado inválido"}, 400
         if supabase is not None:
-            attempts = 0
-            while attempts < 2:
-                try:
-                    supabase.table("postulaciones").update({"estado": estado}).eq("id", postulacion_id).execute()
-                    break
-                except Exception as e:
-                    if is_pgrst204_error(e) and attempts == 0:
-                        time.sleep(0.6)
-                        attempts += 1
-                        continue
-                    raise
+            con_reintentos(
+                lambda: supabase.table("postulaciones").update({"estado": estado}).eq("id", postulacion_id).execute()
+            )
         return {"ok": True, "estado": estado}
     except Exception as e:
         return {"ok": False, "error": str(e)}, 400
 
 
+# ==========================
+# Acciones en lote sobre postulaciones
+# ==========================
+LOTE_MAX_ITEMS = int(os.getenv("LOTE_MAX_ITEMS", "1000") or 1000)
+# IDs por update: el filtro in.(...) va en la URL
+LOTE_IN_MAX = 200
+
+
+def _cambios_item(item: Any) -> Tuple[Any, Dict[str, Any], Optional[str]]:
+    """Valida un item del lote: devuelve (postulacion_id, cambios, error)."""
+    if not isinstance(item, dict):
+        return None, {}, "Item inválido"
+    pid = item.get("postulacion_id")
+    try:
+        pid = int(pid)
+    except (TypeError, ValueError):
+        return pid, {}, "postulacion_id inválido"
+    cambios: Dict[str, Any] = {}
+    if "estado" in item:
+        estado = str(item.get("estado") or "").strip()
+        if estado not in ESTADOS_POSTULACION:
+            return pid, {}, "Estado inválido"
+        cambios["estado"] = estado
+    if "calificacion" in item:
+        try:
+            cal = int(item.get("calificacion"))
+        except (TypeError, ValueError):
+            return pid, {}, "Calificación inválida"
+        if cal < 1 or cal > 10:
+            return pid, {}, "Fuera de rango (1..10)"
+        cambios["calificacion"] = cal
+    if not cambios:
+        return pid, {}, "Sin cambios (estado o calificacion)"
+    return pid, cambios, None
+
+
+def agrupar_cambios_lote(cambios_por_id: Dict[Any, Dict[str, Any]]) -> List[Tuple[Dict[str, Any], List[Any]]]:
+    """Agrupa las postulaciones que reciben exactamente los mismos cambios.
+
+    Cada grupo es un único ``update(...).in_("id", ids)`` (partido cada
+    LOTE_IN_MAX ids): 500 postulaciones pasadas a "Entrevista" son 3 requests.
+    """
+    grupos: Dict[Tuple[Tuple[str, Any], ...], List[Any]] = {}
+    for pid, cambios in cambios_por_id.items():
+        grupos.setdefault(tuple(sorted(cambios.items())), []).append(pid)
+    return [
+        (dict(clave), ids[i:i + LOTE_IN_MAX])
+        for clave, ids in grupos.items()
+        for i in range(0, len(ids), LOTE_IN_MAX)
+    ]
+
+
+@app.post("/admin/postulaciones/lote")
+def actualizar_postulaciones_lote():
+    """Cambia estado y/o calificación de varias postulaciones en un request.
+
+    Body JSON: {"items": [{"postulacion_id": 12, "estado": "Entrevista"},
+    {"postulacion_id": 15, "calificacion": 8}, ...]}. Devuelve un resultado
+    por item, en el mismo orden.
+    """
+    if not _is_admin():
+        return {"ok": False, "error": "No autorizado"}, 401
+    datos = request.get_json(silent=True) or {}
+    items = datos.get("items") if isinstance(datos, dict) else None
+    if not isinstance(items, list) or not items:
+        return {"ok": False, "error": "Falta items"}, 400
+    if len(items) > LOTE_MAX_ITEMS:
+        return {"ok": False, "error": f"Máximo {LOTE_MAX_ITEMS} items por lote"}, 400
+
+    resultados: List[Dict[str, Any]] = []
+    # Varios items de la misma postulación se combinan (el último gana por campo)
+    cambios_por_id: Dict[Any, Dict[str, Any]] = {}
+    for item in items:
+        pid, cambios, error = _cambios_item(item)
+        resultados.append({"postulacion_id": pid, "ok": error is None, "error": error})
+        if error is None:
+            cambios_por_id.setdefault(pid, {}).update(cambios)
+
+    grupos = agrupar_cambios_lote(cambios_por_id)
+    fallidos: Dict[Any, str] = {}
+    if supabase is not None and grupos:
+        def _aplicar(cambios: Dict[str, Any], ids: List[Any]) -> Optional[str]:
+            try:
+                res = con_reintentos(
+                    lambda: supabase.table("postulaciones").update(cambios).in_("id", ids).execute()  # type: ignore[union-attr]
+                )
+            except Exception as e:
+                for pid in ids:
+                    fallidos[pid] = str(e)
+                return None
+            # update devuelve las filas modificadas: las que faltan no existen
+            encontrados = {r.get("id") for r in (getattr(res, "data", None) or [])}
+            for pid in ids:
+                if pid not in encontrados:
+                    fallidos[pid] = "Postulación inexistente"
+            return None
+
+        en_paralelo(*[(lambda c=c, ids=ids: _aplicar(c, ids)) for c, ids in grupos])
+
+    for r in resultados:
+        if not r["ok"]:
+            continue
+        if r["postulacion_id"] in fallidos:
+            r.update(ok=False, error=fallidos[r["postulacion_id"]])
+        else:
+            r.update(cambios_por_id[r["postulacion_id"]])
+    actualizadas = len({r["postulacion_id"] for r in resultados if r["ok"]})
+    return {
+        "ok": all(r["ok"] for r in resultados),
+        "actualizadas": actualizadas,
+        "consultas": len(grupos),
+        "resultados": resultados,
+    }
+
+
 @app.route("/admin/postulaciones/borrar", methods=["POST"])
 def admin_borrar_postulado():
     if not _is_admin():
@@ -1139,8 +4799,21 @@ def admin_borrar_postulado():
     return redirect(url_for("admin_postulaciones"))
 
 
+if POSTULACION_ASYNC:
+    try:
+        reanudar_envios_pendientes()
+    except Exception:
+        pass
+
+iniciar_outbox()
+
+if JINJA_PRECOMPILAR:
+    precompilar_templates()
+
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "5000"))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    # Debug (y su autoreload) sólo con FLASK_DEBUG=1; nunca por defecto
+    app.run(host="0.0.0.0", port=port, debug=FLASK_DEBUG)
 
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: consultas secuenciales vs. en paralelo (IO_WORKERS) por request.
+
+Reemplaza el cliente de Supabase por uno que agrega una latencia fija a cada
+``execute()`` (simula el RTT a PostgREST) e invalida la caché de catálogos
+antes de cada request, para medir el peor caso (caché fría).
+
+Uso:
+    python bench/bench_fanout.py [--latencia-ms 40] [--repeticiones 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("TURNSTILE_ENABLED", "false")
+
+import app as app_module  # noqa: E402
+
+
+class _Res:
+    def __init__(self, data):
+        self.data = data
+        self.count = None
+
+
+class _Query:
+    """Builder mínimo compatible con las llamadas que hace app.py."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self._single = False
+
+    def __getattr__(self, name):
+        # select, eq, ilike, in_, order, limit, or_... devuelven el mismo builder
+        def _chain(*args, **kwargs):
+            if name == "single":
+                self._single = True
+            return self
+        return _chain
+
+    def execute(self):
+        time.sleep(self.client.latencia)
+        self.client.llamadas += 1
+        if self._single:
+            return _Res({"id": 1, "titulo": "Vacante", "area": 1, "descripcion": "", "estado": "abierta"})
+        return _Res([{"id": 1, "nombre": "Recepción"}])
+
+
+class ClienteConLatencia:
+    def __init__(self, latencia: float):
+        self.latencia = latencia
+        self.llamadas = 0
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+def medir(client, url: str, repeticiones: int, admin: bool) -> list:
+    tiempos = []
+    c = app_module.app.test_client()
+    if admin:
+        with c.session_transaction() as s:
+            s["is_admin"] = True
+    for _ in range(repeticiones):
+        app_module.catalog_cache.invalidate()
+        t0 = time.perf_counter()
+        r = c.get(url)
+        r.get_data()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+        # Cerrar: los listados de admin son streaming y retienen el contexto de request
+        r.close()
+        assert r.status_code == 200, (url, r.status_code)
+    return tiempos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latencia-ms", type=float, default=40.0)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    client = ClienteConLatencia(args.latencia_ms / 1000)
+    # El before_request sincroniza el global con el manager en cada request:
+    # hay que reemplazar lo que entrega el manager, no sólo el global
+    app_module.supabase_manager.obtener = lambda: client
+    app_module.supabase = client
+    app_module._embed_soportado = True
+    rutas = [
+        ("/", False),
+        ("/postular?vacante_id=1", False),
+        ("/admin/vacantes", True),
+        ("/admin/postulaciones", True),
+    ]
+    print(f"Latencia simulada por consulta: {args.latencia_ms:.0f} ms, {args.repeticiones} requests por ruta\n")
+    print(f"{'ruta':32} {'secuencial p50':>15} {'paralelo p50':>13} {'mejora':>8}")
+    for url, admin in rutas:
+        resultados = {}
+        for workers in (1, 8):
+            app_module.IO_WORKERS = workers
+            resultados[workers] = statistics.median(medir(client, url, args.repeticiones, admin))
+        mejora = resultados[1] / resultados[8] if resultados[8] else 0
+        print(f"{url:32} {resultados[1]:>12.1f} ms {resultados[8]:>10.1f} ms {mejora:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks de funciones calientes de app.py contra el Supabase falso.
+
+Casos:
+    cargar_catalogos (caché caliente y fría), resolver_area_desde_form
+    (nombre, id, sin acentos, inexistente) y el armado del listado de admin
+    (join en memoria, embebido de PostgREST y vista de búsqueda).
+
+Con pytest-benchmark (guarda y compara corridas con sus propias opciones):
+    pytest bench/bench_micro.py --benchmark-autosave
+    pytest bench/bench_micro.py --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Sin pytest-benchmark, mismo set de casos con un temporizador simple y el
+formato de reporte de ``carga.py``:
+    python bench/bench_micro.py [--segundos 1] [--salida micro.json] [--baseline micro.json]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import fake_supabase  # noqa: E402
+import reporte  # noqa: E402
+
+try:
+    import pytest  # type: ignore
+except ImportError:  # modo script sin pytest
+    pytest = None  # type: ignore[assignment]
+
+_app: Any = None
+_fake: Optional["fake_supabase.ProcesoFalso"] = None
+
+
+def preparar(candidatos: int = 5000, postulaciones: int = 8000) -> Any:
+    """Levanta el Supabase falso (sin latencia) e importa app.py apuntado a él."""
+    global _app, _fake
+    if _app is not None:
+        return _app
+    _fake = fake_supabase.ProcesoFalso(candidatos=candidatos, postulaciones=postulaciones)
+    os.environ["SUPABASE_URL"] = _fake.url
+    os.environ["SUPABASE_KEY"] = fake_supabase.CLAVE_FALSA
+    os.environ.setdefault("TURNSTILE_ENABLED", "false")
+    import app as app_module  # noqa: E402
+
+    if app_module.asegurar_supabase() is None:
+        raise RuntimeError(f"No se pudo crear el cliente Supabase: {app_module.supabase_manager.ultimo_error}")
+    _app = app_module
+    return _app
+
+
+def filtros(**valores: str) -> Dict[str, str]:
+    """Mismas claves que ``filtros_postulaciones_request()``."""
+    base = {k: "" for k in (
+        "q", "area", "area_preferencia", "localidad", "disponibilidad", "estado",
+        "vacante_id", "edad_min", "edad_max", "movilidad", "licencia",
+    )}
+    base.update(valores)
+    return base
+
+
+def casos(app: Any) -> Dict[str, Tuple[Callable[[], Any], Optional[Callable[[], None]]]]:
+    """nombre -> (función medida, setup previo a cada llamada o None)."""
+    sin_filtros = filtros()
+    por_candidato = filtros(localidad="Capital", disponibilidad="Full time")
+    por_estado = filtros(estado="Recibido")
+
+    def _sin_embebido() -> None:
+        # Fuerza el camino de join en memoria aunque el esquema soporte el embebido
+        app._embed_soportado = None
+
+    return {
+        "cargar_catalogos[caliente]": (app.cargar_catalogos, None),
+        "cargar_catalogos[fria]": (app.cargar_catalogos, app.catalog_cache.invalidate),
+        "resolver_area[nombre]": (lambda: app.resolver_area_desde_form("Enfermería"), None),
+        "resolver_area[id]": (lambda: app.resolver_area_desde_form("3"), None),
+        "resolver_area[sin_acento]": (lambda: app.resolver_area_desde_form("enfermeria"), None),
+        "resolver_area[inexistente]": (lambda: app.resolver_area_desde_form("Astronautas"), None),
+        "join_admin[hash_join]": (lambda: app._filas_hash_join(sin_filtros, None, 50), None),
+        "join_admin[hash_join_filtro_candidato]": (lambda: app._filas_hash_join(por_candidato, None, 50), None),
+        "join_admin[embebido]": (lambda: app._filas_embebidas(sin_filtros, None, 50), _sin_embebido),
+        "join_admin[embebido_filtro_estado]": (lambda: app._filas_embebidas(por_estado, None, 50), _sin_embebido),
+        "join_admin[vista_busqueda]": (lambda: app._filas_busqueda(filtros(q="maria gonz"), None, 50), None),
+    }
+
+
+NOMBRES = [
+    "cargar_catalogos[caliente]", "cargar_catalogos[fria]",
+    "resolver_area[nombre]", "resolver_area[id]", "resolver_area[sin_acento]", "resolver_area[inexistente]",
+    "join_admin[hash_join]", "join_admin[hash_join_filtro_candidato]",
+    "join_admin[embebido]", "join_admin[embebido_filtro_estado]", "join_admin[vista_busqueda]",
+]
+
+
+if pytest is not None:
+
+    @pytest.fixture(scope="module")
+    def app_bench():
+        return preparar()
+
+    @pytest.mark.parametrize("nombre", NOMBRES)
+    def test_micro(benchmark, app_bench, nombre):
+        fn, setup = casos(app_bench)[nombre]
+        if setup is None:
+            resultado = benchmark(fn)
+        else:
+            resultado = benchmark.pedantic(fn, setup=setup, rounds=50, warmup_rounds=2)
+        assert resultado is not None
+
+
+def medir(fn: Callable[[], Any], setup: Optional[Callable[[], None]], segundos: float, min_rondas: int) -> Tuple[list, float]:
+    """Llama ``fn`` durante ``segundos`` (mínimo ``min_rondas``); el setup no cuenta."""
+    for _ in range(3):
+        if setup:
+            setup()
+        fn()
+    tiempos = []
+    medido = 0.0
+    while medido < segundos or len(tiempos) < min_rondas:
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        medido += dt
+        tiempos.append(dt * 1000)
+    return tiempos, medido
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks sin pytest-benchmark")
+    parser.add_argument("--segundos", type=float, default=1.0, help="tiempo medido por caso")
+    parser.add_argument("--min-rondas", type=int, default=20)
+    parser.add_argument("--candidatos", type=int, default=5000)
+    parser.add_argument("--postulaciones", type=int, default=8000)
+    parser.add_argument("--casos", default="", help="subcadena para filtrar casos (p. ej. join_admin)")
+    parser.add_argument("--salida", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerancia", type=float, default=0.15)
+    args = parser.parse_args()
+
+    app = preparar(args.candidatos, args.postulaciones)
+    rep = reporte.nuevo_reporte({k: v for k, v in vars(args).items() if k not in {"salida", "baseline"}})
+    definidos = casos(app)
+    for nombre in NOMBRES:
+        if args.casos and args.casos not in nombre:
+            continue
+        fn, setup = definidos[nombre]
+        tiempos, medido = medir(fn, setup, args.segundos, args.min_rondas)
+        rep["escenarios"][nombre] = reporte.resumir(tiempos, 0, medido)
+    if _fake is not None:
+        _fake.detener()
+    return reporte.cerrar(rep, args.salida, args.baseline, args.tolerancia)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de las rutas públicas y de admin contra un Supabase falso.
+
+Levanta ``fake_supabase.py`` en un proceso aparte y la app (servidor werkzeug
+con hilos) en este, y dispara requests concurrentes por escenario:
+
+    home           GET /
+    vacante        GET /vacante/<id>
+    postular       POST /postular (multipart con el PDF de --cv y un DNI nuevo por request)
+    admin          GET /admin/postulaciones (sin filtros, por estado, búsqueda, filtros de candidato)
+
+Por escenario informa requests, errores, req/s y p50/p95/p99, y cuántas
+llamadas a Supabase hizo la app por request. ``--salida`` guarda el reporte
+en JSON; ``--baseline`` lo compara contra uno anterior y sale con código 1 si
+el p95 o el throughput empeoran más que ``--tolerancia``.
+
+Con ``--url`` se mide una app ya levantada (p. ej. gunicorn) en vez de la
+del proceso; en ese caso el Supabase falso hay que levantarlo aparte
+(``python bench/fake_supabase.py``) y apuntar la app a él.
+
+Uso:
+    python bench/carga.py [--escenarios home,vacante,postular,admin] [--duracion 10]
+                          [--concurrencia 8] [--latencia-ms 20] [--fallos 0]
+                          [--salida bench/base.json] [--baseline bench/base.json]
+"""
+
+import argparse
+import http.client
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import fake_supabase  # noqa: E402
+import reporte  # noqa: E402
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ADMIN_USUARIO = "bench"
+ADMIN_CLAVE = "bench"
+
+# (método, path, cuerpo, headers) de un request; se arma uno por iteración
+Request = Tuple[str, str, Optional[bytes], Dict[str, str]]
+
+
+# ==========================
+# App y servidores
+# ==========================
+def levantar_app(fake: "fake_supabase.ProcesoFalso", args: argparse.Namespace) -> str:
+    """Importa app.py apuntado al Supabase falso y lo sirve en un hilo. Devuelve la URL base."""
+    os.environ["SUPABASE_URL"] = fake.url
+    os.environ["SUPABASE_KEY"] = fake_supabase.CLAVE_FALSA
+    os.environ["ADMIN_USER"] = ADMIN_USUARIO
+    os.environ["ADMIN_PASSWORD"] = ADMIN_CLAVE
+    os.environ["SPOOL_DIR"] = tempfile.mkdtemp(prefix="bench-spool-")
+    os.environ["POSTULACION_ASYNC"] = "false" if args.sincronico else "true"
+    if args.turnstile:
+        os.environ["TURNSTILE_ENABLED"] = "true"
+        os.environ["TURNSTILE_VERIFY_URL"] = f"{fake.url}/turnstile/v0/siteverify"
+    else:
+        os.environ["TURNSTILE_ENABLED"] = "false"
+
+    import app as app_module  # noqa: E402
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class _Handler(WSGIRequestHandler):
+        # Keep-alive: sin esto cada request abre una conexión nueva
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_request(self, *a, **kw) -> None:
+            pass
+
+    app_module.calentar_worker()
+    servidor = make_server("127.0.0.1", 0, app_module.app, threaded=True, request_handler=_Handler)
+    threading.Thread(target=servidor.serve_forever, name="app", daemon=True).start()
+    return f"http://127.0.0.1:{servidor.server_port}"
+
+
+class Cliente:
+    """Conexión HTTP keep-alive por hilo."""
+
+    def __init__(self, base_url: str, cookie: str = "") -> None:
+        partes = urllib.parse.urlsplit(base_url)
+        self.host, self.puerto = partes.hostname, partes.port or 80
+        self.cookie = cookie
+        self._local = threading.local()
+
+    def _conexion(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.puerto, timeout=60)
+        return conn
+
+    def enviar(self, metodo: str, path: str, cuerpo: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        headers = dict(headers or {})
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        for intento in (1, 2):
+            conn = self._conexion()
+            try:
+                conn.request(metodo, path, body=cuerpo, headers=headers)
+                resp = conn.getresponse()
+                datos = resp.read()
+                return resp.status, {k.lower(): v for k, v in resp.getheaders()}, datos
+            except (http.client.HTTPException, ConnectionError, OSError):
+                # El servidor cerró la conexión keep-alive: reabrir una vez
+                conn.close()
+                self._local.conn = None
+                if intento == 2:
+                    raise
+        raise RuntimeError("inalcanzable")
+
+
+def login_admin(base_url: str) -> str:
+    cliente = Cliente(base_url)
+    cuerpo = urllib.parse.urlencode({"username": ADMIN_USUARIO, "password": ADMIN_CLAVE}).encode()
+    status, headers, _ = cliente.enviar(
+        "POST", "/admin/login", cuerpo, {"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    cookie = (headers.get("set-cookie") or "").split(";", 1)[0]
+    if status != 302 or not cookie:
+        raise SystemExit(f"No se pudo iniciar sesión como admin (HTTP {status}); revisar ADMIN_USER/ADMIN_PASSWORD")
+    return cookie
+
+
+# ==========================
+# Escenarios
+# ==========================
+def multipart(campos: Dict[str, str], archivo: Tuple[str, str, bytes]) -> Tuple[bytes, str]:
+    limite = f"bench{uuid.uuid4().hex}"
+    partes: List[bytes] = []
+    for nombre, valor in campos.items():
+        partes.append(
+            f'--{limite}\r\nContent-Disposition: form-data; name="{nombre}"\r\n\r\n{valor}\r\n'.encode("utf-8")
+        )
+    campo, nombre_archivo, datos = archivo
+    partes.append(
+        f'--{limite}\r\nContent-Disposition: form-data; name="{campo}"; filename="{nombre_archivo}"\r\n'
+        f"Content-Type: application/pdf\r\n\r\n".encode("utf-8") + datos + b"\r\n"
+    )
+    partes.append(f"--{limite}--\r\n".encode("utf-8"))
+    return b"".join(partes), f"multipart/form-data; boundary={limite}"
+
+
+def escenarios(args: argparse.Namespace, cv: bytes) -> Dict[str, Tuple[Callable[[int], Request], Callable[[int, Dict[str, str]], bool]]]:
+    """nombre -> (arma el request i-ésimo, valida la respuesta)."""
+    rnd = random.Random(args.semilla)
+    dni_base = 40000000 + rnd.randint(0, 10**6) * 10
+
+    def home(i: int) -> Request:
+        return "GET", "/", None, {}
+
+    def vacante(i: int) -> Request:
+        # Vacantes 1..N de la semilla (el detalle muestra también las cerradas)
+        return "GET", f"/vacante/{(i % args.vacantes) + 1}", None, {}
+
+    def postular(i: int) -> Request:
+        campos = {
+            "nombre_apellido": f"Postulante Bench {i}",
+            "dni": str(dni_base + i),
+            "edad": str(20 + i % 40),
+            "localidad": fake_supabase.LOCALIDADES[i % len(fake_supabase.LOCALIDADES)],
+            "disponibilidad": fake_supabase.DISPONIBILIDADES[i % len(fake_supabase.DISPONIBILIDADES)],
+            "area_preferencia": fake_supabase.AREAS[i % len(fake_supabase.AREAS)],
+            "celular": f"261{5000000 + i}",
+            "mail": f"bench{i}@mail.com",
+            "licencia_conducir": "Sí" if i % 2 else "No",
+            "movilidad_propia": "No",
+            "familiar_en_clinica": "No",
+            "fuente_postulacion": "Web",
+            "vacante_id": str((i % args.vacantes) + 1),
+            # Un token por envío: los tokens de Turnstile son de un solo uso
+            "cf-turnstile-response": f"bench-{i}",
+        }
+        cuerpo, tipo = multipart(campos, ("cv", "CV_prueba.pdf", cv))
+        return "POST", "/postular", cuerpo, {"Content-Type": tipo}
+
+    consultas_admin = [
+        "",
+        "?estado=recibido",
+        "?q=maria",
+        "?localidad=Capital&disponibilidad=Full+time",
+        "?area=Enfermer",
+        "?vacante_id=3",
+    ]
+
+    def admin(i: int) -> Request:
+        return "GET", "/admin/postulaciones" + consultas_admin[i % len(consultas_admin)], None, {}
+
+    def ok_200(status: int, headers: Dict[str, str]) -> bool:
+        return status == 200
+
+    def ok_postular(status: int, headers: Dict[str, str]) -> bool:
+        # Éxito = redirect a /confirmacion?ok=1
+        return status == 302 and "ok=1" in (headers.get("location") or "")
+
+    return {
+        "home": (home, ok_200),
+        "vacante": (vacante, ok_200),
+        "postular": (postular, ok_postular),
+        "admin": (admin, ok_200),
+    }
+
+
+def correr(
+    cliente: Cliente,
+    armar: Callable[[int], Request],
+    valido: Callable[[int, Dict[str, str]], bool],
+    concurrencia: int,
+    duracion: float,
+    maximo: Optional[int],
+) -> Tuple[List[float], int, float]:
+    """Lanza ``concurrencia`` hilos durante ``duracion`` segundos (o hasta ``maximo`` requests)."""
+    latencias: List[float] = []
+    errores = 0
+    lock = threading.Lock()
+    contador = iter(range(10**9))
+    fin = time.perf_counter() + duracion
+
+    def trabajador() -> None:
+        nonlocal errores
+        while time.perf_counter() < fin:
+            with lock:
+                i = next(contador)
+            if maximo is not None and i >= maximo:
+                return
+            metodo, path, cuerpo, headers = armar(i)
+            t0 = time.perf_counter()
+            try:
+                status, resp_headers, _ = cliente.enviar(metodo, path, cuerpo, headers)
+                ok = valido(status, resp_headers)
+            except Exception:
+                ok = False
+            ms = (time.perf_counter() - t0) * 1000
+            with lock:
+                latencias.append(ms)
+                errores += 0 if ok else 1
+
+    hilos = [threading.Thread(target=trabajador, daemon=True) for _ in range(concurrencia)]
+    t0 = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return latencias, errores, time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escenarios", default="home,vacante,postular,admin")
+    parser.add_argument("--duracion", type=float, default=10.0, help="segundos por escenario")
+    parser.add_argument("--requests", type=int, default=None, help="tope de requests por escenario")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--calentamiento", type=int, default=5, help="requests por escenario que no se miden")
+    parser.add_argument("--latencia-ms", type=float, default=20.0, help="latencia de cada request a Supabase")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--fallos", type=float, default=0.0, help="fracción de requests a Supabase que fallan (503)")
+    parser.add_argument("--sin-migraciones", action="store_true", help="Supabase sin RPCs/vista (caminos de fallback)")
+    parser.add_argument("--sincronico", action="store_true", help="POSTULACION_ASYNC=false (sube y registra dentro del request)")
+    parser.add_argument("--turnstile", action="store_true", help="verifica Turnstile contra el stub del servidor falso")
+    parser.add_argument("--vacantes", type=int, default=30)
+    parser.add_argument("--candidatos", type=int, default=5000)
+    parser.add_argument("--postulaciones", type=int, default=8000)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--cv", default=os.path.join(RAIZ, "CV_prueba.pdf"))
+    parser.add_argument("--url", default=None, help="medir una app ya levantada en esta URL")
+    parser.add_argument("--salida", default=None, help="guardar el reporte JSON")
+    parser.add_argument("--baseline", default=None, help="reporte JSON contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with open(args.cv, "rb") as f:
+        cv = f.read()
+
+    fake = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        fake = fake_supabase.ProcesoFalso(
+            latencia_ms=args.latencia_ms, jitter_ms=args.jitter_ms, fallos=args.fallos,
+            migraciones=not args.sin_migraciones, semilla=args.semilla,
+            vacantes=args.vacantes, candidatos=args.candidatos, postulaciones=args.postulaciones,
+        )
+        base_url = levantar_app(fake, args)
+
+    parametros = {k: v for k, v in vars(args).items() if k not in {"salida", "baseline", "cv"}}
+    parametros["cv_bytes"] = len(cv)
+    rep = reporte.nuevo_reporte(parametros)
+    definidos = escenarios(args, cv)
+    cookie = login_admin(base_url)
+    print(f"App en {base_url}" + (f", Supabase falso en {fake.url}" if fake else ""))
+    print(f"Concurrencia {args.concurrencia}, {args.duracion:.0f} s por escenario, latencia Supabase {args.latencia_ms:.0f}±{args.jitter_ms:.0f} ms, fallos {args.fallos:.0%}")
+
+    for nombre in [e.strip() for e in args.escenarios.split(",") if e.strip()]:
+        if nombre not in definidos:
+            raise SystemExit(f"Escenario desconocido: {nombre} (disponibles: {', '.join(definidos)})")
+        armar, valido = definidos[nombre]
+        cliente = Cliente(base_url, cookie if nombre == "admin" else "")
+        # Calentamiento con índices altos para no repetir los DNIs medidos
+        correr(cliente, lambda i: armar(10**6 + i), valido, 1, 60.0, args.calentamiento)
+        if fake is not None:
+            fake.reiniciar_contadores()
+        latencias, errores, duracion = correr(cliente, armar, valido, args.concurrencia, args.duracion, args.requests)
+        extra: Dict[str, Any] = {}
+        if fake is not None and latencias:
+            extra["supabase_por_request"] = round(fake.stats()["total"] / len(latencias), 2)
+        rep["escenarios"][nombre] = reporte.resumir(latencias, errores, duracion, **extra)
+        r = rep["escenarios"][nombre]
+        print(f"  {nombre:10} {r['n']:>6} req  {r['rps']:>8.1f} req/s  p95 {r['p95_ms']:>8.2f} ms  errores {errores}")
+
+    if fake is not None:
+        fake.detener()
+    return reporte.cerrar(rep, args.salida, args.baseline, args.tolerancia)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
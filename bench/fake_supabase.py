@@ -0,0 +1,913 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita PostgREST + Storage de Supabase para benchmarks.
+
+Implementa sólo lo que usa ``app.py``: lecturas con filtros (eq, neq, gt,
+gte, lt, lte, like, ilike, in, is, or/and anidados), ``order``/``limit``,
+recursos embebidos ``candidatos(...)`` / ``vacantes(...)`` (con ``!inner``),
+``.single()``, insert/upsert/update/delete, las RPC ``registrar_postulacion``
+y ``facetas_postulaciones``, la vista ``postulaciones_busqueda`` y el campo
+``estado_normalizado`` (migraciones 001-003). Con ``--sin-migraciones``
+responde como una base sin ellas (PGRST202/PGRST205/42703) para medir los
+caminos de fallback. Como PostgREST con ``db-max-rows`` por defecto, ninguna
+lectura devuelve más de ``--max-filas`` (1000) filas aunque pida más.
+
+Storage: subida (``x-upsert``), listado y descarga pública en memoria. También
+atiende ``/turnstile/v0/siteverify`` (siempre ``success``) para medir el
+camino con Turnstile activo sin salir a Cloudflare.
+
+Latencia (``--latencia-ms`` + ``--jitter-ms``) y fallas (``--fallos``: fracción
+de requests que responden 503) se aplican a cada request y se pueden cambiar
+en caliente con ``POST /_fake/config``; ``GET /_fake/stats`` devuelve los
+contadores.
+
+Uso:
+    python bench/fake_supabase.py [--puerto 54321] [--latencia-ms 20] [--fallos 0.01]
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=<CLAVE_FALSA> python app.py
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+import unicodedata
+import urllib.parse
+import urllib.request
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ==========================
+# Esquema (migrations/000_schema_base.sql)
+# ==========================
+COLUMNAS: Dict[str, Tuple[str, ...]] = {
+    "localidades": ("id", "nombre"),
+    "areas": ("id", "nombre"),
+    "areas_preferencia": ("id", "nombre"),
+    "vacantes": ("id", "created_at", "titulo", "area", "descripcion", "estado"),
+    "candidatos": (
+        "id", "created_at", "nombre_apellido", "dni", "edad", "area_preferencia",
+        "licencia_conducir", "movilidad_propia", "disponibilidad", "celular", "mail",
+        "localidad", "cv_url", "familiar_en_clinica", "fuente_postulacion",
+    ),
+    "postulaciones": (
+        "id", "created_at", "candidato_id", "vacante_id", "estado", "tipo",
+        "entrevistado_por", "observaciones", "calificacion",
+    ),
+}
+# Valores por defecto de las columnas "not null default ..."
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "vacantes": {"estado": "abierta"},
+    "candidatos": {"licencia_conducir": False, "movilidad_propia": False, "familiar_en_clinica": False},
+    "postulaciones": {"estado": "recibido", "tipo": "general"},
+}
+UNICAS: Dict[str, Tuple[str, ...]] = {
+    "localidades": ("nombre",), "areas": ("nombre",), "areas_preferencia": ("nombre",), "candidatos": ("dni",),
+}
+# Relaciones embebibles desde postulaciones (FK -> tabla)
+RELACIONES: Dict[Tuple[str, str], str] = {
+    ("postulaciones", "candidatos"): "candidato_id",
+    ("postulaciones", "vacantes"): "vacante_id",
+}
+VISTA_BUSQUEDA = "postulaciones_busqueda"
+# supabase-py exige que SUPABASE_KEY tenga forma de JWT; el servidor no la valida
+CLAVE_FALSA = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.fake"
+
+LOCALIDADES = ["Capital", "Godoy Cruz", "Guaymallén", "Las Heras", "Luján de Cuyo", "Maipú"]
+AREAS = ["Administración", "Recepción", "Enfermería", "Mantenimiento", "Limpieza", "Recursos Humanos", "Farmacia", "Cocina"]
+DISPONIBILIDADES = ["Full time", "Part time", "Fines de semana"]
+ESTADOS = ["recibido", "Recibido", "entrevista", "seleccionado", "rechazado"]
+NOMBRES = ["María", "José", "Ana", "Juan", "Lucía", "Martín", "Sofía", "Diego", "Valentina", "Nicolás"]
+APELLIDOS = ["González", "Pérez", "Gómez", "Martínez", "Fernández", "López", "Díaz", "Sánchez", "Romero", "Álvarez"]
+
+
+def _ahora() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def normalizar(texto: Any) -> str:
+    # Igual que normalizar_busqueda() de app.py / f_unaccent(lower(...))
+    texto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    return "".join(ch for ch in texto if not unicodedata.combining(ch))
+
+
+class ErrorPostgrest(Exception):
+    """Error con el cuerpo JSON que devuelve PostgREST."""
+
+    def __init__(self, status: int, code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.cuerpo = {"code": code, "message": message, "details": None, "hint": None}
+
+
+# ==========================
+# Filtros de PostgREST
+# ==========================
+def _partir(texto: str) -> List[str]:
+    """Separa por comas de primer nivel, respetando paréntesis y comillas."""
+    partes, actual, nivel, comillas, escape = [], [], 0, False, False
+    for ch in texto:
+        if escape:
+            actual.append(ch)
+            escape = False
+            continue
+        if ch == "\\" and comillas:
+            actual.append(ch)
+            escape = True
+            continue
+        if ch == '"':
+            comillas = not comillas
+        elif not comillas and ch == "(":
+            nivel += 1
+        elif not comillas and ch == ")":
+            nivel -= 1
+        elif not comillas and nivel == 0 and ch == ",":
+            partes.append("".join(actual))
+            actual = []
+            continue
+        actual.append(ch)
+    if actual:
+        partes.append("".join(actual))
+    return partes
+
+
+def _sin_comillas(valor: str) -> str:
+    if len(valor) >= 2 and valor[0] == valor[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", valor[1:-1])
+    return valor
+
+
+def _coercer(valor: str, referencia: Any) -> Any:
+    """Convierte el texto del filtro al tipo del valor de la fila."""
+    if isinstance(referencia, bool):
+        return valor.lower() in {"true", "t", "1"}
+    if isinstance(referencia, int):
+        try:
+            return int(valor)
+        except ValueError:
+            return valor
+    if isinstance(referencia, float):
+        try:
+            return float(valor)
+        except ValueError:
+            return valor
+    return valor
+
+
+def _patron(patron: str, ignorar_mayusculas: bool) -> "re.Pattern[str]":
+    regex = "".join(".*" if ch in "*%" else "." if ch == "_" else re.escape(ch) for ch in patron)
+    return re.compile(f"^{regex}$", re.S | (re.I if ignorar_mayusculas else 0))
+
+
+Condicion = Callable[[Dict[str, Any]], bool]
+
+
+def _condicion(columna: str, operacion: str, valor: str, lector: Callable[[Dict[str, Any], str], Any]) -> Condicion:
+    negar = False
+    if operacion == "not":
+        operacion, _, valor = valor.partition(".")
+        negar = True
+
+    if operacion in {"eq", "neq", "gt", "gte", "lt", "lte"}:
+        texto = _sin_comillas(valor)
+
+        def comparar(fila: Dict[str, Any]) -> bool:
+            actual = lector(fila, columna)
+            if actual is None:
+                return False
+            esperado = _coercer(texto, actual)
+            try:
+                if operacion == "eq":
+                    return actual == esperado
+                if operacion == "neq":
+                    return actual != esperado
+                if operacion == "gt":
+                    return actual > esperado
+                if operacion == "gte":
+                    return actual >= esperado
+                if operacion == "lt":
+                    return actual < esperado
+                return actual <= esperado
+            except TypeError:
+                return False
+        cond = comparar
+    elif operacion in {"like", "ilike"}:
+        regex = _patron(_sin_comillas(valor), operacion == "ilike")
+
+        def cond(fila: Dict[str, Any]) -> bool:
+            actual = lector(fila, columna)
+            return actual is not None and bool(regex.match(str(actual)))
+    elif operacion == "in":
+        textos = [_sin_comillas(v) for v in _partir(valor.strip()[1:-1])] if valor.strip() not in {"()", ""} else []
+
+        def cond(fila: Dict[str, Any]) -> bool:
+            actual = lector(fila, columna)
+            return actual is not None and any(actual == _coercer(t, actual) for t in textos)
+    elif operacion == "is":
+        esperado = {"null": None, "true": True, "false": False}.get(valor.lower(), valor)
+
+        def cond(fila: Dict[str, Any]) -> bool:
+            return lector(fila, columna) is esperado
+    else:
+        raise ErrorPostgrest(400, "PGRST100", f'"failed to parse filter ({operacion}.{valor})"')
+
+    if negar:
+        return lambda fila: not cond(fila)
+    return cond
+
+
+def _logica(operador: str, expresion: str, lector) -> Condicion:
+    """``or=(a.eq.1,and(b.gt.2,c.lt.3))`` -> función sobre la fila."""
+    texto = expresion.strip()
+    if texto.startswith("(") and texto.endswith(")"):
+        texto = texto[1:-1]
+    condiciones: List[Condicion] = []
+    for item in _partir(texto):
+        item = item.strip()
+        m = re.match(r"^(not\.)?(and|or)\((.*)\)$", item, re.S)
+        if m:
+            sub = _logica(m.group(2), m.group(3), lector)
+            condiciones.append((lambda f, s=sub: not s(f)) if m.group(1) else sub)
+            continue
+        columna, _, resto = item.partition(".")
+        operacion, _, valor = resto.partition(".")
+        condiciones.append(_condicion(columna, operacion, valor, lector))
+    if operador == "and":
+        return lambda fila: all(c(fila) for c in condiciones)
+    return lambda fila: any(c(fila) for c in condiciones)
+
+
+def _parsear_select(select: str) -> Tuple[List[str], List[Tuple[str, bool, str]]]:
+    """Devuelve (columnas, [(tabla_embebida, inner, select_embebido)])."""
+    columnas: List[str] = []
+    embebidos: List[Tuple[str, bool, str]] = []
+    for item in _partir(re.sub(r"\s+", "", select or "*")):
+        m = re.match(r"^(\w+)(!inner)?\((.*)\)$", item)
+        if m:
+            embebidos.append((m.group(1), bool(m.group(2)), m.group(3)))
+        elif item:
+            columnas.append(item)
+    return columnas or ["*"], embebidos
+
+
+def _ordenar(filas: List[Dict[str, Any]], orden: str) -> List[Dict[str, Any]]:
+    # Sort estable aplicando las claves de la última a la primera
+    for parte in reversed([p for p in orden.split(",") if p]):
+        columna, *mods = parte.split(".")
+        desc = "desc" in mods
+        # PostgREST: nulls last en asc y nulls first en desc (por defecto)
+        nulos_primero = "nullsfirst" in mods or (desc and "nullslast" not in mods)
+        con_valor = [f for f in filas if f.get(columna) is not None]
+        nulos = [f for f in filas if f.get(columna) is None]
+        con_valor.sort(key=lambda f: f[columna], reverse=desc)
+        filas = (nulos + con_valor) if nulos_primero else (con_valor + nulos)
+    return filas
+
+
+# ==========================
+# Base en memoria
+# ==========================
+class BaseFalsa:
+    """Tablas en memoria con un único lock (las consultas son cortas)."""
+
+    def __init__(self, migraciones: bool = True, max_filas: int = 1000) -> None:
+        self.migraciones = migraciones
+        # db-max-rows de PostgREST (0 = sin tope)
+        self.max_filas = max_filas
+        self.tablas: Dict[str, List[Dict[str, Any]]] = {t: [] for t in COLUMNAS}
+        self.secuencias: Dict[str, int] = {t: 0 for t in COLUMNAS}
+        self.objetos: Dict[str, Dict[str, bytes]] = {}
+        self.lock = threading.RLock()
+        # Cada escritura sube la versión; la vista se recalcula sólo si cambió
+        self.version = 0
+        self._vista: Tuple[int, List[Dict[str, Any]]] = (-1, [])
+
+    # -- datos ------------------------------------------------------------
+    def _nuevo_id(self, tabla: str) -> Any:
+        if tabla == "candidatos":
+            return str(uuid.uuid4())
+        self.secuencias[tabla] += 1
+        return self.secuencias[tabla]
+
+    def _por_id(self, tabla: str) -> Dict[Any, Dict[str, Any]]:
+        return {f["id"]: f for f in self.tablas[tabla]}
+
+    def sembrar(self, vacantes: int = 30, candidatos: int = 5000, postulaciones: int = 8000, semilla: int = 1) -> None:
+        """Datos sintéticos reproducibles (misma semilla -> mismas filas)."""
+        rnd = random.Random(semilla)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        with self.lock:
+            for tabla, nombres in (("localidades", LOCALIDADES), ("areas", AREAS), ("areas_preferencia", AREAS)):
+                for nombre in nombres:
+                    self.insertar(tabla, {"nombre": nombre})
+            for i in range(vacantes):
+                self.insertar("vacantes", {
+                    "titulo": f"Vacante {i + 1}",
+                    "area": AREAS[i % len(AREAS)],
+                    "descripcion": "Descripción de la vacante " * 8,
+                    "estado": "abierta" if i % 4 else "cerrada",
+                    "created_at": (base + timedelta(days=i)).isoformat(),
+                })
+            ids_vacantes = [v["id"] for v in self.tablas["vacantes"]]
+            for i in range(candidatos):
+                nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}"
+                dni = str(20000000 + i)
+                self.insertar("candidatos", {
+                    "nombre_apellido": nombre,
+                    "dni": dni,
+                    "edad": rnd.randint(18, 60),
+                    "area_preferencia": rnd.choice(AREAS),
+                    "licencia_conducir": rnd.random() < 0.4,
+                    "movilidad_propia": rnd.random() < 0.5,
+                    "disponibilidad": rnd.choice(DISPONIBILIDADES),
+                    "celular": f"261{rnd.randint(1000000, 9999999)}",
+                    "mail": f"{normalizar(nombre).replace(' ', '.')}{i}@mail.com",
+                    "localidad": rnd.choice(LOCALIDADES),
+                    "cv_url": f"/storage/v1/object/public/cvs/{dni}.pdf",
+                    "created_at": (base + timedelta(minutes=7 * i)).isoformat(),
+                })
+            ids_candidatos = [c["id"] for c in self.tablas["candidatos"]]
+            for i in range(postulaciones):
+                vacante = rnd.choice(ids_vacantes) if ids_vacantes and rnd.random() < 0.8 else None
+                self.insertar("postulaciones", {
+                    "candidato_id": rnd.choice(ids_candidatos),
+                    "vacante_id": vacante,
+                    "estado": rnd.choice(ESTADOS),
+                    "tipo": "vacante" if vacante else "general",
+                    "calificacion": rnd.choice([None, None, rnd.randint(1, 10)]),
+                    # Timestamps repetidos a propósito: ejercitan el desempate por id del keyset
+                    "created_at": (base + timedelta(minutes=5 * (i // 3))).isoformat(),
+                })
+
+    def insertar(self, tabla: str, fila: Dict[str, Any], on_conflict: str = "", fusionar: bool = False) -> Dict[str, Any]:
+        desconocidas = [k for k in fila if k not in COLUMNAS[tabla]]
+        if desconocidas:
+            raise ErrorPostgrest(
+                400, "PGRST204", f"Could not find the '{desconocidas[0]}' column of '{tabla}' in the schema cache"
+            )
+        if on_conflict and on_conflict not in UNICAS.get(tabla, ()):
+            raise ErrorPostgrest(
+                400, "42P10", "there is no unique or exclusion constraint matching the ON CONFLICT specification"
+            )
+        for unica in UNICAS.get(tabla, ()):
+            if fila.get(unica) is None:
+                continue
+            existente = next((f for f in self.tablas[tabla] if f.get(unica) == fila[unica]), None)
+            if existente is None:
+                continue
+            if fusionar and on_conflict == unica:
+                existente.update({k: v for k, v in fila.items() if k != "id"})
+                self.version += 1
+                return existente
+            raise ErrorPostgrest(
+                409, "23505", f'duplicate key value violates unique constraint "{tabla}_{unica}_key"'
+            )
+        nueva = {c: None for c in COLUMNAS[tabla]}
+        nueva.update(DEFAULTS.get(tabla, {}))
+        nueva.update(fila)
+        if nueva.get("id") is None:
+            nueva["id"] = self._nuevo_id(tabla)
+        if "created_at" in nueva and not nueva["created_at"]:
+            nueva["created_at"] = _ahora()
+        self.tablas[tabla].append(nueva)
+        self.version += 1
+        return nueva
+
+    def borrar(self, tabla: str, filas: List[Dict[str, Any]]) -> None:
+        ids = {f["id"] for f in filas}
+        self.version += 1
+        self.tablas[tabla] = [f for f in self.tablas[tabla] if f["id"] not in ids]
+        # on delete cascade / set null (000_schema_base.sql)
+        if tabla == "candidatos":
+            self.tablas["postulaciones"] = [p for p in self.tablas["postulaciones"] if p["candidato_id"] not in ids]
+        elif tabla == "vacantes":
+            for p in self.tablas["postulaciones"]:
+                if p["vacante_id"] in ids:
+                    p["vacante_id"] = None
+
+    # -- vista de búsqueda (002) -----------------------------------------
+    def filas_vista(self) -> List[Dict[str, Any]]:
+        if self._vista[0] == self.version:
+            return self._vista[1]
+        candidatos = self._por_id("candidatos")
+        vacantes = self._por_id("vacantes")
+        filas = []
+        for p in self.tablas["postulaciones"]:
+            c = candidatos.get(p["candidato_id"])
+            if c is None:
+                continue
+            v = vacantes.get(p["vacante_id"]) or {}
+            fila = dict(p)
+            for k in ("nombre_apellido", "dni", "mail", "celular", "edad", "area_preferencia", "localidad",
+                      "disponibilidad", "movilidad_propia", "licencia_conducir", "cv_url", "created_at"):
+                fila[f"c_{k}"] = c.get(k)
+            fila["c_busqueda"] = normalizar(" ".join(str(c.get(k) or "") for k in ("nombre_apellido", "dni", "mail", "celular")))
+            fila["v_titulo"], fila["v_area"] = v.get("titulo"), v.get("area")
+            fila["area_texto"] = f"{c.get('area_preferencia') or ''} | {v.get('area') or ''}"
+            fila["estado_normalizado"] = (p.get("estado") or "").lower()
+            filas.append(fila)
+        self._vista = (self.version, filas)
+        return filas
+
+    # -- consultas ---------------------------------------------------------
+    def _lector(self, tabla: str, conocidas: Optional[set] = None):
+        def leer(fila: Dict[str, Any], columna: str) -> Any:
+            if columna == "estado_normalizado" and tabla == "postulaciones":
+                return (fila.get("estado") or "").lower()
+            return fila.get(columna)
+
+        def validar(columna: str) -> None:
+            if conocidas is not None and columna not in conocidas:
+                raise ErrorPostgrest(400, "42703", f"column {tabla}.{columna} does not exist")
+        leer.validar = validar  # type: ignore[attr-defined]
+        return leer
+
+    def _columnas_validas(self, tabla: str) -> set:
+        columnas = set(COLUMNAS.get(tabla, ()))
+        if tabla == "postulaciones" and self.migraciones:
+            columnas.add("estado_normalizado")
+        return columnas
+
+    def consultar(self, tabla: str, params: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Aplica select/filtros/order/limit/offset como PostgREST."""
+        if tabla == VISTA_BUSQUEDA:
+            if not self.migraciones:
+                raise ErrorPostgrest(404, "PGRST205", f"Could not find the table 'public.{tabla}' in the schema cache")
+            filas = self.filas_vista()
+            conocidas = set(filas[0]) if filas else None
+        elif tabla in COLUMNAS:
+            filas = list(self.tablas[tabla])
+            conocidas = self._columnas_validas(tabla)
+        else:
+            raise ErrorPostgrest(404, "PGRST205", f"Could not find the table 'public.{tabla}' in the schema cache")
+
+        lector = self._lector(tabla, conocidas)
+        select, orden, limite, desde = "*", "", None, 0
+        condiciones: List[Condicion] = []
+        filtros_embebidos: Dict[str, List[Tuple[str, str, str]]] = {}
+        for clave, valor in params:
+            if clave == "select":
+                select = valor
+            elif clave == "order":
+                orden = f"{orden},{valor}" if orden else valor
+            elif clave == "limit":
+                limite = int(valor)
+            elif clave == "offset":
+                desde = int(valor)
+            elif clave in {"or", "and"}:
+                condiciones.append(_logica(clave, valor, lector))
+            elif clave in {"on_conflict", "columns"} or clave.endswith((".order", ".limit", ".offset")):
+                continue
+            elif "." in clave:
+                embebida, _, columna = clave.partition(".")
+                operacion, _, resto = valor.partition(".")
+                filtros_embebidos.setdefault(embebida, []).append((columna, operacion, resto))
+            else:
+                operacion, _, resto = valor.partition(".")
+                lector.validar(clave)  # type: ignore[attr-defined]
+                condiciones.append(_condicion(clave, operacion, resto, lector))
+
+        filas = [f for f in filas if all(c(f) for c in condiciones)]
+        columnas, embebidos = _parsear_select(select)
+        if embebidos:
+            filas = self._embeber(tabla, filas, embebidos, filtros_embebidos)
+        if orden:
+            filas = _ordenar(filas, orden)
+        filas = filas[desde:]
+        if limite is not None:
+            filas = filas[:limite]
+        return [self._proyectar(f, columnas, embebidos) for f in filas]
+
+    def _embeber(self, tabla, filas, embebidos, filtros_embebidos) -> List[Dict[str, Any]]:
+        resultado = []
+        relaciones = []
+        for destino, inner, select in embebidos:
+            fk = RELACIONES.get((tabla, destino))
+            if fk is None:
+                raise ErrorPostgrest(
+                    400, "PGRST200", f"Could not find a relationship between '{tabla}' and '{destino}' in the schema cache"
+                )
+            lector = self._lector(destino, set(COLUMNAS[destino]))
+            condiciones = []
+            for columna, operacion, valor in filtros_embebidos.get(destino, []):
+                lector.validar(columna)  # type: ignore[attr-defined]
+                condiciones.append(_condicion(columna, operacion, valor, lector))
+            relaciones.append((destino, inner, _parsear_select(select)[0], fk, self._por_id(destino), condiciones))
+        for fila in filas:
+            nueva = dict(fila)
+            descartar = False
+            for destino, inner, columnas, fk, por_id, condiciones in relaciones:
+                hija = por_id.get(fila.get(fk))
+                if hija is not None and not all(c(hija) for c in condiciones):
+                    hija = None
+                if hija is None and inner:
+                    descartar = True
+                    break
+                nueva[destino] = self._proyectar(hija, columnas, []) if hija is not None else None
+            if not descartar:
+                resultado.append(nueva)
+        return resultado
+
+    @staticmethod
+    def _proyectar(fila: Dict[str, Any], columnas: List[str], embebidos) -> Dict[str, Any]:
+        if "*" in columnas:
+            salida = {k: v for k, v in fila.items()}
+        else:
+            salida = {c: fila.get(c) for c in columnas}
+        for destino, _inner, _select in embebidos:
+            salida[destino] = fila.get(destino)
+        return salida
+
+    # -- RPC (001 y 002) ---------------------------------------------------
+    def rpc(self, nombre: str, cuerpo: Dict[str, Any]) -> Any:
+        if not self.migraciones or nombre not in {"registrar_postulacion", "facetas_postulaciones"}:
+            raise ErrorPostgrest(
+                404, "PGRST202", f"Could not find the function public.{nombre} without parameters in the schema cache"
+            )
+        if nombre == "registrar_postulacion":
+            candidato = dict(cuerpo.get("p_candidato") or {})
+            if not candidato.get("dni"):
+                raise ErrorPostgrest(400, "22023", "registrar_postulacion: falta dni")
+            vacante_id = cuerpo.get("p_vacante_id")
+            candidato = {k: v for k, v in candidato.items() if k in COLUMNAS["candidatos"] and k != "id"}
+            c = self.insertar("candidatos", candidato, on_conflict="dni", fusionar=True)
+            p = self.insertar("postulaciones", {
+                "candidato_id": c["id"],
+                "vacante_id": vacante_id,
+                "estado": "recibido",
+                "tipo": "vacante" if vacante_id is not None else "general",
+            })
+            return {"candidato_id": c["id"], "postulacion_id": p["id"]}
+        return self._facetas(cuerpo.get("p_filtros") or {})
+
+    def _facetas(self, filtros: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Conteo por faceta con todos los filtros salvo el propio (como la RPC de 002)."""
+        filas = self.filas_vista()
+        tokens = [normalizar(t) for t in (filtros.get("tokens") or [])]
+        dni = filtros.get("dni_prefijo") or ""
+
+        def pasa(f: Dict[str, Any], salvo: str) -> bool:
+            if any(t not in f["c_busqueda"] for t in tokens) or (dni and not str(f["c_dni"] or "").startswith(dni)):
+                return False
+            for campo in ("area_preferencia", "localidad", "disponibilidad"):
+                if campo != salvo and filtros.get(campo) and f[f"c_{campo}"] != filtros[campo]:
+                    return False
+            if salvo != "estado" and filtros.get("estado") and f["estado_normalizado"] != str(filtros["estado"]).lower():
+                return False
+            if filtros.get("vacante_id") and str(f["vacante_id"]) != str(filtros["vacante_id"]):
+                return False
+            if filtros.get("area") and normalizar(filtros["area"]) not in normalizar(f["area_texto"]):
+                return False
+            for campo, col in (("movilidad", "c_movilidad_propia"), ("licencia", "c_licencia_conducir")):
+                if filtros.get(campo) in {"Sí", "No"} and bool(f[col]) != (filtros[campo] == "Sí"):
+                    return False
+            try:
+                if filtros.get("edad_min") and (f["c_edad"] or 0) < int(filtros["edad_min"]):
+                    return False
+                if filtros.get("edad_max") and (f["c_edad"] or 0) > int(filtros["edad_max"]):
+                    return False
+            except ValueError:
+                pass
+            return True
+
+        salida: Dict[str, List[Dict[str, Any]]] = {}
+        for campo in ("area_preferencia", "localidad", "disponibilidad", "estado"):
+            col = "estado_normalizado" if campo == "estado" else f"c_{campo}"
+            conteo: Dict[Any, int] = {}
+            for f in filas:
+                if f[col] is not None and pasa(f, campo):
+                    conteo[f[col]] = conteo.get(f[col], 0) + 1
+            salida[campo] = [{"valor": k, "n": n} for k, n in sorted(conteo.items(), key=lambda kv: (-kv[1], str(kv[0])))]
+        return salida
+
+
+# ==========================
+# HTTP
+# ==========================
+class Config:
+    def __init__(self, latencia_ms: float = 0.0, jitter_ms: float = 0.0, fallos: float = 0.0, semilla: int = 1) -> None:
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.fallos = fallos
+        self._rnd = random.Random(semilla)
+        self._lock = threading.Lock()
+
+    def sortear(self) -> Tuple[float, bool]:
+        """(segundos de espera, falla) para el próximo request."""
+        with self._lock:
+            espera = self.latencia_ms + (self._rnd.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+            return max(0.0, espera) / 1000, self._rnd.random() < self.fallos
+
+
+class Manejador(BaseHTTPRequestHandler):
+    # HTTP/1.1: la app usa un pool httpx con keep-alive
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo salen en dos writes: sin TCP_NODELAY, Nagle + delayed ACK suman ~40 ms
+    disable_nagle_algorithm = True
+    server: "ServidorFalso"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if self.server.verboso:
+            super().log_message(format, *args)
+
+    def _responder(self, status: int, cuerpo: Any = None, tipo: str = "application/json", headers: Optional[Dict[str, str]] = None) -> None:
+        if isinstance(cuerpo, (bytes, bytearray)):
+            datos = bytes(cuerpo)
+        elif cuerpo is None:
+            datos = b""
+        else:
+            datos = json.dumps(cuerpo, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(datos)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(datos)
+
+    def _leer_cuerpo(self) -> bytes:
+        n = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(n) if n else b""
+
+    def _atender(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        ruta = urllib.parse.unquote(url.path)
+        params = urllib.parse.parse_qsl(url.query, keep_blank_values=True)
+        cuerpo = self._leer_cuerpo()
+        srv = self.server
+
+        if ruta.startswith("/_fake/"):
+            self._control(ruta, cuerpo)
+            return
+
+        espera, falla = srv.config.sortear()
+        if espera:
+            time.sleep(espera)
+        srv.contar(ruta, falla)
+        if falla:
+            self._responder(503, {"code": "503", "message": "falla inyectada (fake_supabase)"})
+            return
+
+        try:
+            if ruta.startswith("/rest/v1/"):
+                self._postgrest(ruta[len("/rest/v1/"):], params, cuerpo)
+            elif ruta.startswith("/storage/v1/"):
+                self._storage(ruta[len("/storage/v1/"):], cuerpo)
+            elif ruta.endswith("/siteverify"):
+                self._responder(200, {"success": True, "hostname": "localhost"})
+            else:
+                self._responder(404, {"message": "ruta desconocida"})
+        except ErrorPostgrest as e:
+            self._responder(e.status, e.cuerpo)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = do_PUT = do_HEAD = _atender
+
+    def _control(self, ruta: str, cuerpo: bytes) -> None:
+        srv = self.server
+        if ruta == "/_fake/stats":
+            self._responder(200, srv.stats())
+        elif ruta == "/_fake/config" and self.command == "POST":
+            cambios = json.loads(cuerpo or b"{}")
+            for clave in ("latencia_ms", "jitter_ms", "fallos"):
+                if clave in cambios:
+                    setattr(srv.config, clave, float(cambios[clave]))
+            self._responder(200, {k: getattr(srv.config, k) for k in ("latencia_ms", "jitter_ms", "fallos")})
+        elif ruta == "/_fake/reset" and self.command == "POST":
+            srv.reiniciar_contadores()
+            self._responder(200, {"ok": True})
+        else:
+            self._responder(404, {"message": "control desconocido"})
+
+    # -- PostgREST -------------------------------------------------------
+    def _postgrest(self, recurso: str, params: List[Tuple[str, str]], cuerpo: bytes) -> None:
+        base = self.server.base
+        prefer = self.headers.get("Prefer") or ""
+        with base.lock:
+            if recurso.startswith("rpc/"):
+                datos = base.rpc(recurso[4:], json.loads(cuerpo or b"{}"))
+                self._responder(200, datos)
+                return
+            tabla = recurso.strip("/")
+            if self.command in {"GET", "HEAD"}:
+                filas = base.consultar(tabla, params)
+                total = len(filas)
+                if base.max_filas:
+                    filas = filas[:base.max_filas]
+                self._responder_filas(filas, prefer, total=total)
+                return
+            if tabla not in COLUMNAS:
+                raise ErrorPostgrest(404, "PGRST205", f"Could not find the table 'public.{tabla}' in the schema cache")
+            if self.command == "POST":
+                payload = json.loads(cuerpo or b"[]")
+                on_conflict = dict(params).get("on_conflict", "")
+                fusionar = "merge-duplicates" in prefer
+                filas = [base.insertar(tabla, dict(f), on_conflict, fusionar) for f in (payload if isinstance(payload, list) else [payload])]
+                self._responder_filas([dict(f) for f in filas], prefer, 201)
+                return
+            # PATCH / DELETE: mismos filtros que una lectura
+            objetivo = {f["id"] for f in base.consultar(tabla, [(k, v) for k, v in params if k != "select"] + [("select", "id")])}
+            filas = [f for f in base.tablas[tabla] if f["id"] in objetivo]
+            if self.command == "PATCH":
+                cambios = json.loads(cuerpo or b"{}")
+                desconocidas = [k for k in cambios if k not in COLUMNAS[tabla]]
+                if desconocidas:
+                    raise ErrorPostgrest(
+                        400, "PGRST204", f"Could not find the '{desconocidas[0]}' column of '{tabla}' in the schema cache"
+                    )
+                for f in filas:
+                    f.update(cambios)
+                base.version += 1
+                self._responder_filas([dict(f) for f in filas], prefer)
+            elif self.command == "DELETE":
+                base.borrar(tabla, filas)
+                self._responder_filas([dict(f) for f in filas], prefer)
+            else:
+                self._responder(405, {"message": "método no soportado"})
+
+    def _responder_filas(self, filas: List[Dict[str, Any]], prefer: str, status: int = 200, total: Optional[int] = None) -> None:
+        total = len(filas) if total is None else total
+        headers = {"Content-Range": f"0-{max(len(filas) - 1, 0)}/{total if 'count=' in prefer else '*'}"}
+        if "application/vnd.pgrst.object+json" in (self.headers.get("Accept") or ""):
+            if len(filas) != 1:
+                raise ErrorPostgrest(
+                    406, "PGRST116", f"JSON object requested, multiple (or no) rows returned ({len(filas)} rows)"
+                )
+            self._responder(status, filas[0], headers=headers)
+            return
+        if "return=minimal" in prefer:
+            self._responder(status, None, headers=headers)
+            return
+        self._responder(status, filas, headers=headers)
+
+    # -- Storage ---------------------------------------------------------
+    def _storage(self, recurso: str, cuerpo: bytes) -> None:
+        base = self.server.base
+        partes = recurso.split("/")
+        with base.lock:
+            if recurso.startswith("object/list/"):
+                bucket = partes[2]
+                opciones = json.loads(cuerpo or b"{}")
+                prefijo = opciones.get("prefix") or ""
+                nombres = sorted(n for n in base.objetos.get(bucket, {}) if n.startswith(prefijo))
+                desde = int(opciones.get("offset") or 0)
+                limite = int(opciones.get("limit") or 100)
+                self._responder(200, [{"name": n, "id": n, "metadata": {"size": len(base.objetos[bucket][n])}}
+                                      for n in nombres[desde:desde + limite]])
+            elif recurso.startswith("object/public/") and self.command in {"GET", "HEAD"}:
+                bucket, path = partes[2], "/".join(partes[3:])
+                datos = base.objetos.get(bucket, {}).get(path)
+                if datos is None:
+                    self._responder(404, {"statusCode": "404", "error": "not_found", "message": "Object not found"})
+                else:
+                    self._responder(200, datos, tipo="application/pdf")
+            elif recurso.startswith("object/") and self.command in {"POST", "PUT"}:
+                bucket, path = partes[1], "/".join(partes[2:])
+                objetos = base.objetos.setdefault(bucket, {})
+                upsert = (self.headers.get("x-upsert") or "false").lower() == "true"
+                if self.command == "POST" and path in objetos and not upsert:
+                    self._responder(400, {"statusCode": "409", "error": "Duplicate", "message": "The resource already exists"})
+                    return
+                # El multipart se guarda entero: alcanza para tamaño y existencia
+                objetos[path] = cuerpo
+                self._responder(200, {"Key": f"{bucket}/{path}"})
+            else:
+                self._responder(404, {"statusCode": "404", "error": "not_found", "message": "ruta de storage desconocida"})
+
+
+class ServidorFalso(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, direccion: Tuple[str, int], base: BaseFalsa, config: Config, verboso: bool = False) -> None:
+        super().__init__(direccion, Manejador)
+        self.base = base
+        self.config = config
+        self.verboso = verboso
+        self._lock_stats = threading.Lock()
+        self.reiniciar_contadores()
+
+    @property
+    def url(self) -> str:
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def reiniciar_contadores(self) -> None:
+        with self._lock_stats:
+            self.requests: Dict[str, int] = {}
+            self.fallos_inyectados = 0
+
+    def contar(self, ruta: str, falla: bool) -> None:
+        # Agrupa por recurso: /rest/v1/postulaciones, /storage/v1/object, ...
+        clave = "/".join(ruta.split("/")[:4])
+        with self._lock_stats:
+            self.requests[clave] = self.requests.get(clave, 0) + 1
+            self.fallos_inyectados += int(falla)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock_stats:
+            return {
+                "requests": dict(self.requests),
+                "total": sum(self.requests.values()),
+                "fallos_inyectados": self.fallos_inyectados,
+                "filas": {t: len(f) for t, f in self.base.tablas.items()},
+                "objetos": sum(len(b) for b in self.base.objetos.values()),
+            }
+
+
+def iniciar(
+    puerto: int = 0,
+    latencia_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    fallos: float = 0.0,
+    migraciones: bool = True,
+    semilla: int = 1,
+    vacantes: int = 30,
+    candidatos: int = 5000,
+    postulaciones: int = 8000,
+    verboso: bool = False,
+    max_filas: int = 1000,
+) -> ServidorFalso:
+    """Siembra la base y levanta el servidor en un hilo. ``puerto=0`` elige uno libre."""
+    base = BaseFalsa(migraciones=migraciones, max_filas=max_filas)
+    base.sembrar(vacantes=vacantes, candidatos=candidatos, postulaciones=postulaciones, semilla=semilla)
+    servidor = ServidorFalso(("127.0.0.1", puerto), base, Config(latencia_ms, jitter_ms, fallos, semilla), verboso)
+    threading.Thread(target=servidor.serve_forever, name="fake-supabase", daemon=True).start()
+    return servidor
+
+
+def _servir_en_proceso(conexion: Any, opciones: Dict[str, Any]) -> None:
+    servidor = iniciar(**opciones)
+    conexion.send(servidor.url)
+    while True:
+        time.sleep(3600)
+
+
+class ProcesoFalso:
+    """El servidor falso en otro proceso: no compite por el GIL con la app medida.
+
+    Los contadores y la configuración se manejan por HTTP (``/_fake/...``).
+    """
+
+    def __init__(self, **opciones: Any) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        padre, hijo = ctx.Pipe()
+        self._proceso = ctx.Process(target=_servir_en_proceso, args=(hijo, opciones), name="fake-supabase", daemon=True)
+        self._proceso.start()
+        if not padre.poll(120):
+            self._proceso.terminate()
+            raise RuntimeError("fake_supabase no arrancó")
+        self.url: str = padre.recv()
+
+    def _control(self, ruta: str, cuerpo: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else None
+        req = urllib.request.Request(f"{self.url}/_fake/{ruta}", data=datos, method="POST" if datos is not None else "GET")
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return json.loads(resp.read())
+
+    def stats(self) -> Dict[str, Any]:
+        return self._control("stats")
+
+    def reiniciar_contadores(self) -> None:
+        self._control("reset", {})
+
+    def configurar(self, **cambios: float) -> Dict[str, Any]:
+        return self._control("config", cambios)
+
+    def detener(self) -> None:
+        self._proceso.terminate()
+        self._proceso.join(5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PostgREST/Storage falso para benchmarks")
+    parser.add_argument("--puerto", type=int, default=54321)
+    parser.add_argument("--latencia-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fallos", type=float, default=0.0, help="fracción de requests que responden 503")
+    parser.add_argument("--sin-migraciones", action="store_true", help="sin RPCs, vista ni estado_normalizado")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--vacantes", type=int, default=30)
+    parser.add_argument("--candidatos", type=int, default=5000)
+    parser.add_argument("--postulaciones", type=int, default=8000)
+    parser.add_argument("--max-filas", type=int, default=1000, help="tope de filas por lectura, como db-max-rows (0 = sin tope)")
+    parser.add_argument("--verboso", action="store_true")
+    args = parser.parse_args()
+
+    servidor = iniciar(
+        args.puerto, args.latencia_ms, args.jitter_ms, args.fallos, not args.sin_migraciones,
+        args.semilla, args.vacantes, args.candidatos, args.postulaciones, args.verboso, args.max_filas,
+    )
+    print(f"fake_supabase escuchando en {servidor.url} ({servidor.stats()['filas']})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Reportes de benchmark: percentiles, JSON y comparación contra una línea base.
+
+Formato (lo escriben ``carga.py`` y ``bench_micro.py``)::
+
+    {"meta": {"fecha": ..., "commit": ..., "python": ..., "parametros": {...}},
+     "escenarios": {"home": {"n": 812, "errores": 0, "rps": 40.5,
+                             "p50_ms": 18.2, "p95_ms": 41.0, "p99_ms": 60.3, ...}}}
+
+La comparación marca regresión si el p95 sube o el throughput baja más que
+``tolerancia`` (fracción), o si aparecen errores que la base no tenía.
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil con interpolación lineal (como numpy por defecto)."""
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    k = (len(orden) - 1) * p / 100
+    bajo, alto = math.floor(k), math.ceil(k)
+    if bajo == alto:
+        return orden[int(k)]
+    return orden[bajo] + (orden[alto] - orden[bajo]) * (k - bajo)
+
+
+def resumir(latencias_ms: List[float], errores: int, duracion_s: float, **extra: Any) -> Dict[str, Any]:
+    """Resumen de un escenario; ``latencias_ms`` incluye los requests con error."""
+    n = len(latencias_ms)
+    resumen = {
+        "n": n,
+        "errores": errores,
+        "tasa_error": round(errores / n, 4) if n else 0.0,
+        "rps": round(n / duracion_s, 2) if duracion_s > 0 else 0.0,
+        "media_ms": round(sum(latencias_ms) / n, 2) if n else 0.0,
+        "p50_ms": round(percentil(latencias_ms, 50), 2),
+        "p95_ms": round(percentil(latencias_ms, 95), 2),
+        "p99_ms": round(percentil(latencias_ms, 99), 2),
+        "max_ms": round(max(latencias_ms), 2) if n else 0.0,
+    }
+    resumen.update(extra)
+    return resumen
+
+
+def _commit() -> Optional[str]:
+    try:
+        raiz = os.path.join(os.path.dirname(__file__), "..")
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=raiz, stderr=subprocess.DEVNULL, timeout=5
+        ).decode().strip() or None
+    except Exception:
+        return None
+
+
+def nuevo_reporte(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "maquina": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)",
+            "parametros": parametros,
+        },
+        "escenarios": {},
+    }
+
+
+def guardar(path: str, reporte: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def cargar(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def imprimir(reporte: Dict[str, Any]) -> None:
+    print(f"{'escenario':28} {'n':>7} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for nombre, r in reporte["escenarios"].items():
+        print(
+            f"{nombre:28} {r['n']:>7} {r['errores']:>5} {r['rps']:>9.1f} "
+            f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}"
+        )
+
+
+def comparar(actual: Dict[str, Any], base: Dict[str, Any], tolerancia: float = 0.15) -> Tuple[List[str], List[str]]:
+    """Devuelve (líneas del informe, regresiones). Sólo compara escenarios presentes en ambos."""
+    lineas: List[str] = []
+    regresiones: List[str] = []
+    lineas.append(f"{'escenario':28} {'p95 base':>9} {'p95 hoy':>9} {'Δ p95':>8} {'rps base':>9} {'rps hoy':>9} {'Δ rps':>8}")
+    for nombre, hoy in actual["escenarios"].items():
+        antes = base.get("escenarios", {}).get(nombre)
+        if not antes:
+            lineas.append(f"{nombre:28} (sin línea base)")
+            continue
+        d_p95 = (hoy["p95_ms"] / antes["p95_ms"] - 1) if antes["p95_ms"] else 0.0
+        d_rps = (hoy["rps"] / antes["rps"] - 1) if antes["rps"] else 0.0
+        marca = ""
+        if d_p95 > tolerancia:
+            regresiones.append(f"{nombre}: p95 {antes['p95_ms']:.2f} -> {hoy['p95_ms']:.2f} ms (+{d_p95:.0%})")
+            marca = "  <-- p95"
+        if d_rps < -tolerancia:
+            regresiones.append(f"{nombre}: throughput {antes['rps']:.1f} -> {hoy['rps']:.1f} req/s ({d_rps:.0%})")
+            marca += "  <-- rps"
+        if hoy.get("errores", 0) and not antes.get("errores", 0):
+            regresiones.append(f"{nombre}: {hoy['errores']} errores (la base no tenía)")
+            marca += "  <-- errores"
+        lineas.append(
+            f"{nombre:28} {antes['p95_ms']:>9.2f} {hoy['p95_ms']:>9.2f} {d_p95:>+8.0%} "
+            f"{antes['rps']:>9.1f} {hoy['rps']:>9.1f} {d_rps:>+8.0%}{marca}"
+        )
+    return lineas, regresiones
+
+
+def cerrar(reporte: Dict[str, Any], salida: Optional[str], baseline: Optional[str], tolerancia: float) -> int:
+    """Imprime, guarda y compara. Devuelve el código de salida (1 si hay regresiones)."""
+    print()
+    imprimir(reporte)
+    if salida:
+        guardar(salida, reporte)
+        print(f"\nReporte guardado en {salida}")
+    if not baseline:
+        return 0
+    base = cargar(baseline)
+    lineas, regresiones = comparar(reporte, base, tolerancia)
+    print(f"\nContra {baseline} (commit {base.get('meta', {}).get('commit')}, tolerancia {tolerancia:.0%}):")
+    antes = base.get("meta", {}).get("parametros", {})
+    ahora = reporte["meta"]["parametros"]
+    # Elegir otro subconjunto de escenarios/casos no invalida la comparación
+    distintos = sorted(
+        k for k in set(antes) | set(ahora) if k not in {"escenarios", "casos"} and antes.get(k) != ahora.get(k)
+    )
+    if distintos:
+        print(f"Atención: parámetros distintos a la línea base ({', '.join(distintos)}); la comparación puede no ser válida.")
+    for linea in lineas:
+        print(linea)
+    if regresiones:
+        print("\nRegresiones:")
+        for r in regresiones:
+            print(f"  - {r}")
+        return 1
+    print("\nSin regresiones.")
+    return 0
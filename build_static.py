@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Build de assets estáticos: nombres con hash, variantes de los logos y CSS precomprimido.
+
+Escribe en ``static/dist/``:
+
+- una copia de cada CSS (``static/css/``) y de cada imagen de ``static/`` con
+  el hash del contenido en el nombre (``css/app.3f2a9c1b04.css``), que se
+  puede cachear para siempre: si el archivo cambia, cambia el nombre;
+- para los CSS, hermanos ``.gz`` (y ``.br`` si está instalado ``brotli``)
+  que Nginx sirve directo con ``gzip_static`` / ``brotli_static``;
+- para los logos de ``LOGOS``, versiones al tamaño en que se muestran (1x y
+  2x) en el formato original, WebP y AVIF (requiere ``Pillow``; AVIF además
+  Pillow >= 11.2 o ``pillow-avif-plugin``). Sin Pillow se copian los originales;
+- ``manifest.json``, que la app lee para armar las URLs (ver ``asset_url`` y
+  ``asset_imagen`` en app.py).
+
+Los archivos de builds anteriores se conservan (páginas ya cacheadas pueden
+seguir apuntándolos); ``--limpiar`` borra los que no están en el manifest nuevo.
+
+Uso:
+    python build_static.py [--sin-imagenes] [--limpiar]
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # opcional: sin él sólo se genera .gz
+    brotli = None  # type: ignore
+
+try:
+    from PIL import Image, features  # type: ignore
+except ImportError:  # opcional: sin Pillow no hay variantes de imágenes
+    Image = None  # type: ignore
+    features = None  # type: ignore
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DESTINO = "dist"
+LARGO_HASH = 10
+
+# Logos y alturas (px CSS) a las que los muestran los templates: h-20 = 80, h-56 = 224
+LOGOS: Dict[str, Tuple[int, ...]] = {
+    "logo-chico-removebg-preview.png": (80, 224),
+    "nexohr-logo.png": (60,),
+}
+EXTENSIONES_IMAGEN = (".png", ".jpg", ".jpeg", ".svg", ".webp", ".gif", ".ico")
+# Sólo vale la pena precomprimir texto; PNG/WebP/AVIF ya vienen comprimidos
+EXTENSIONES_TEXTO = (".css", ".js", ".svg")
+FORMATO_PIL = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP", "avif": "AVIF"}
+OPCIONES_FORMATO: Dict[str, Dict[str, Any]] = {
+    "png": {"optimize": True},
+    "jpeg": {"quality": 85, "optimize": True, "progressive": True},
+    "webp": {"quality": 85, "method": 4},
+    "avif": {"quality": 60},
+}
+
+
+def _hash(datos: bytes) -> str:
+    return hashlib.sha256(datos).hexdigest()[:LARGO_HASH]
+
+
+def _con_hash(ruta: str, datos: bytes, sufijo: str = "", ext: Optional[str] = None) -> str:
+    """``css/app.css`` -> ``dist/css/app.<hash>.css`` (ruta relativa a static/)."""
+    base, ext_original = os.path.splitext(ruta)
+    return f"{DESTINO}/{base}{sufijo}.{_hash(datos)}{ext or ext_original}"
+
+
+def minificar_css(css: str) -> str:
+    """Minificado conservador: comentarios, indentación y líneas vacías."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    lineas = (linea.strip() for linea in css.splitlines())
+    return "\n".join(linea for linea in lineas if linea) + "\n"
+
+
+def formatos_disponibles() -> List[str]:
+    """Formatos modernos que puede escribir el Pillow instalado."""
+    if Image is None:
+        return []
+    try:
+        import pillow_avif  # type: ignore  # noqa: F401  (registra AVIF en Pillow < 11.2)
+    except ImportError:
+        pass
+    Image.init()
+    formatos = []
+    if features.check("webp"):
+        formatos.append("webp")
+    if "AVIF" in Image.SAVE:
+        formatos.append("avif")
+    return formatos
+
+
+def _escribir(static_dir: str, ruta: str, datos: bytes, escritos: List[str]) -> None:
+    destino = os.path.join(static_dir, ruta)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    if not os.path.exists(destino):
+        # Escritura atómica: un worker nunca sirve un archivo a medias
+        tmp = destino + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(datos)
+        os.replace(tmp, destino)
+    escritos.append(ruta)
+    if ruta.endswith(EXTENSIONES_TEXTO):
+        comprimidos = [(".gz", gzip.compress(datos, 9, mtime=0))]
+        if brotli is not None:
+            comprimidos.append((".br", brotli.compress(datos, quality=11)))
+        for ext, contenido in comprimidos:
+            if len(contenido) < len(datos):
+                with open(destino + ext, "wb") as f:
+                    f.write(contenido)
+                escritos.append(ruta + ext)
+
+
+def _variantes(nombre: str, datos: bytes, alturas: Tuple[int, ...], formatos: List[str]) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """Redimensiona ``nombre`` a cada altura (1x y 2x, sin agrandar) en cada formato."""
+    original = Image.open(io.BytesIO(datos))
+    original.load()
+    formato_base = "jpeg" if original.format == "JPEG" else "png"
+    info: Dict[str, Any] = {"ancho": original.width, "alto": original.height, "variantes": []}
+    archivos: Dict[str, bytes] = {}
+    for alto in alturas:
+        hechos = set()
+        for escala in (1, 2):
+            alto_px = min(alto * escala, original.height)
+            if alto_px in hechos:
+                continue
+            hechos.add(alto_px)
+            ancho_px = max(1, round(original.width * alto_px / original.height))
+            imagen = original.resize((ancho_px, alto_px), Image.LANCZOS) if alto_px != original.height else original
+            for formato in [formato_base] + formatos:
+                salida = imagen.convert("RGB") if formato == "jpeg" and imagen.mode != "RGB" else imagen
+                buffer = io.BytesIO()
+                salida.save(buffer, FORMATO_PIL[formato], **OPCIONES_FORMATO[formato])
+                contenido = buffer.getvalue()
+                ext = ".jpg" if formato == "jpeg" else f".{formato}"
+                ruta = _con_hash(nombre, contenido, sufijo=f"-{alto_px}", ext=ext)
+                archivos[ruta] = contenido
+                info["variantes"].append({
+                    "alto": alto, "escala": escala, "formato": formato,
+                    "archivo": ruta, "ancho_px": ancho_px, "alto_px": alto_px, "bytes": len(contenido),
+                })
+    return info, archivos
+
+
+def construir(static_dir: str = STATIC_DIR, imagenes: bool = True, limpiar: bool = False) -> Dict[str, Any]:
+    """Genera ``dist/`` y ``dist/manifest.json`` dentro de ``static_dir``. Devuelve el manifest."""
+    manifest: Dict[str, Any] = {"version": 1, "archivos": {}, "imagenes": {}}
+    escritos: List[str] = []
+    fuentes: List[str] = []
+    css_dir = os.path.join(static_dir, "css")
+    if os.path.isdir(css_dir):
+        fuentes += [f"css/{n}" for n in sorted(os.listdir(css_dir)) if n.endswith(".css")]
+    fuentes += [
+        n for n in sorted(os.listdir(static_dir))
+        if n.lower().endswith(EXTENSIONES_IMAGEN) and os.path.getsize(os.path.join(static_dir, n)) > 0
+    ]
+    formatos = formatos_disponibles() if imagenes else []
+
+    for nombre in fuentes:
+        with open(os.path.join(static_dir, nombre), "rb") as f:
+            datos = f.read()
+        if nombre.endswith(".css"):
+            datos = minificar_css(datos.decode("utf-8")).encode("utf-8")
+        ruta = _con_hash(nombre, datos)
+        _escribir(static_dir, ruta, datos, escritos)
+        manifest["archivos"][nombre] = ruta
+        if imagenes and Image is not None and nombre in LOGOS:
+            info, archivos = _variantes(nombre, datos, LOGOS[nombre], formatos)
+            for ruta_variante, contenido in archivos.items():
+                _escribir(static_dir, ruta_variante, contenido, escritos)
+            manifest["imagenes"][nombre] = info
+
+    dist = os.path.join(static_dir, DESTINO)
+    os.makedirs(dist, exist_ok=True)
+    tmp = os.path.join(dist, "manifest.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, os.path.join(dist, "manifest.json"))
+
+    if limpiar:
+        vigentes = {os.path.normpath(os.path.join(static_dir, r)) for r in escritos}
+        for raiz, _, nombres in os.walk(dist):
+            for n in nombres:
+                ruta = os.path.normpath(os.path.join(raiz, n))
+                if n != "manifest.json" and ruta not in vigentes:
+                    os.remove(ruta)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--static", default=STATIC_DIR, help="directorio static/ (por defecto el del repo)")
+    parser.add_argument("--sin-imagenes", action="store_true", help="no generar variantes de los logos")
+    parser.add_argument("--limpiar", action="store_true", help="borrar de dist/ lo que no está en este build")
+    args = parser.parse_args()
+
+    if Image is None and not args.sin_imagenes:
+        print("Pillow no está instalado: se copian los logos sin variantes (pip install Pillow)")
+    if brotli is None:
+        print("brotli no está instalado: sólo se generan .gz (pip install brotli)")
+    manifest = construir(args.static, imagenes=not args.sin_imagenes, limpiar=args.limpiar)
+    for nombre, ruta in manifest["archivos"].items():
+        tam = os.path.getsize(os.path.join(args.static, ruta))
+        print(f"{nombre:36} -> {ruta} ({tam / 1024:.1f} KB)")
+    for nombre, info in manifest["imagenes"].items():
+        for v in info["variantes"]:
+            print(f"  {nombre} {v['alto']}px @{v['escala']}x {v['formato']:5} {v['ancho_px']}x{v['alto_px']} ({v['bytes'] / 1024:.1f} KB)")
+    print(f"\nManifest: {os.path.join(args.static, DESTINO, 'manifest.json')}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
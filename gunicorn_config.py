@@ -0,0 +1,50 @@
+# Gunicorn configuration file
+import multiprocessing
+import os
+
+# Server socket
+bind = f"127.0.0.1:{os.getenv('PORT', '5001')}"
+backlog = 2048
+
+# Worker processes
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = 'sync'
+worker_connections = 1000
+timeout = 120
+keepalive = 5
+
+# Logging
+accesslog = '/var/log/postulaciones/access.log'
+errorlog = '/var/log/postulaciones/error.log'
+loglevel = 'info'
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+
+# Process naming
+proc_name = 'postulaciones-app'
+
+# Server mechanics
+daemon = False
+pidfile = '/tmp/postulaciones.pid'
+umask = 0
+user = None
+group = None
+tmp_upload_dir = None
+
+# Security
+limit_request_line = 4094
+limit_request_fields = 100
+limit_request_field_size = 8190
+
+
+# Server hooks
+def post_fork(server, worker):
+    # Cada worker crea su propio cliente Supabase, abre las conexiones y carga
+    # los catálogos antes de aceptar requests (tope: SUPABASE_WARMUP_TIMEOUT).
+    from app import calentar_worker, registrar_latido_worker
+
+    # Respuestas en streaming largas (exportaciones) mantienen vivo al worker
+    registrar_latido_worker(worker.notify)
+    if calentar_worker():
+        server.log.info("Worker %s: Supabase calentado", worker.pid)
+    else:
+        server.log.warning("Worker %s: Supabase sin calentar, se reintenta en los requests", worker.pid)
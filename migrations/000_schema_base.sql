@@ -0,0 +1,68 @@
+-- ========================================
+-- Esquema base del sistema de postulaciones
+-- ========================================
+-- Tablas que usa app.py, tal como están en Supabase. Todo es
+-- "if not exists": sobre una base existente no cambia nada y sirve para
+-- levantar una base local desde cero (desarrollo, test_explain_planes.py).
+--
+-- Orden de aplicación: 000 -> 001 -> 002 -> 003 (ver migrations/README.md).
+
+create extension if not exists pgcrypto;
+
+-- Catálogos (se leen completos y se cachean en la app)
+create table if not exists public.localidades (
+    id      bigserial primary key,
+    nombre  text not null unique
+);
+
+create table if not exists public.areas (
+    id      bigserial primary key,
+    nombre  text not null unique
+);
+
+create table if not exists public.areas_preferencia (
+    id      bigserial primary key,
+    nombre  text not null unique
+);
+
+create table if not exists public.vacantes (
+    id          bigserial primary key,
+    created_at  timestamptz not null default now(),
+    titulo      text not null,
+    -- Nombre del área (datos viejos pueden tener el id del catálogo como texto)
+    area        text,
+    descripcion text,
+    estado      text not null default 'abierta'
+);
+
+create table if not exists public.candidatos (
+    id                  uuid primary key default gen_random_uuid(),
+    created_at          timestamptz not null default now(),
+    nombre_apellido     text,
+    -- Upsert por DNI (registrar_postulacion / on_conflict=dni)
+    dni                 text not null unique,
+    edad                int,
+    area_preferencia    text,
+    licencia_conducir   boolean not null default false,
+    movilidad_propia    boolean not null default false,
+    disponibilidad      text,
+    celular             text,
+    mail                text,
+    localidad           text,
+    cv_url              text,
+    familiar_en_clinica boolean not null default false,
+    fuente_postulacion  text
+);
+
+create table if not exists public.postulaciones (
+    id                bigserial primary key,
+    created_at        timestamptz not null default now(),
+    candidato_id      uuid not null references public.candidatos(id) on delete cascade,
+    vacante_id        bigint references public.vacantes(id) on delete set null,
+    -- Datos viejos mezclan 'recibido' / 'Recibido': se filtra sin distinguir mayúsculas
+    estado            text not null default 'recibido',
+    tipo              text not null default 'general',
+    entrevistado_por  text,
+    observaciones     text,
+    calificacion      smallint check (calificacion between 1 and 10)
+);
@@ -0,0 +1,82 @@
+-- ========================================
+-- registrar_postulacion: candidato + postulación en una sola transacción
+-- ========================================
+-- Upsert del candidato por DNI e insert de la postulación. Al ser una única
+-- función, PostgREST la ejecuta en una transacción: si falla la postulación
+-- no queda un candidato huérfano.
+--
+-- Requiere UNIQUE (dni) en candidatos.
+--
+-- Uso desde la app:
+--   supabase.rpc("registrar_postulacion", {"p_candidato": {...}, "p_vacante_id": 12})
+-- Devuelve: {"candidato_id": ..., "postulacion_id": ...}
+
+create or replace function public.registrar_postulacion(
+    p_candidato jsonb,
+    p_vacante_id bigint default null
+)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_candidato_id  candidatos.id%type;
+    v_postulacion_id postulaciones.id%type;
+begin
+    if coalesce(p_candidato->>'dni', '') = '' then
+        raise exception 'registrar_postulacion: falta dni' using errcode = '22023';
+    end if;
+
+    insert into candidatos (
+        nombre_apellido, dni, edad, area_preferencia, licencia_conducir,
+        movilidad_propia, disponibilidad, celular, mail, localidad, cv_url,
+        familiar_en_clinica, fuente_postulacion
+    )
+    values (
+        p_candidato->>'nombre_apellido',
+        p_candidato->>'dni',
+        nullif(p_candidato->>'edad', '')::int,
+        p_candidato->>'area_preferencia',
+        coalesce((p_candidato->>'licencia_conducir')::boolean, false),
+        coalesce((p_candidato->>'movilidad_propia')::boolean, false),
+        p_candidato->>'disponibilidad',
+        p_candidato->>'celular',
+        p_candidato->>'mail',
+        p_candidato->>'localidad',
+        p_candidato->>'cv_url',
+        coalesce((p_candidato->>'familiar_en_clinica')::boolean, false),
+        p_candidato->>'fuente_postulacion'
+    )
+    on conflict (dni) do update set
+        nombre_apellido     = excluded.nombre_apellido,
+        edad                = excluded.edad,
+        area_preferencia    = excluded.area_preferencia,
+        licencia_conducir   = excluded.licencia_conducir,
+        movilidad_propia    = excluded.movilidad_propia,
+        disponibilidad      = excluded.disponibilidad,
+        celular             = excluded.celular,
+        mail                = excluded.mail,
+        localidad           = excluded.localidad,
+        cv_url              = excluded.cv_url,
+        familiar_en_clinica = excluded.familiar_en_clinica,
+        fuente_postulacion  = excluded.fuente_postulacion
+    returning id into v_candidato_id;
+
+    insert into postulaciones (candidato_id, vacante_id, estado, tipo)
+    values (
+        v_candidato_id,
+        p_vacante_id,
+        'recibido',
+        case when p_vacante_id is null then 'general' else 'vacante' end
+    )
+    returning id into v_postulacion_id;
+
+    return jsonb_build_object(
+        'candidato_id', v_candidato_id,
+        'postulacion_id', v_postulacion_id
+    );
+end;
+$$;
+
+grant execute on function public.registrar_postulacion(jsonb, bigint) to anon, authenticated, service_role;
@@ -0,0 +1,185 @@
+-- ========================================
+-- Búsqueda de postulaciones: texto libre + facetas
+-- ========================================
+-- Agrega a candidatos una columna de búsqueda normalizada (minúsculas, sin
+-- acentos) con índice trigram, la vista postulaciones_busqueda (postulación +
+-- candidato + vacante aplanados, filtrable entera del lado del servidor) y la
+-- RPC facetas_postulaciones para los conteos por área, localidad,
+-- disponibilidad y estado.
+--
+-- Uso desde la app:
+--   supabase.table("postulaciones_busqueda").select("*").like("c_busqueda", "*maria*")...
+--   supabase.rpc("facetas_postulaciones", {"p_filtros": {...}})
+-- Sin esta migración la app busca con ilike acotado (BUSQUEDA_SIN_VISTA_MAX) y
+-- no muestra facetas.
+
+create extension if not exists pg_trgm;
+create extension if not exists unaccent;
+
+-- unaccent() es STABLE; para usarlo en una columna generada / índice hace
+-- falta un wrapper IMMUTABLE que fije el diccionario.
+create or replace function public.f_unaccent(text)
+returns text
+language sql
+immutable
+parallel safe
+strict
+set search_path = public
+as $$
+    select public.unaccent('public.unaccent'::regdictionary, $1)
+$$;
+
+alter table public.candidatos
+    add column if not exists busqueda text
+    generated always as (
+        public.f_unaccent(lower(
+            coalesce(nombre_apellido, '') || ' ' ||
+            coalesce(dni, '') || ' ' ||
+            coalesce(mail, '') || ' ' ||
+            coalesce(celular, '')
+        ))
+    ) stored;
+
+-- LIKE '%texto%' sobre nombre/DNI/mail/celular
+create index if not exists candidatos_busqueda_trgm
+    on public.candidatos using gin (busqueda gin_trgm_ops);
+-- LIKE 'prefijo%' sobre DNI (la UNIQUE usa la collation y no sirve para LIKE)
+create index if not exists candidatos_dni_prefijo
+    on public.candidatos (dni text_pattern_ops);
+-- Join postulaciones -> candidato y orden del listado (keyset)
+create index if not exists postulaciones_candidato_id
+    on public.postulaciones (candidato_id);
+create index if not exists postulaciones_created_at_id
+    on public.postulaciones (created_at desc, id desc);
+
+
+-- Las columnas del candidato van con prefijo c_ para poder reusar los mismos
+-- filtros de la app (prefijo="c_"). area_texto une el área de preferencia y
+-- el área de la vacante para el filtro "área" (OR) en una sola columna.
+create or replace view public.postulaciones_busqueda
+with (security_invoker = true)
+as
+select
+    p.*,
+    c.nombre_apellido     as c_nombre_apellido,
+    c.dni                 as c_dni,
+    c.mail                as c_mail,
+    c.celular             as c_celular,
+    c.edad                as c_edad,
+    c.area_preferencia    as c_area_preferencia,
+    c.localidad           as c_localidad,
+    c.disponibilidad      as c_disponibilidad,
+    c.movilidad_propia    as c_movilidad_propia,
+    c.licencia_conducir   as c_licencia_conducir,
+    c.cv_url              as c_cv_url,
+    c.created_at          as c_created_at,
+    c.busqueda            as c_busqueda,
+    v.titulo              as v_titulo,
+    v.area                as v_area,
+    coalesce(c.area_preferencia::text, '') || ' | ' || coalesce(v.area::text, '') as area_texto
+from public.postulaciones p
+join public.candidatos c on c.id = p.candidato_id
+left join public.vacantes v on v.id = p.vacante_id;
+
+
+-- Conteos por faceta. Cada faceta se cuenta con todos los filtros salvo el
+-- propio, así el selector muestra cuántos resultados daría cada opción.
+--
+-- p_filtros: {"tokens": ["maria", "gonz"], "dni_prefijo": "301",
+--             "estado": "", "vacante_id": "", "area": "", "area_preferencia": "",
+--             "localidad": "", "disponibilidad": "", "movilidad": "Sí",
+--             "licencia": "", "edad_min": "", "edad_max": ""}
+-- Devuelve: {"area_preferencia": [{"valor": ..., "n": ...}], "localidad": [...],
+--            "disponibilidad": [...], "estado": [...]}
+create or replace function public.facetas_postulaciones(p_filtros jsonb default '{}'::jsonb)
+returns jsonb
+language plpgsql
+stable
+security invoker
+set search_path = public
+as $$
+declare
+    v_conds   text[] := '{}';
+    v_claves  text[] := '{}';
+    v_token   text;
+    v_valor   text;
+    v_faceta  text;
+    v_columna text;
+    v_where   text;
+    v_res     jsonb := '{}'::jsonb;
+    v_items   jsonb;
+    i         int;
+begin
+    -- Condiciones (SQL ya citado con format) y a qué faceta pertenecen
+    for v_token in select jsonb_array_elements_text(coalesce(p_filtros->'tokens', '[]'::jsonb)) loop
+        v_conds := v_conds || format('c_busqueda like %L', '%' || v_token || '%');
+        v_claves := v_claves || ''::text;
+    end loop;
+    v_valor := nullif(p_filtros->>'dni_prefijo', '');
+    if v_valor is not null then
+        v_conds := v_conds || format('c_dni like %L', v_valor || '%');
+        v_claves := v_claves || ''::text;
+    end if;
+    v_valor := nullif(p_filtros->>'estado', '');
+    if v_valor is not null then
+        v_conds := v_conds || format('estado ilike %L', v_valor);
+        v_claves := v_claves || 'estado'::text;
+    end if;
+    v_valor := nullif(p_filtros->>'vacante_id', '');
+    if v_valor is not null then
+        v_conds := v_conds || format('vacante_id = %L::bigint', v_valor);
+        v_claves := v_claves || ''::text;
+    end if;
+    v_valor := nullif(p_filtros->>'area', '');
+    if v_valor is not null then
+        v_conds := v_conds || format('area_texto ilike %L', '%' || v_valor || '%');
+        v_claves := v_claves || ''::text;
+    end if;
+    foreach v_faceta in array array['area_preferencia', 'localidad', 'disponibilidad'] loop
+        v_valor := nullif(p_filtros->>v_faceta, '');
+        if v_valor is not null then
+            v_conds := v_conds || format('%I = %L', 'c_' || v_faceta, v_valor);
+            v_claves := v_claves || v_faceta;
+        end if;
+    end loop;
+    if p_filtros->>'movilidad' in ('Sí', 'No') then
+        v_conds := v_conds || format('c_movilidad_propia = %L', p_filtros->>'movilidad' = 'Sí');
+        v_claves := v_claves || ''::text;
+    end if;
+    if p_filtros->>'licencia' in ('Sí', 'No') then
+        v_conds := v_conds || format('c_licencia_conducir = %L', p_filtros->>'licencia' = 'Sí');
+        v_claves := v_claves || ''::text;
+    end if;
+    if coalesce(p_filtros->>'edad_min', '') ~ '^\d+$' then
+        v_conds := v_conds || format('c_edad >= %s', (p_filtros->>'edad_min')::int);
+        v_claves := v_claves || ''::text;
+    end if;
+    if coalesce(p_filtros->>'edad_max', '') ~ '^\d+$' then
+        v_conds := v_conds || format('c_edad <= %s', (p_filtros->>'edad_max')::int);
+        v_claves := v_claves || ''::text;
+    end if;
+
+    foreach v_faceta in array array['area_preferencia', 'localidad', 'disponibilidad', 'estado'] loop
+        v_columna := case when v_faceta = 'estado' then 'estado' else 'c_' || v_faceta end;
+        v_where := 'true';
+        for i in 1 .. coalesce(array_length(v_conds, 1), 0) loop
+            if v_claves[i] <> v_faceta then
+                v_where := v_where || ' and ' || v_conds[i];
+            end if;
+        end loop;
+        execute format(
+            'select coalesce(jsonb_agg(jsonb_build_object(''valor'', valor, ''n'', n) order by n desc, valor), ''[]''::jsonb)
+               from (select %1$I::text as valor, count(*) as n
+                       from public.postulaciones_busqueda
+                      where %2$s and %1$I is not null
+                      group by 1) t',
+            v_columna, v_where
+        ) into v_items;
+        v_res := v_res || jsonb_build_object(v_faceta, v_items);
+    end loop;
+    return v_res;
+end;
+$$;
+
+grant select on public.postulaciones_busqueda to authenticated, service_role;
+grant execute on function public.facetas_postulaciones(jsonb) to authenticated, service_role;
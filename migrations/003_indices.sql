@@ -0,0 +1,106 @@
+-- ========================================
+-- Índices para cada forma de consulta de app.py
+-- ========================================
+-- Cada índice indica qué consulta lo usa. test_explain_planes.py verifica
+-- con EXPLAIN contra un Postgres local que ninguna de esas consultas haga
+-- Seq Scan ni ordene en memoria el listado completo.
+--
+-- Quedan fuera a propósito las lecturas completas que la app cachea
+-- (localidades, areas, areas_preferencia, vacantes_opciones) y la RPC
+-- facetas_postulaciones, que agrega sobre el resultado filtrado.
+--
+-- En producción conviene crear cada índice con CREATE INDEX CONCURRENTLY
+-- fuera de una transacción si las tablas ya son grandes.
+
+create extension if not exists pg_trgm;
+
+
+-- ---------- candidatos ----------
+-- admin_candidatos: orden por (created_at, id) con cursor keyset
+create index if not exists candidatos_created_at_id
+    on public.candidatos (created_at desc, id desc);
+-- admin_candidatos?disponibilidad=...
+create index if not exists candidatos_disponibilidad_created_at
+    on public.candidatos (disponibilidad, created_at desc, id desc);
+-- Filtros de candidato en admin_postulaciones (join en memoria: select id where ...)
+create index if not exists candidatos_area_preferencia
+    on public.candidatos (area_preferencia);
+create index if not exists candidatos_localidad_area
+    on public.candidatos (localidad, area_preferencia);
+create index if not exists candidatos_edad
+    on public.candidatos (edad);
+-- Booleanos: sólo vale la pena indexar el lado "true" (el minoritario)
+create index if not exists candidatos_movilidad_propia
+    on public.candidatos (created_at desc) where movilidad_propia;
+create index if not exists candidatos_licencia_conducir
+    on public.candidatos (created_at desc) where licencia_conducir;
+
+
+-- ---------- postulaciones ----------
+-- Filtro de estado sin distinguir mayúsculas. PostgREST no puede filtrar por
+-- una expresión, así que se expone lower(estado) como campo calculado
+-- (estado_normalizado): PostgREST inlinea la función y el planner usa el
+-- índice de expresión.
+create or replace function public.estado_normalizado(public.postulaciones)
+returns text
+language sql
+immutable
+parallel safe
+as $$
+    select lower($1.estado)
+$$;
+
+create index if not exists postulaciones_estado_created_at
+    on public.postulaciones (lower(estado), created_at desc, id desc);
+-- admin_postulaciones?vacante_id=...
+create index if not exists postulaciones_vacante_created_at
+    on public.postulaciones (vacante_id, created_at desc, id desc);
+-- (created_at, id) y candidato_id ya los crea 002_busqueda_postulaciones.sql
+
+-- La vista de búsqueda expone la misma expresión como columna
+create or replace view public.postulaciones_busqueda
+with (security_invoker = true)
+as
+select
+    p.*,
+    c.nombre_apellido     as c_nombre_apellido,
+    c.dni                 as c_dni,
+    c.mail                as c_mail,
+    c.celular             as c_celular,
+    c.edad                as c_edad,
+    c.area_preferencia    as c_area_preferencia,
+    c.localidad           as c_localidad,
+    c.disponibilidad      as c_disponibilidad,
+    c.movilidad_propia    as c_movilidad_propia,
+    c.licencia_conducir   as c_licencia_conducir,
+    c.cv_url              as c_cv_url,
+    c.created_at          as c_created_at,
+    c.busqueda            as c_busqueda,
+    v.titulo              as v_titulo,
+    v.area                as v_area,
+    coalesce(c.area_preferencia::text, '') || ' | ' || coalesce(v.area::text, '') as area_texto,
+    lower(p.estado)       as estado_normalizado
+from public.postulaciones p
+join public.candidatos c on c.id = p.candidato_id
+left join public.vacantes v on v.id = p.vacante_id;
+
+
+-- ---------- vacantes ----------
+-- home: eq("estado", "abierta")
+create index if not exists vacantes_abiertas
+    on public.vacantes (created_at desc, id desc) where estado = 'abierta';
+-- admin_vacantes: listado y filtro por estado con cursor keyset
+create index if not exists vacantes_created_at_id
+    on public.vacantes (created_at desc, id desc);
+create index if not exists vacantes_estado_created_at
+    on public.vacantes (estado, created_at desc, id desc);
+-- admin_vacantes: ilike('%texto%') sobre título y área
+create index if not exists vacantes_titulo_trgm
+    on public.vacantes using gin (titulo gin_trgm_ops);
+create index if not exists vacantes_area_trgm
+    on public.vacantes using gin (area gin_trgm_ops);
+
+
+analyze public.candidatos;
+analyze public.postulaciones;
+analyze public.vacantes;
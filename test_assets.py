@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Prueba del build de assets (build_static.py) y de su integración con Flask.
+
+Construye sobre una copia temporal de static/ y verifica nombres con hash,
+precompresión, que el build sea reproducible, la limpieza de archivos viejos,
+las URLs que arman los templates y los headers de caché. Las variantes de los
+logos se prueban sólo si Pillow está instalado.
+
+Uso:
+    python test_assets.py
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+_static = os.path.join(tempfile.mkdtemp(), "static")
+shutil.copytree(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"), _static)
+os.environ["STATIC_MANIFEST"] = os.path.join(_static, "dist", "manifest.json")
+os.environ["LOCAL_DB_PATH"] = os.path.join(os.path.dirname(_static), "local.sqlite3")
+os.environ["PAGE_CACHE_TTL"] = "0"
+
+import build_static  # noqa: E402
+from app import app, asset_url  # noqa: E402
+
+app.static_folder = _static
+fallos = 0
+
+
+def check(cond: bool, msg: str) -> None:
+    global fallos
+    print(("✅ " if cond else "❌ ") + msg)
+    if not cond:
+        fallos += 1
+
+
+def leer(ruta: str) -> bytes:
+    with open(os.path.join(_static, ruta), "rb") as f:
+        return f.read()
+
+
+def probar_build() -> None:
+    print("\n— build")
+    manifest = build_static.construir(_static)
+    css = manifest["archivos"].get("css/app.css", "")
+    datos = leer(css)
+    check(re.fullmatch(r"dist/css/app\.[0-9a-f]{10}\.css", css) is not None, f"css/app.css -> {css}")
+    check(hashlib.sha256(datos).hexdigest()[:10] in css, "el hash es el del contenido")
+    check(gzip.decompress(leer(css + ".gz")) == datos, "hermano .gz con el mismo contenido")
+    check("logo_sin_fondo.jpg" not in manifest["archivos"], "archivos vacíos se ignoran")
+
+    viejo = os.path.join(_static, "dist", "css", "app.0000000000.css")
+    with open(viejo, "w") as f:
+        f.write("body{}")
+    check(build_static.construir(_static) == manifest, "build reproducible (mismo manifest)")
+    check(os.path.exists(viejo), "sin --limpiar se conservan los builds anteriores")
+    build_static.construir(_static, limpiar=True)
+    check(not os.path.exists(viejo) and os.path.exists(os.path.join(_static, css)), "--limpiar borra sólo lo viejo")
+
+
+def probar_flask() -> None:
+    print("\n— flask")
+    cliente = app.test_client()
+    html = cliente.get("/").get_data(as_text=True)
+    check(re.search(r'href="/static/dist/css/app\.[0-9a-f]{10}\.css"', html) is not None, "base.html usa el CSS con hash")
+    check("<style>" not in html, "sin CSS inline")
+    with app.test_request_context():
+        check(asset_url("no-existe.png") == "/static/no-existe.png", "sin entrada en el manifest: archivo original")
+        css = asset_url("css/app.css")
+
+    resp = cliente.get(css)
+    check(resp.status_code == 200 and "immutable" in resp.headers.get("Cache-Control", ""), "dist/ con caché inmutable")
+    resp.close()
+    resp = cliente.get("/static/css/app.css")
+    check("immutable" not in resp.headers.get("Cache-Control", ""), "fuera de dist/ sin caché inmutable")
+    resp.close()
+
+    if build_static.Image is None:
+        print("⚠️  Pillow no está instalado; se omiten las variantes de los logos")
+        return
+    formatos = build_static.formatos_disponibles()
+    logo = re.search(r"<picture>(.*?)</picture>", html, re.S)
+    check(logo is not None and 'width="341" height="224"' in logo.group(1), "logo de la home al tamaño en que se muestra")
+    for formato in formatos:
+        check(f'type="image/{formato}"' in logo.group(1), f"fuente {formato} en el <picture>")
+    check(re.search(r'srcset="[^"]+ 1x, [^"]+ 2x"', logo.group(1)) is not None, "srcset 1x/2x")
+
+
+if __name__ == "__main__":
+    probar_build()
+    probar_flask()
+
+    print("\n🎉 Todo OK" if not fallos else f"\n❌ {fallos} fallo(s)")
+    sys.exit(1 if fallos else 0)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Prueba de los backends de caché compartida (SQLite y Redis).
+
+Verifica lectura/escritura, invalidación por clave y por prefijo, que una
+invalidación hecha en un proceso se vea en otro (como entre workers de
+gunicorn) y que los snapshots de métricas no se mezclen con la caché. El backend SQLite usa un archivo temporal; Redis se prueba solo si
+responde en REDIS_URL, usando un prefijo propio que se borra al final.
+
+Uso:
+    python test_cache_backend.py
+    REDIS_URL=redis://localhost:6379/15 python test_cache_backend.py
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import app as app_module  # noqa: E402
+from app import CatalogCache, RedisBackend, SQLiteBackend  # noqa: E402
+
+fallos = 0
+
+
+def check(cond: bool, msg: str) -> None:
+    global fallos
+    print(("✅ " if cond else "❌ ") + msg)
+    if not cond:
+        fallos += 1
+
+
+def _invalidar_en_otro_proceso(fabrica, args) -> None:
+    # Simula el POST de admin en otro worker
+    CatalogCache(300, 0, fabrica(*args)).invalidate("vacantes_abiertas", "vacante:")
+
+
+def probar(nombre: str, fabrica, args) -> None:
+    print(f"\n— {nombre}")
+    backend = fabrica(*args)
+    cache = CatalogCache(300, 0, backend)
+    cache.invalidate()
+
+    cargas = []
+
+    def loader():
+        cargas.append(1)
+        return [{"id": 1, "titulo": "Enfermero/a", "area": 3}]
+
+    v1 = cache.get("vacantes_abiertas", loader)
+    v2 = cache.get("vacantes_abiertas", loader)
+    check(v1 == v2 and len(cargas) == 1, "segundo get sale de la caché")
+    check(v1 is v2, "hit devuelve el mismo objeto (memo local)")
+
+    otro = CatalogCache(300, 0, fabrica(*args))
+    check(otro.get("vacantes_abiertas", loader) == v1 and len(cargas) == 1, "otra instancia ve el valor cargado")
+
+    cache.set("vacante:1", {"id": 1})
+    cache.set("vacante:2", {"id": 2})
+    cache.set("areas", [{"id": 3, "nombre": "Enfermería"}])
+    proc = multiprocessing.Process(target=_invalidar_en_otro_proceso, args=(fabrica, args))
+    proc.start()
+    proc.join(10)
+    check(proc.exitcode == 0, "invalidación desde otro proceso")
+    check(backend.leer("vacantes_abiertas") is None, "clave invalidada en el otro proceso")
+    check(backend.leer("vacante:1") is None and backend.leer("vacante:2") is None, "prefijo 'vacante:' invalidado")
+    check(backend.leer("areas") is not None, "claves no relacionadas se conservan")
+
+    cache.get("vacantes_abiertas", loader)
+    check(len(cargas) == 2, "después de invalidar se vuelve a cargar")
+    cache.invalidate()
+    check(backend.claves() == [], "invalidate() sin claves limpia todo")
+
+
+def probar_metricas(path: str) -> None:
+    print("\n— métricas (SQLite)")
+    cache = SQLiteBackend(path)
+    app_module._metricas_backend = SQLiteBackend(path, tabla="metricas")
+    app_module._metricas_backend.escribir("otro-host:1", app_module.metricas.snapshot(), time.time())
+    app_module._metricas_backend.escribir("otro-host:2", app_module.metricas.snapshot(), time.time() - 3600)
+    CatalogCache(300, 0, cache).invalidate()
+
+    claves = app_module._metricas_backend.claves()
+    check("otro-host:1" in claves, "invalidate() de la caché no borra los snapshots")
+    texto = app_module.exponer_metricas()
+    check(app_module._id_worker() in app_module._metricas_backend.claves(), "snapshot propio con clave host:pid")
+    check("postulaciones_metricas_workers 2\n" in texto, "se suman el propio y el vigente, no el vencido")
+    check("otro-host:2" not in app_module._metricas_backend.claves(), "el snapshot vencido se borra")
+    check(cache.claves() == [], "los snapshots no aparecen en la caché")
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    probar("SQLite", SQLiteBackend, (path,))
+    probar_metricas(path)
+
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/15")
+    try:
+        RedisBackend(redis_url)
+    except Exception as e:
+        print(f"\n⚠️  Redis no disponible en {redis_url} ({e}); se omite")
+    else:
+        probar("Redis", RedisBackend, (redis_url, f"test:{uuid.uuid4().hex}:"))
+
+    print("\n🎉 Todo OK" if not fallos else f"\n❌ {fallos} fallo(s)")
+    sys.exit(1 if fallos else 0)
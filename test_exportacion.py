@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Prueba de la exportación de postulaciones contra el Supabase falso.
+
+El servidor falso corta cada lectura en 1000 filas, como ``db-max-rows`` de
+PostgREST por defecto: la exportación tiene que traer todas las filas aunque
+sean más que eso, en CSV y NDJSON. Requiere el paquete ``supabase``.
+
+Uso:
+    python test_exportacion.py
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+POSTULACIONES = 2500
+fallos = 0
+
+
+def check(cond: bool, msg: str) -> None:
+    global fallos
+    print(("✅ " if cond else "❌ ") + msg)
+    if not cond:
+        fallos += 1
+
+
+def cliente_admin(app):
+    cliente = app.test_client()
+    with cliente.session_transaction() as s:
+        s["is_admin"] = True
+    return cliente
+
+
+def exportar(cliente, formato: str) -> str:
+    resp = cliente.get(f"/admin/postulaciones/exportar?formato={formato}")
+    cuerpo = resp.get_data(as_text=True)
+    resp.close()
+    return cuerpo
+
+
+def probar(app_module) -> None:
+    print("\n— exportación con tope de 1000 filas por lectura")
+    check(app_module.EXPORT_LOTE + 1 <= 1000, f"EXPORT_LOTE + 1 ({app_module.EXPORT_LOTE + 1}) entra en db-max-rows")
+    cliente = cliente_admin(app_module.app)
+
+    filas = list(csv.reader(io.StringIO(exportar(cliente, "csv").lstrip("\ufeff"))))
+    check(len(filas) - 1 == POSTULACIONES, f"CSV: {len(filas) - 1} de {POSTULACIONES} filas")
+
+    lineas = [json.loads(linea) for linea in exportar(cliente, "ndjson").splitlines() if linea]
+    check(len(lineas) == POSTULACIONES, f"NDJSON: {len(lineas)} de {POSTULACIONES} filas")
+    check(len({linea["postulacion_id"] for linea in lineas}) == POSTULACIONES, "NDJSON: sin filas repetidas")
+
+
+if __name__ == "__main__":
+    try:
+        import supabase  # type: ignore  # noqa: F401
+    except ImportError:
+        print("⚠️  supabase no está instalado; se omite")
+        sys.exit(0)
+
+    import fake_supabase  # noqa: E402
+
+    servidor = fake_supabase.iniciar(candidatos=1500, postulaciones=POSTULACIONES, max_filas=1000)
+    os.environ["SUPABASE_URL"] = servidor.url
+    os.environ["SUPABASE_KEY"] = fake_supabase.CLAVE_FALSA
+    os.environ["LOCAL_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "local.sqlite3")
+    os.environ.setdefault("TURNSTILE_ENABLED", "false")
+    import app as app_module  # noqa: E402
+
+    if app_module.asegurar_supabase() is None:
+        print(f"❌ No se pudo crear el cliente Supabase: {app_module.supabase_manager.ultimo_error}")
+        sys.exit(1)
+    probar(app_module)
+    servidor.shutdown()
+
+    print("\n🎉 Todo OK" if not fallos else f"\n❌ {fallos} fallo(s)")
+    sys.exit(1 if fallos else 0)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Prueba de los repositorios contra las fuentes en memoria y SQLite.
+
+Los mismos datos se cargan en una FuenteMemoria y en un AlmacenLocal
+temporal; cada consulta de los repositorios tiene que devolver lo mismo en
+ambas: proyección (sólo las columnas de la vista), filtros, paginación por
+cursor y búsqueda por lotes de ids. No necesita Supabase.
+
+Uso:
+    python test_repositorios.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import app as app_module  # noqa: E402
+from app import (  # noqa: E402
+    AlmacenLocal,
+    CandidatoRepo,
+    Cursor,
+    FuenteMemoria,
+    FuenteSQLite,
+    VacanteRepo,
+    paginar_keyset,
+)
+
+fallos = 0
+
+
+def check(cond: bool, msg: str) -> None:
+    global fallos
+    print(("✅ " if cond else "❌ ") + msg)
+    if not cond:
+        fallos += 1
+
+
+def datos():
+    vacantes = [
+        {
+            "id": i,
+            "created_at": f"2024-01-{i:02d}T10:00:00+00:00",
+            "titulo": f"Vacante {i}",
+            "area": "Enfermería" if i % 2 else "Cocina",
+            "descripcion": "…",
+            "estado": "abierta" if i % 3 else "cerrada",
+        }
+        for i in range(1, 26)
+    ]
+    candidatos = [
+        {
+            "nombre_apellido": f"Persona {i}",
+            "dni": f"{30000000 + i}",
+            "edad": 20 + i % 40,
+            "area_preferencia": "Cocina",
+            "licencia_conducir": bool(i % 2),
+            "movilidad_propia": False,
+            "disponibilidad": "Full time" if i % 4 else "Part time",
+            "celular": "261",
+            "mail": f"p{i}@mail.com",
+            "localidad": "Capital",
+            "cv_url": None,
+            "familiar_en_clinica": False,
+            "fuente_postulacion": "web",
+        }
+        for i in range(450)
+    ]
+    return vacantes, candidatos
+
+
+def fuentes():
+    vacantes, candidatos = datos()
+    almacen = AlmacenLocal(os.path.join(tempfile.mkdtemp(), "local.sqlite3"))
+    almacen.espejar_vacantes(vacantes)
+    for c in candidatos:
+        almacen.registrar(c, None, None, "test")
+    # Misma información en memoria, con los ids y fechas que asignó SQLite
+    filas = [dict(r) for r in almacen._conn().execute("select * from candidatos")]
+    for f in filas:
+        for b in ("licencia_conducir", "movilidad_propia", "familiar_en_clinica"):
+            f[b] = bool(f[b])
+    memoria = FuenteMemoria({"vacantes": vacantes, "candidatos": filas})
+    return {"memoria": memoria, "sqlite": FuenteSQLite(almacen)}, filas
+
+
+def probar(nombre: str, fuente, candidatos) -> None:
+    print(f"\n— {nombre}")
+    vacantes = VacanteRepo(fuente)
+    repo = CandidatoRepo(fuente)
+
+    abiertas = vacantes.abiertas()
+    check(len(abiertas) == 17 and all(v["estado"] == "abierta" for v in abiertas), "vacantes abiertas")
+    check(set(abiertas[0]) == set(VacanteRepo.PROYECCIONES["publica"]), "proyección de la home")
+
+    detalle = vacantes.detalle(4)
+    check(detalle is not None and detalle["titulo"] == "Vacante 4" and "created_at" in detalle, "detalle por id")
+    check("localidad" not in detalle, "columna opcional inexistente se omite")
+    check(vacantes.detalle(999) is None, "detalle inexistente es None")
+
+    admin = vacantes.listado_admin({"titulo": "vacante 1", "area": "", "publicada": "true"}, None, 5)
+    check([v["id"] for v in admin] == [19, 17, 16, 14, 13, 11], "filtros de admin/vacantes (contiene + estado) y orden")
+
+    pagina, nav = paginar_keyset(repo.listado_admin("Part time", None, 50), None, 50)
+    check(len(pagina) == 50 and nav["has_next"], "primera página de candidatos filtrada")
+    check(set(pagina[0]) == set(CandidatoRepo.PROYECCIONES["admin"]), "proyección de admin/candidatos")
+    vistos = {c["id"] for c in pagina}
+    anteriores = [[c["id"] for c in pagina]]
+    while nav["has_next"]:
+        cursor = Cursor.decode(nav["after"], "after")
+        pagina, nav = paginar_keyset(repo.listado_admin("Part time", cursor, 50), cursor, 50)
+        check(not (vistos & {c["id"] for c in pagina}), f"página {cursor.pagina} sin repetidos")
+        vistos |= {c["id"] for c in pagina}
+        anteriores.append([c["id"] for c in pagina])
+    check(len(vistos) == sum(1 for c in candidatos if c["disponibilidad"] == "Part time"), "el cursor recorre todo")
+    cursor = Cursor.decode(nav["before"], "before")
+    pagina, _ = paginar_keyset(repo.listado_admin("Part time", cursor, 50), cursor, 50)
+    check([c["id"] for c in pagina] == anteriores[-2], "volver una página (before) en el mismo orden")
+
+    ids = [c["id"] for c in candidatos]
+    por_id = repo.por_ids(ids + [None, ids[0]], "completo")
+    check(len(por_id) == len(ids), f"por_ids en lotes de {app_module.REPO_LOTE_IDS} ({len(ids)} ids)")
+    muestra = por_id[ids[7]]
+    check(set(muestra) == set(CandidatoRepo.PROYECCIONES["completo"]), "proyección 'completo'")
+    check(isinstance(muestra["licencia_conducir"], bool), "booleanos como bool")
+
+
+if __name__ == "__main__":
+    por_fuente, candidatos = fuentes()
+    for nombre, fuente in por_fuente.items():
+        probar(nombre, fuente, candidatos)
+
+    print("\n🎉 Todo OK" if not fallos else f"\n❌ {fallos} fallo(s)")
+    sys.exit(1 if fallos else 0)
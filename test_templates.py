@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Prueba de la caché de templates y del render en streaming de los listados.
+
+Verifica que al importar la app todos los templates quedan compilados (en
+memoria y como bytecode en disco), que Jinja no recarga templates fuera de
+debug y que los listados de admin en streaming devuelven el mismo HTML que el
+render de una, salvo con mensajes flash pendientes. No necesita Supabase.
+
+Uso:
+    python test_templates.py
+"""
+
+import os
+import stat
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+_tmp = tempfile.mkdtemp()
+os.environ["JINJA_CACHE_DIR"] = os.path.join(_tmp, "jinja")
+os.environ["LOCAL_DB_PATH"] = os.path.join(_tmp, "local.sqlite3")
+os.environ.pop("FLASK_DEBUG", None)
+
+import app as app_module  # noqa: E402
+from app import _en_partes, app, cache_bytecode  # noqa: E402
+
+fallos = 0
+
+
+def check(cond: bool, msg: str) -> None:
+    global fallos
+    print(("✅ " if cond else "❌ ") + msg)
+    if not cond:
+        fallos += 1
+
+
+def cliente_admin():
+    cliente = app.test_client()
+    with cliente.session_transaction() as s:
+        s["is_admin"] = True
+    return cliente
+
+
+def leer(resp):
+    # Consumir y cerrar en el momento: un streaming abierto retiene su contexto de request
+    resp.cuerpo = resp.get_data(as_text=True)
+    resp.close()
+    return resp
+
+
+def en_streaming(resp) -> bool:
+    # En el cliente de prueba toda respuesta es "streamed"; la de una sola vez trae Content-Length
+    return "Content-Length" not in resp.headers
+
+
+def probar_cache() -> None:
+    print("\n— caché")
+    env = app.jinja_env
+    nombres = env.list_templates(extensions=["html"])
+    check(len(env.cache) >= len(nombres), f"{len(nombres)} templates precompilados al importar")
+    check(len(os.listdir(app_module.JINJA_CACHE_DIR)) >= len(nombres), "bytecode en JINJA_CACHE_DIR")
+    check(env.auto_reload is False, "sin auto_reload fuera de debug")
+    check(stat.S_IMODE(os.stat(app_module.JINJA_CACHE_DIR).st_mode) == 0o700, "JINJA_CACHE_DIR creado con modo 0700")
+    abierto = os.path.join(_tmp, "jinja-abierto")
+    os.mkdir(abierto)
+    os.chmod(abierto, 0o777)
+    try:
+        cache_bytecode(abierto)
+        check(False, "rechaza un directorio escribible por otros")
+    except OSError:
+        check(True, "rechaza un directorio escribible por otros")
+
+    # Un Environment nuevo (otro worker) carga el bytecode: no vuelve a compilar
+    fresco = app.create_jinja_environment()
+    fresco.bytecode_cache = env.bytecode_cache
+    compilados = []
+    original = fresco.compile
+    fresco.compile = lambda *a, **kw: compilados.append(a) or original(*a, **kw)
+    fresco.get_template("admin_postulaciones.html")
+    check(not compilados, "otro proceso usa el bytecode sin compilar")
+
+
+def probar_streaming() -> None:
+    print("\n— streaming")
+    partes = list(_en_partes(["a" * 3000] * 7, 8192))
+    check("".join(partes) == "a" * 21000 and [len(p) for p in partes] == [9000, 9000, 3000], "partes de al menos el mínimo")
+
+    for ruta in ("/admin/postulaciones", "/admin/candidatos", "/admin/vacantes"):
+        cliente = cliente_admin()
+        streamed = leer(cliente.get(ruta))
+        app_module.TEMPLATE_STREAMING = False
+        entero = leer(cliente.get(ruta))
+        app_module.TEMPLATE_STREAMING = True
+        check(
+            streamed.status_code == 200 and en_streaming(streamed) and not en_streaming(entero)
+            and streamed.cuerpo == entero.cuerpo,
+            f"{ruta}: mismo HTML en streaming",
+        )
+        check(streamed.headers.get("X-Accel-Buffering") == "no", f"{ruta}: sin buffer en nginx")
+
+    cliente = cliente_admin()
+    with cliente.session_transaction() as s:
+        s["_flashes"] = [("success", "Guardado OK")]
+    resp = leer(cliente.get("/admin/candidatos"))
+    check(not en_streaming(resp) and "Guardado OK" in resp.cuerpo, "con flash pendiente se renderiza de una")
+    check("Guardado OK" not in leer(cliente.get("/admin/candidatos")).cuerpo, "el flash se consume una sola vez")
+
+
+if __name__ == "__main__":
+    probar_cache()
+    probar_streaming()
+
+    print("\n🎉 Todo OK" if not fallos else f"\n❌ {fallos} fallo(s)")
+    sys.exit(1 if fallos else 0)
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 try:
     from app import (
+        _valor_csv,
         app,
         cargar_catalogos,
         cargar_opciones_postulacion,
@@ -24,6 +25,16 @@ try:
     print("✅ Función normalizar_checkbox:", normalizar_checkbox("No"))
     print("✅ Función normalizar_checkbox:", normalizar_checkbox("on"))
 
+    # Exportación CSV: fórmulas neutralizadas, celulares y números intactos
+    for valor, esperado in (
+        ("=HYPERLINK(\"x\")", "'=HYPERLINK(\"x\")"), ("+1+cmd|' /C calc'!A0", "'+1+cmd|' /C calc'!A0"),
+        ("-2+3", "'-2+3"), ("@SUM(A1)", "'@SUM(A1)"), ("\t=1", "'\t=1"), ("\r=1", "'\r=1"),
+        ("+54 9 261 555-5555", "+54 9 261 555-5555"), ("-3,5", "-3,5"), ("Juan", "Juan"),
+    ):
+        if _valor_csv(valor) != esperado:
+            raise AssertionError(f"_valor_csv({valor!r}) = {_valor_csv(valor)!r}, se esperaba {esperado!r}")
+    print("✅ Función _valor_csv neutraliza fórmulas")
+
     # Verificar que las funciones de carga no fallen (aunque no tengan conexión)
     try:
         loc_map, area_map = cargar_catalogos()